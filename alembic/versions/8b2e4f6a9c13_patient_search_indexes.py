@@ -0,0 +1,61 @@
+"""patient_search_indexes
+
+Revision ID: 8b2e4f6a9c13
+Revises: 3f9a1c2d7b64
+Create Date: 2026-10-18 11:03:27.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4f6a9c13'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c2d7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for column in ('name', 'email', 'phone'):
+            op.execute(f"CREATE INDEX IF NOT EXISTS ix_patients_{column}_trgm ON patients USING gin ({column} gin_trgm_ops)")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts USING fts5("
+            "name, email, phone, content='patients', content_rowid='rowid', prefix='2 3')"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS patients_fts_ai AFTER INSERT ON patients BEGIN "
+            "INSERT INTO patients_fts(rowid, name, email, phone) VALUES (new.rowid, new.name, new.email, new.phone); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS patients_fts_ad AFTER DELETE ON patients BEGIN "
+            "INSERT INTO patients_fts(patients_fts, rowid, name, email, phone) "
+            "VALUES ('delete', old.rowid, old.name, old.email, old.phone); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS patients_fts_au AFTER UPDATE OF name, email, phone ON patients BEGIN "
+            "INSERT INTO patients_fts(patients_fts, rowid, name, email, phone) "
+            "VALUES ('delete', old.rowid, old.name, old.email, old.phone); "
+            "INSERT INTO patients_fts(rowid, name, email, phone) VALUES (new.rowid, new.name, new.email, new.phone); END"
+        )
+        # Index the rows that existed before the triggers
+        op.execute("INSERT INTO patients_fts(patients_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for column in ('name', 'email', 'phone'):
+            op.execute(f"DROP INDEX IF EXISTS ix_patients_{column}_trgm")
+    elif dialect == 'sqlite':
+        for trigger in ('patients_fts_ai', 'patients_fts_ad', 'patients_fts_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS patients_fts")
@@ -0,0 +1,102 @@
+"""appointment_start_at
+
+Revision ID: a5c3e81f7d20
+Revises: e7d2a9b4c615
+Create Date: 2026-10-18 16:20:11.904127
+
+Replaces appointments.date + free-form appointments.time with a single
+start_at timestamp (plus optional duration_minutes). Existing times are
+parsed leniently ("9:30", "09:30:00", "2pm", "2.30 pm"); anything that
+cannot be read becomes midnight of the same day.
+"""
+import datetime as dt
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.utils.guid import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5c3e81f7d20'
+down_revision: Union[str, Sequence[str], None] = 'e7d2a9b4c615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 1000
+TIME_RE = re.compile(r"^\s*(\d{1,2})(?:[:.h](\d{2}))?(?::\d{2})?\s*(?:([ap])\.?m\.?)?\s*$", re.IGNORECASE)
+
+appointments = sa.table(
+    'appointments',
+    sa.column('id', GUID()),
+    sa.column('date', sa.Date()),
+    sa.column('time', sa.String()),
+    sa.column('start_at', sa.DateTime()),
+)
+
+
+def parse_time(value):
+    match = TIME_RE.match(value or '')
+    if not match:
+        return dt.time()
+    hour, minute = int(match[1]), int(match[2] or 0)
+    if match[3]:
+        hour = hour % 12 + (12 if match[3].lower() == 'p' else 0)
+    if hour > 23 or minute > 59:
+        return dt.time()
+    return dt.time(hour, minute)
+
+
+def copy_rows(select_columns, values):
+    """Rewrite every appointment BATCH rows at a time, paging by id."""
+    bind = op.get_bind()
+    page = sa.select(appointments.c.id, *select_columns).order_by(appointments.c.id).limit(BATCH)
+    update = appointments.update().where(appointments.c.id == sa.bindparam('_id'))
+    last_id = None
+    while True:
+        rows = bind.execute(page if last_id is None else page.where(appointments.c.id > last_id)).all()
+        if not rows:
+            break
+        bind.execute(update.values({name: sa.bindparam(name) for name in values(rows[0])}),
+                     [{'_id': row[0], **values(row)} for row in rows])
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('appointments') as batch_op:
+        batch_op.add_column(sa.Column('start_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('duration_minutes', sa.Integer(), nullable=True))
+
+    copy_rows(
+        (appointments.c.date, appointments.c.time),
+        lambda row: {'start_at': dt.datetime.combine(row[1], parse_time(row[2]))},
+    )
+
+    op.drop_index('ix_appointments_company_date_time', table_name='appointments')
+    with op.batch_alter_table('appointments') as batch_op:
+        batch_op.alter_column('start_at', existing_type=sa.DateTime(), nullable=False)
+        batch_op.drop_column('time')
+        batch_op.drop_column('date')
+    op.create_index('ix_appointments_company_start', 'appointments', ['company_id', 'start_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('appointments') as batch_op:
+        batch_op.add_column(sa.Column('date', sa.Date(), nullable=True))
+        batch_op.add_column(sa.Column('time', sa.String(), nullable=True))
+
+    copy_rows(
+        (appointments.c.start_at,),
+        lambda row: {'date': row[1].date(), 'time': row[1].strftime('%H:%M')},
+    )
+
+    op.drop_index('ix_appointments_company_start', table_name='appointments')
+    with op.batch_alter_table('appointments') as batch_op:
+        batch_op.alter_column('date', existing_type=sa.Date(), nullable=False)
+        batch_op.alter_column('time', existing_type=sa.String(), nullable=False)
+        batch_op.drop_column('duration_minutes')
+        batch_op.drop_column('start_at')
+    op.create_index('ix_appointments_company_date_time', 'appointments', ['company_id', 'date', 'time'], unique=False)
@@ -0,0 +1,30 @@
+"""note_timeline_cursor_index
+
+Revision ID: b8d4e2f7a316
+Revises: f1a7c3d9e254
+Create Date: 2026-10-18 19:02:14.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d4e2f7a316'
+down_revision: Union[str, Sequence[str], None] = 'f1a7c3d9e254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_notes_patient_company_created_id', 'notes', ['patient_id', 'company_id', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_notes_patient_company_created', table_name='notes')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_notes_patient_company_created', 'notes', ['patient_id', 'company_id', 'created_at'], unique=False)
+    op.drop_index('ix_notes_patient_company_created_id', table_name='notes')
@@ -0,0 +1,38 @@
+"""tenant_scoped_indexes
+
+Revision ID: c41d7e5f2a80
+Revises: 8b2e4f6a9c13
+Create Date: 2026-10-18 13:47:09.660215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e5f2a80'
+down_revision: Union[str, Sequence[str], None] = '8b2e4f6a9c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_appointments_company_date_time', 'appointments', ['company_id', 'date', 'time'], unique=False)
+    op.create_index('ix_appointments_patient_id', 'appointments', ['patient_id'], unique=False)
+    op.create_index('ix_follow_ups_company_status_due', 'follow_ups', ['company_id', 'status', 'due_date'], unique=False)
+    op.create_index('ix_follow_ups_patient_id', 'follow_ups', ['patient_id'], unique=False)
+    op.create_index('ix_notes_patient_company_created', 'notes', ['patient_id', 'company_id', 'created_at'], unique=False)
+    op.create_index('ix_users_company_id', 'users', ['company_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_company_id', table_name='users')
+    op.drop_index('ix_notes_patient_company_created', table_name='notes')
+    op.drop_index('ix_follow_ups_patient_id', table_name='follow_ups')
+    op.drop_index('ix_follow_ups_company_status_due', table_name='follow_ups')
+    op.drop_index('ix_appointments_patient_id', table_name='appointments')
+    op.drop_index('ix_appointments_company_date_time', table_name='appointments')
@@ -0,0 +1,52 @@
+"""patient_soft_delete
+
+Revision ID: c6e1f4a8b392
+Revises: b8d4e2f7a316
+Create Date: 2026-10-18 20:15:48.902144
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e1f4a8b392'
+down_revision: Union[str, Sequence[str], None] = 'b8d4e2f7a316'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE = sa.text('deleted_at IS NULL')
+DELETED = sa.text('deleted_at IS NOT NULL')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Plain ADD COLUMN rather than a batch rebuild: recreating `patients` on
+    # SQLite would drop the FTS sync triggers
+    op.add_column('patients', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    # The hot patient indexes only cover live rows
+    op.drop_index('ix_patients_company_created_id', table_name='patients')
+    op.create_index('ix_patients_company_created_id', 'patients', ['company_id', 'created_at', 'id'], unique=False,
+                    postgresql_where=LIVE, sqlite_where=LIVE)
+    op.drop_index('ix_patients_company_email', table_name='patients')
+    op.create_index('ix_patients_company_email', 'patients', ['company_id', 'email'], unique=False,
+                    postgresql_where=LIVE, sqlite_where=LIVE)
+    op.create_index('ix_patients_deleted_at', 'patients', ['deleted_at'], unique=False,
+                    postgresql_where=DELETED, sqlite_where=DELETED)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Soft-deleted patients would reappear once the column is gone
+    op.execute("DELETE FROM notes WHERE patient_id IN (SELECT id FROM patients WHERE deleted_at IS NOT NULL)")
+    op.execute("DELETE FROM appointments WHERE patient_id IN (SELECT id FROM patients WHERE deleted_at IS NOT NULL)")
+    op.execute("DELETE FROM follow_ups WHERE patient_id IN (SELECT id FROM patients WHERE deleted_at IS NOT NULL)")
+    op.execute("DELETE FROM patients WHERE deleted_at IS NOT NULL")
+    op.drop_index('ix_patients_deleted_at', table_name='patients')
+    op.drop_index('ix_patients_company_email', table_name='patients')
+    op.create_index('ix_patients_company_email', 'patients', ['company_id', 'email'], unique=False)
+    op.drop_index('ix_patients_company_created_id', table_name='patients')
+    op.create_index('ix_patients_company_created_id', 'patients', ['company_id', 'created_at', 'id'], unique=False)
+    op.drop_column('patients', 'deleted_at')
@@ -0,0 +1,28 @@
+"""patient_email_index
+
+Revision ID: d2f6b8e1c937
+Revises: a5c3e81f7d20
+Create Date: 2026-10-18 17:41:36.552810
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6b8e1c937'
+down_revision: Union[str, Sequence[str], None] = 'a5c3e81f7d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_patients_company_email', 'patients', ['company_id', 'email'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_patients_company_email', table_name='patients')
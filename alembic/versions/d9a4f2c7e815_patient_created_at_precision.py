@@ -0,0 +1,33 @@
+"""patient_created_at_precision
+
+Revision ID: d9a4f2c7e815
+Revises: c6e1f4a8b392
+Create Date: 2026-10-18 21:40:12.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a4f2c7e815'
+down_revision: Union[str, Sequence[str], None] = 'c6e1f4a8b392'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite only: rows stamped by CURRENT_TIMESTAMP lack the fractional
+    # seconds every bound datetime has, so pad them to the same text format
+    # or the (created_at, id) cursor skips rows sharing their second
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(sa.text("UPDATE patients SET created_at = created_at || '.000000' WHERE length(created_at) = 19"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The padded values are the same instants; nothing to undo
+    pass
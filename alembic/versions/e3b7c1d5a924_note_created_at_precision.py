@@ -0,0 +1,32 @@
+"""note_created_at_precision
+
+Revision ID: e3b7c1d5a924
+Revises: d9a4f2c7e815
+Create Date: 2026-10-18 21:58:37.064912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b7c1d5a924'
+down_revision: Union[str, Sequence[str], None] = 'd9a4f2c7e815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite only, as for patients: pad CURRENT_TIMESTAMP values to the bound
+    # datetime format so the notes timeline cursor can step past them
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(sa.text("UPDATE notes SET created_at = created_at || '.000000' WHERE length(created_at) = 19"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The padded values are the same instants; nothing to undo
+    pass
@@ -0,0 +1,56 @@
+"""company_counters
+
+Revision ID: e7d2a9b4c615
+Revises: c41d7e5f2a80
+Create Date: 2026-10-18 15:02:41.318904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.utils.guid import GUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7d2a9b4c615'
+down_revision: Union[str, Sequence[str], None] = 'c41d7e5f2a80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('company_stats',
+    sa.Column('company_id', GUID(), nullable=False),
+    sa.Column('patients', sa.Integer(), nullable=False),
+    sa.Column('open_follow_ups', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+    sa.PrimaryKeyConstraint('company_id')
+    )
+    op.create_table('company_daily_appointments',
+    sa.Column('company_id', GUID(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('scheduled', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+    sa.PrimaryKeyConstraint('company_id', 'date')
+    )
+    # Backfill from the existing rows; afterwards the write paths keep them current
+    op.execute(
+        "INSERT INTO company_stats (company_id, patients, open_follow_ups) "
+        "SELECT c.id, "
+        "(SELECT count(*) FROM patients p WHERE p.company_id = c.id), "
+        "(SELECT count(*) FROM follow_ups f WHERE f.company_id = c.id AND f.status = 'open') "
+        "FROM companies c"
+    )
+    op.execute(
+        "INSERT INTO company_daily_appointments (company_id, date, scheduled) "
+        "SELECT company_id, date, count(*) FROM appointments WHERE status = 'scheduled' "
+        "GROUP BY company_id, date"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('company_daily_appointments')
+    op.drop_table('company_stats')
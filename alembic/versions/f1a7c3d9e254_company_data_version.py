@@ -0,0 +1,32 @@
+"""company_data_version
+
+Revision ID: f1a7c3d9e254
+Revises: d2f6b8e1c937
+Create Date: 2026-10-18 18:55:02.127448
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7c3d9e254'
+down_revision: Union[str, Sequence[str], None] = 'd2f6b8e1c937'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('company_stats') as batch_op:
+        batch_op.add_column(sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('modified_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('company_stats') as batch_op:
+        batch_op.drop_column('modified_at')
+        batch_op.drop_column('data_version')
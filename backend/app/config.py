@@ -1,4 +1,5 @@
 import os
+from typing import Literal
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 
@@ -8,6 +9,31 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     CORS_ORIGINS: list[str] = ["http://localhost:5173", "http://localhost:3000"]
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+    # "database" re-reads the user row (cached); "claims" trusts the verified token claims
+    AUTH_MODE: Literal["database", "claims"] = "database"
+    CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    # Whether this process runs the reconcile and purge jobs; exactly one process should
+    RUN_BACKGROUND_JOBS: bool = True
+    # Seconds between dashboard counter reconciliation runs; 0 disables the job
+    STATS_RECONCILE_INTERVAL_SECONDS: int = 3600
+    # Seconds between purges of soft-deleted patients; 0 disables the job
+    PATIENT_PURGE_INTERVAL_SECONDS: int = 300
+    PATIENT_PURGE_BATCH_SIZE: int = 500
+    DASHBOARD_CACHE_TTL_SECONDS: float = 5
+    DASHBOARD_CACHE_STALE_SECONDS: float = 30
+    DASHBOARD_CACHE_MAX_SIZE: int = 1000
+    BULK_MAX_ITEMS: int = 5000
+    # Responses at least this many bytes are gzipped when the client accepts it; 0 disables
+    GZIP_MINIMUM_SIZE: int = 1024
 
     model_config = ConfigDict(env_file=f"{os.path.dirname(os.path.dirname(os.path.abspath(__file__)))}/.env")
 
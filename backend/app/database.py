@@ -1,15 +1,69 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from datetime import datetime, timezone
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base
 from app.config import settings
+from app.utils.metrics import PoolStats
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# DATABASE_URL stays a plain sync URL so Alembic can keep using it; the app swaps in the async driver
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+pool_stats = PoolStats()
+
+def engine_options(url: str) -> dict:
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    # SQLite uses single-connection pools that take no sizing arguments
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
+
+engine = create_async_engine(async_database_url(settings.DATABASE_URL), **engine_options(settings.DATABASE_URL))
+event.listen(engine.sync_engine, "connect", pool_stats.on_connect)
+event.listen(engine.sync_engine, "checkout", pool_stats.on_checkout)
+event.listen(engine.sync_engine, "checkin", pool_stats.on_checkin)
+
+class AppSession(Session):
+    """Sync session behind SessionLocal; carries the checkout-wait listeners."""
+
+event.listen(AppSession, "after_transaction_create", pool_stats.on_transaction_create)
+event.listen(AppSession, "after_begin", pool_stats.on_session_begin)
+SessionLocal = async_sessionmaker(
+    bind=engine, class_=AsyncSession, sync_session_class=AppSession, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def utcnow() -> datetime:
+    """Python-side default for `created_at` columns used as keyset cursors.
+
+    SQLite compares DATETIME values as text, and its CURRENT_TIMESTAMP
+    (the server default) has no fractional part while bound datetimes always
+    carry six digits, so a cursor would never equal the row it came from.
+    Generating the value here stores every row in the full format.
+    """
+    return datetime.now(timezone.utc)
+
+async def get_db():
+    async with SessionLocal() as db:
+        try:
+            yield db
+        except exc.TimeoutError:
+            # No pooled connection freed up within DB_POOL_TIMEOUT
+            pool_stats.record_timeout()
+            raise
@@ -1,13 +1,35 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, patients, appointments, follow_ups, dashboard, staff
+from fastapi.middleware.gzip import GZipMiddleware
+from app.routers import auth, patients, appointments, follow_ups, dashboard, staff, metrics, export, imports
 from app.database import engine, Base
 from app.config import settings
+from app.utils import password_pool
+from app.tasks import purge_deleted_patients_periodically, reconcile_counters_periodically
 
 # Create tables (for development only; production usage should rely on Alembic)
-# Base.metadata.create_all(bind=engine)
+# async with engine.begin() as conn: await conn.run_sync(Base.metadata.create_all)
 
-app = FastAPI(title="Clinic Management System", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+    # The jobs write the same rows in every process that runs them, so only one should
+    run_jobs = settings.RUN_BACKGROUND_JOBS
+    if run_jobs and settings.STATS_RECONCILE_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(reconcile_counters_periodically(settings.STATS_RECONCILE_INTERVAL_SECONDS)))
+    if run_jobs and settings.PATIENT_PURGE_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(purge_deleted_patients_periodically(
+            settings.PATIENT_PURGE_INTERVAL_SECONDS, settings.PATIENT_PURGE_BATCH_SIZE
+        )))
+    yield
+    for task in tasks:
+        task.cancel()
+    password_pool.pool.shutdown()
+    await engine.dispose()
+
+app = FastAPI(title="Clinic Management System", version="1.0.0", lifespan=lifespan)
 
 # CORS Configuration
 origins = settings.CORS_ORIGINS
@@ -18,16 +40,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Authorization"],
+    expose_headers=["Authorization", "X-Next-Cursor", "Content-Disposition", "X-Import-Created", "X-Import-Failed", "ETag", "Last-Modified"],
 )
 
+# Large list/export responses only; small JSON isn't worth the CPU
+if settings.GZIP_MINIMUM_SIZE > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
 app.include_router(auth.router)
 app.include_router(patients.router)
 app.include_router(appointments.router)
 app.include_router(follow_ups.router)
 app.include_router(dashboard.router)
 app.include_router(staff.router)
+app.include_router(metrics.router)
+app.include_router(export.router)
+app.include_router(imports.router)
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Welcome to Clinic Management API"}
\ No newline at end of file
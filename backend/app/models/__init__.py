@@ -4,3 +4,4 @@ from .patient import Patient
 from .appointment import Appointment
 from .follow_up import FollowUp
 from .note import Note
+from .company_stats import CompanyStats, DailyAppointmentCount
@@ -1,9 +1,11 @@
 import uuid
 import enum
-from sqlalchemy import Column, String, ForeignKey, DateTime, Date as SqlDate, Enum
+import datetime as dt
+from sqlalchemy import Column, String, ForeignKey, DateTime, Date as SqlDate, Enum, Index, Integer, type_coerce
 from app.utils.guid import GUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from app.database import Base
 
 class AppointmentStatus(str, enum.Enum):
@@ -13,11 +15,17 @@ class AppointmentStatus(str, enum.Enum):
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # Calendar/list views and the dashboard: WHERE company_id = ? AND start_at range ORDER BY start_at
+        Index("ix_appointments_company_start", "company_id", "start_at"),
+        Index("ix_appointments_patient_id", "patient_id"),
+    )
 
     id = Column(GUID(), primary_key=True, default=uuid.uuid4)
     patient_id = Column(GUID(), ForeignKey("patients.id"), nullable=False)
-    date = Column(SqlDate, nullable=False)
-    time = Column(String, nullable=False)
+    # Clinic-local wall-clock time, stored naive like the `date`/`time` pair the API exposes
+    start_at = Column(DateTime, nullable=False)
+    duration_minutes = Column(Integer, nullable=True)
     reason = Column(String, nullable=False)
     status = Column(Enum(AppointmentStatus), default=AppointmentStatus.scheduled, nullable=False)
     company_id = Column(GUID(), ForeignKey("companies.id"), nullable=False)
@@ -26,6 +34,41 @@ class Appointment(Base):
     patient = relationship("app.models.patient.Patient")
     company = relationship("app.models.company.Company")
 
+    # `date` and `time` are views over start_at so the API keeps its shape;
+    # assigning either moves start_at. Filter on start_at ranges in queries so
+    # they stay index range scans.
+    @hybrid_property
+    def date(self):
+        return self.start_at.date() if self.start_at else None
+
+    @date.inplace.setter
+    def _date_setter(self, value: dt.date):
+        self.start_at = dt.datetime.combine(value, self.start_at.time() if self.start_at else dt.time())
+
+    @date.inplace.expression
+    @classmethod
+    def _date_expression(cls):
+        return type_coerce(func.date(cls.start_at), SqlDate)
+
+    @property
+    def time(self):
+        return self.start_at.strftime("%H:%M") if self.start_at else None
+
+    @time.setter
+    def time(self, value: str):
+        self.start_at = dt.datetime.combine(self.start_at.date(), dt.time.fromisoformat(value))
+
+    @property
+    def end_at(self):
+        if self.start_at and self.duration_minutes:
+            return self.start_at + dt.timedelta(minutes=self.duration_minutes)
+        return None
+
     @property
     def patientName(self):
         return self.patient.name if self.patient else "Unknown"
+
+    @staticmethod
+    def day_start(day: dt.date) -> dt.datetime:
+        """Lower start_at bound for `day`; use day_start(day + 1 day) as the exclusive upper bound."""
+        return dt.datetime.combine(day, dt.time())
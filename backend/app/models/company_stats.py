@@ -0,0 +1,23 @@
+from sqlalchemy import Column, ForeignKey, Date as SqlDate, DateTime, Integer
+from app.utils.guid import GUID
+from app.database import Base
+
+# Denormalised counters behind the dashboard, kept in step by the write paths
+# (app/utils/counters.py) and periodically repaired by counters.reconcile_all.
+
+class CompanyStats(Base):
+    __tablename__ = "company_stats"
+
+    company_id = Column(GUID(), ForeignKey("companies.id"), primary_key=True)
+    patients = Column(Integer, nullable=False, default=0)
+    open_follow_ups = Column(Integer, nullable=False, default=0)
+    # Bumped by every write to the company's data; read endpoints derive their ETag from it
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+    modified_at = Column(DateTime(timezone=True), nullable=True)
+
+class DailyAppointmentCount(Base):
+    __tablename__ = "company_daily_appointments"
+
+    company_id = Column(GUID(), ForeignKey("companies.id"), primary_key=True)
+    date = Column(SqlDate, primary_key=True)
+    scheduled = Column(Integer, nullable=False, default=0)
@@ -1,6 +1,6 @@
 import uuid
 import enum
-from sqlalchemy import Column, String, ForeignKey, DateTime, Date as SqlDate, Enum, Text
+from sqlalchemy import Column, String, ForeignKey, DateTime, Date as SqlDate, Enum, Text, Index
 from app.utils.guid import GUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -16,6 +16,11 @@ class FollowUpStatus(str, enum.Enum):
 
 class FollowUp(Base):
     __tablename__ = "follow_ups"
+    __table_args__ = (
+        # Open-task lists and counts: WHERE company_id = ? AND status = ? ORDER BY due_date
+        Index("ix_follow_ups_company_status_due", "company_id", "status", "due_date"),
+        Index("ix_follow_ups_patient_id", "patient_id"),
+    )
 
     id = Column(GUID(), primary_key=True, default=uuid.uuid4)
     patient_id = Column(GUID(), ForeignKey("patients.id"), nullable=False)
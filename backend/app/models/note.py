@@ -1,19 +1,24 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Index
 from app.utils.guid import GUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utcnow
 
 class Note(Base):
     __tablename__ = "notes"
+    __table_args__ = (
+        # Patient timeline: WHERE patient_id = ? AND company_id = ? ORDER BY created_at DESC, id DESC,
+        # seeking past the (created_at, id) cursor
+        Index("ix_notes_patient_company_created_id", "patient_id", "company_id", "created_at", "id"),
+    )
 
     id = Column(GUID(), primary_key=True, default=uuid.uuid4)
     patient_id = Column(GUID(), ForeignKey("patients.id"), nullable=False)
     content = Column(Text, nullable=False)
     created_by_user_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
     company_id = Column(GUID(), ForeignKey("companies.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
 
     patient = relationship("app.models.patient.Patient")
     created_by_user = relationship("app.models.user.User")
@@ -1,12 +1,23 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey, DateTime, Date as SqlDate, Text
+from sqlalchemy import Column, String, ForeignKey, DateTime, Date as SqlDate, Text, Index, DDL, event, select, text
 from app.utils.guid import GUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utcnow
+
+LIVE = text("deleted_at IS NULL")
 
 class Patient(Base):
     __tablename__ = "patients"
+    __table_args__ = (
+        # Serves the keyset-paginated patient list: WHERE company_id = ? AND deleted_at IS NULL ORDER BY created_at, id
+        Index("ix_patients_company_created_id", "company_id", "created_at", "id", postgresql_where=LIVE, sqlite_where=LIVE),
+        # CSV imports resolve appointment rows to patients by email
+        Index("ix_patients_company_email", "company_id", "email", postgresql_where=LIVE, sqlite_where=LIVE),
+        # The purge job's work queue; only ever holds soft-deleted rows
+        Index("ix_patients_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL"),
+              sqlite_where=text("deleted_at IS NOT NULL")),
+    )
 
     id = Column(GUID(), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -15,6 +26,45 @@ class Patient(Base):
     date_of_birth = Column(SqlDate, nullable=True) # Changed to nullable as it might optionally be empty string in frontend
     address = Column(Text, nullable=True)
     company_id = Column(GUID(), ForeignKey("companies.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    # Set by DELETE /api/patients/{id}; the row and its history are hard-deleted later by app.utils.purge
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
 
     company = relationship("app.models.company.Company")
+
+    @classmethod
+    def live(cls, patient_id):
+        """Filter for rows (appointments, notes, ...) whose patient, by `patient_id` column, isn't soft-deleted."""
+        return select(cls.id).where(cls.id == patient_id, cls.deleted_at.is_(None)).exists()
+
+# --- SEARCH INDEXES ---
+# Postgres: trigram GIN indexes let ILIKE '%term%' and fuzzy `%` matches use an index.
+# SQLite: an external-content FTS5 table kept in sync by triggers (rebuild it after VACUUM,
+# which may renumber rowids).
+
+PG_SEARCH_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_patients_name_trgm ON patients USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_patients_email_trgm ON patients USING gin (email gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_patients_phone_trgm ON patients USING gin (phone gin_trgm_ops)",
+]
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts USING fts5("
+    "name, email, phone, content='patients', content_rowid='rowid', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS patients_fts_ai AFTER INSERT ON patients BEGIN "
+    "INSERT INTO patients_fts(rowid, name, email, phone) VALUES (new.rowid, new.name, new.email, new.phone); END",
+    "CREATE TRIGGER IF NOT EXISTS patients_fts_ad AFTER DELETE ON patients BEGIN "
+    "INSERT INTO patients_fts(patients_fts, rowid, name, email, phone) "
+    "VALUES ('delete', old.rowid, old.name, old.email, old.phone); END",
+    "CREATE TRIGGER IF NOT EXISTS patients_fts_au AFTER UPDATE OF name, email, phone ON patients BEGIN "
+    "INSERT INTO patients_fts(patients_fts, rowid, name, email, phone) "
+    "VALUES ('delete', old.rowid, old.name, old.email, old.phone); "
+    "INSERT INTO patients_fts(rowid, name, email, phone) VALUES (new.rowid, new.name, new.email, new.phone); END",
+]
+
+event.listen(Patient.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+for statement in PG_SEARCH_DDL:
+    event.listen(Patient.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Patient.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Patient.__table__, "before_drop", DDL("DROP TABLE IF EXISTS patients_fts").execute_if(dialect="sqlite"))
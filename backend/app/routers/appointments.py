@@ -1,78 +1,151 @@
+from collections import Counter
 from typing import List, Optional
 from uuid import UUID
-from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.database import get_db
-from app.models import User, Appointment, Patient
+from app.models import Appointment, Patient
 from app.schemas import appointment as appointment_schema
-from app.utils import security
+from app.schemas import bulk as bulk_schema
+from app.routers import dashboard
+from app.utils import bulk, counters, http_cache, security, writes
+from app.utils.serialization import ListSerializer
 
 router = APIRouter(prefix="/api/appointments", tags=["appointments"])
 
-@router.get("/", response_model=List[appointment_schema.AppointmentRead])
-def get_appointments(
+patient_name = joinedload(Appointment.patient).load_only(Patient.name)
+appointment_list = ListSerializer(appointment_schema.AppointmentRead, {
+    "id": [Appointment.id],
+    "patient_id": [Appointment.patient_id],
+    "company_id": [Appointment.company_id],
+    "date": [Appointment.start_at],
+    "time": [Appointment.start_at],
+    "start_at": [Appointment.start_at],
+    "end_at": [Appointment.start_at, Appointment.duration_minutes],
+    "duration_minutes": [Appointment.duration_minutes],
+    "reason": [Appointment.reason],
+    "status": [Appointment.status],
+    "created_at": [Appointment.created_at],
+    "patientName": [patient_name],
+})
+
+@router.get("/", response_model=List[appointment_schema.AppointmentRead], dependencies=[Depends(http_cache.conditional_get)])
+async def get_appointments(
+    response: Response,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     status: Optional[str] = None,
     limit: int = 100,
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="Comma-separated response fields, e.g. id,date,time,patientName"),
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Appointment).options(joinedload(Appointment.patient)).filter(Appointment.company_id == current_user.company_id)
-    
+    fields = appointment_list.parse_fields(fields)
+    query = (
+        select(Appointment)
+        .options(*appointment_list.load_options(fields))
+        .where(Appointment.company_id == current_user.company_id, Patient.live(Appointment.patient_id))
+    )
+
+    # Day/week views become one range scan on (company_id, start_at)
     if start_date:
-        query = query.filter(Appointment.date >= start_date)
+        query = query.where(Appointment.start_at >= Appointment.day_start(start_date))
     if end_date:
-        query = query.filter(Appointment.date <= end_date)
+        query = query.where(Appointment.start_at < Appointment.day_start(end_date + timedelta(days=1)))
     if status:
-        query = query.filter(Appointment.status == status)
-        
-    appointments = query.order_by(Appointment.date.asc(), Appointment.time.asc()).limit(limit).all()
-    return appointments
+        query = query.where(Appointment.status == status)
+
+    result = await db.execute(query.order_by(Appointment.start_at.asc(), Appointment.id).limit(limit))
+    return appointment_list.response(result.scalars().all(), response, fields)
 
 @router.post("/", response_model=appointment_schema.AppointmentRead, status_code=status.HTTP_201_CREATED)
-def create_appointment(
+async def create_appointment(
     appointment: appointment_schema.AppointmentCreate,
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     # Verify patient exists
-    patient = db.query(Patient).filter(
+    patient = await db.scalar(select(Patient).options(load_only(Patient.name)).where(
         Patient.id == appointment.patient_id,
-        Patient.company_id == current_user.company_id
-    ).first()
+        Patient.company_id == current_user.company_id,
+        Patient.deleted_at.is_(None)
+    ))
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
-        
-    new_appointment = Appointment(
-        **appointment.model_dump(),
+
+    new_appointment = await writes.insert_returning(
+        db, Appointment,
+        **appointment.model_dump(exclude={"date", "time"}),
+        start_at=appointment.start_at,
         company_id=current_user.company_id
     )
-    db.add(new_appointment)
-    db.commit()
-    db.refresh(new_appointment)
+    set_committed_value(new_appointment, "patient", patient)
+    await counters.track_appointment(
+        db, current_user.company_id, None, (new_appointment.date, new_appointment.status)
+    )
+    await counters.touch(db, current_user.company_id)
+    await db.commit()
+    dashboard.invalidate(current_user.company_id)
     return new_appointment
 
+@router.post("/bulk", response_model=bulk_schema.BulkCreateResult)
+async def create_appointments_bulk(
+    payload: bulk_schema.BulkCreate,
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    valid, failed = bulk.validate_items(appointment_schema.AppointmentCreate, payload.items)
+    known = await bulk.company_patient_ids(db, current_user.company_id, (item.patient_id for _, item in valid))
+    valid, missing = bulk.drop_unknown_patients(valid, known)
+    created = [
+        (index, {
+            **item.model_dump(exclude={"date", "time"}),
+            "start_at": item.start_at,
+            "company_id": current_user.company_id
+        })
+        for index, item in valid
+    ]
+    if created:
+        await bulk.insert_rows(db, Appointment, [row for _, row in created])
+        await counters.add_scheduled(db, current_user.company_id, Counter(
+            row["start_at"].date() for _, row in created if row["status"] == "scheduled"
+        ))
+        await counters.touch(db, current_user.company_id)
+        await db.commit()
+        dashboard.invalidate(current_user.company_id)
+    return bulk.result(created, failed + missing)
+
 @router.patch("/{appointment_id}", response_model=appointment_schema.AppointmentRead)
-def update_appointment(
+async def update_appointment(
     appointment_id: UUID,
     appointment_update: appointment_schema.AppointmentUpdate,
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    appointment = db.query(Appointment).filter(
+    # One read gives both the before-state the counters need and patientName
+    result = await db.execute(select(Appointment).options(patient_name).where(
         Appointment.id == appointment_id,
-        Appointment.company_id == current_user.company_id
-    ).first()
+        Appointment.company_id == current_user.company_id,
+        Patient.live(Appointment.patient_id)
+    ))
+    appointment = result.scalars().first()
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
-        
+
+    before = (appointment.date, appointment.status)
     update_data = appointment_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(appointment, key, value)
-        
-    db.commit()
-    db.refresh(appointment)
+
+    await counters.track_appointment(
+        db, current_user.company_id, before, (appointment.date, appointment.status)
+    )
+    await counters.touch(db, current_user.company_id)
+    await db.commit()
+    dashboard.invalidate(current_user.company_id)
     return appointment
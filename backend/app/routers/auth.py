@@ -1,26 +1,64 @@
-import random
-import string
+import secrets
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from app.database import get_db
 from app.models import User, Company
 from app.schemas import user as user_schema
 from app.schemas import token as token_schema
-from app.utils import security
+from app.utils import counters, security, writes
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
+# Crockford base32 (no I, L, O or U to misread): 32**8 ≈ 1.1e12 codes, so a
+# collision stays vanishingly rare however many clinics register, and codes
+# can't be guessed by walking a small range.
+CODE_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+CODE_LENGTH = 8
+CODE_ATTEMPTS = 5
+
 def generate_company_code():
-    return "CLINIC" + "".join(random.choices(string.digits, k=3))
+    return "".join(secrets.choice(CODE_ALPHABET) for _ in range(CODE_LENGTH))
+
+# What people type for the letters the alphabet leaves out
+CODE_MISREADS = str.maketrans({"O": "0", "I": "1", "L": "1"})
+
+def company_code_candidates(code: str) -> set:
+    """Codes a typed company code may stand for.
+
+    Crockford codes are matched case-insensitively, ignoring hyphens and
+    spaces, with O read as 0 and I/L as 1. The typed form upper-cased is
+    kept too, since codes from before the Crockford alphabet ("CLINIC123")
+    contain those letters.
+    """
+    typed = code.strip().upper()
+    return {typed, typed.replace("-", "").replace(" ", "").translate(CODE_MISREADS)}
+
+async def create_company(db: AsyncSession, name: str) -> Company:
+    """Insert a company under a fresh code, letting the unique index on code settle collisions.
+
+    One INSERT per attempt inside a savepoint, so a clash rolls back just
+    that INSERT and is retried with a new code; no SELECT-before-insert.
+    """
+    for _ in range(CODE_ATTEMPTS):
+        try:
+            async with db.begin_nested():
+                return await writes.insert_returning(db, Company, name=name, code=generate_company_code())
+        except IntegrityError:
+            continue
+    raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Could not allocate a company code, please retry")
 
 class LoginRequest(user_schema.BaseModel):
     email: str
     password: str
 
 @router.post("/login", response_model=token_schema.Token)
-def login(credentials: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).options(joinedload(User.company)).filter(User.email == credentials.email).first()
-    if not user or not security.verify_password(credentials.password, user.password_hash):
+async def login(credentials: LoginRequest, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(User).options(joinedload(User.company)).where(User.email == credentials.email))
+    user = result.scalars().first()
+    if not user or not await security.verify_password(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -43,30 +81,27 @@ def login(credentials: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/register/company", response_model=token_schema.Token)
-def register_company(data: user_schema.CompanyRegister, db: Session = Depends(get_db)):
-    if db.query(User).filter(User.email == data.email).first():
+async def register_company(data: user_schema.CompanyRegister, db: AsyncSession = Depends(get_db)):
+    if await db.scalar(select(User.id).where(User.email == data.email)):
         raise HTTPException(status_code=409, detail="Email already registered")
     
-    company_code = generate_company_code()
-    while db.query(Company).filter(Company.code == company_code).first():
-        company_code = generate_company_code()
-        
-    new_company = Company(name=data.companyName, code=company_code)
-    db.add(new_company)
-    db.commit()
-    db.refresh(new_company)
-    
-    hashed_password = security.get_password_hash(data.password)
-    new_user = User(
-        email=data.email,
-        password_hash=hashed_password,
-        name=data.adminName,
-        role="admin",
-        company_id=new_company.id
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    hashed_password = await security.get_password_hash(data.password)
+    # Company and admin commit together: a failed user insert leaves no orphan company behind
+    new_company = await create_company(db, data.companyName)
+    try:
+        new_user = await writes.insert_returning(
+            db, User,
+            email=data.email,
+            password_hash=hashed_password,
+            name=data.adminName,
+            role="admin",
+            company_id=new_company.id
+        )
+        await db.commit()
+    except IntegrityError:
+        # Lost a race with another registration for the same email
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Email already registered")
     
     access_token = security.create_access_token(data={"sub": str(new_user.id), "company_id": str(new_company.id), "role": "admin"})
     
@@ -84,25 +119,31 @@ def register_company(data: user_schema.CompanyRegister, db: Session = Depends(ge
 
 
 @router.post("/register/staff", response_model=token_schema.Token)
-def register_staff(data: user_schema.StaffRegister, db: Session = Depends(get_db)):
-    if db.query(User).filter(User.email == data.email).first():
+async def register_staff(data: user_schema.StaffRegister, db: AsyncSession = Depends(get_db)):
+    if await db.scalar(select(User.id).where(User.email == data.email)):
         raise HTTPException(status_code=409, detail="Email already registered")
     
-    company = db.query(Company).filter(Company.code == data.companyCode).first()
+    result = await db.execute(select(Company).where(Company.code.in_(company_code_candidates(data.companyCode))))
+    company = result.scalars().first()
     if not company:
         raise HTTPException(status_code=404, detail="Invalid company code")
         
-    hashed_password = security.get_password_hash(data.password)
-    new_user = User(
-        email=data.email,
-        password_hash=hashed_password,
-        name=data.name,
-        role="staff",
-        company_id=company.id
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    hashed_password = await security.get_password_hash(data.password)
+    try:
+        new_user = await writes.insert_returning(
+            db, User,
+            email=data.email,
+            password_hash=hashed_password,
+            name=data.name,
+            role="staff",
+            company_id=company.id
+        )
+        await counters.touch(db, company.id)
+        await db.commit()
+    except IntegrityError:
+        # Lost a race with another registration for the same email
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Email already registered")
     
     access_token = security.create_access_token(data={"sub": str(new_user.id), "company_id": str(company.id), "role": "staff"})
     
@@ -120,8 +161,10 @@ def register_staff(data: user_schema.StaffRegister, db: Session = Depends(get_db
 
 
 @router.post("/logout")
-def logout(current_user: User = Depends(security.get_current_user_dependency_placeholder)):
-    # Since we use stateless JWTs, "logout" is mostly a frontend action (deleting the token).
-    # However, to be thorough, we could add token blacklisting here in the future.
-    # For now, we return a success message.
+async def logout(
+    token: str = Depends(security.oauth2_scheme),
+    current_user: security.CurrentUser = Depends(security.get_current_user_dependency_placeholder)
+):
+    # The token stays cryptographically valid, so remember its id until it expires
+    security.revoke_token(token)
     return {"message": "Successfully logged out"}
@@ -1,18 +1,29 @@
 from typing import List
 from datetime import date
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy import func, literal_column, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, contains_eager
 
-from app.database import get_db
-from app.models import User, Patient, Appointment, FollowUp
+from app.config import settings
+from app.database import SessionLocal, get_db
+from app.models import Patient, Appointment, FollowUp, CompanyStats, DailyAppointmentCount
 from app.schemas import appointment as appointment_schema
 from app.schemas import follow_up as follow_up_schema
 from app.utils import security
+from app.utils.cache import StaleWhileRevalidateCache
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
+LIST_SIZE = 5
+
+stats_cache = StaleWhileRevalidateCache(
+    maxsize=settings.DASHBOARD_CACHE_MAX_SIZE,
+    ttl=settings.DASHBOARD_CACHE_TTL_SECONDS,
+    stale_ttl=settings.DASHBOARD_CACHE_STALE_SECONDS,
+)
+
 class DashboardStats(BaseModel):
     totalPatients: int
     todayAppointments: int
@@ -20,39 +31,102 @@ class DashboardStats(BaseModel):
     upcomingAppointments: List[appointment_schema.AppointmentRead]
     openFollowUpsList: List[follow_up_schema.FollowUpRead]
 
-@router.get("/stats", response_model=DashboardStats)
-def get_dashboard_stats(
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
-):
-    today = date.today()
-    company_id = current_user.company_id
-    
-    total_patients = db.query(Patient).filter(Patient.company_id == company_id).count()
-    
-    today_appointments_count = db.query(Appointment).filter(
+def top_rows(model, name, order_by, *filters, limit: int = LIST_SIZE):
+    """First `limit` matching rows of `model`, numbered 1..n by `order_by`, as an aliased entity."""
+    subquery = (
+        select(model, func.row_number().over(order_by=order_by).label("position"))
+        .where(*filters).order_by(*order_by).limit(limit)
+        .subquery(name)
+    )
+    return aliased(model, subquery), subquery.c.position
+
+def slots_table(size: int):
+    """Constant 1..size table to line top_rows() lists up against, one list entry per row."""
+    return union_all(*(
+        select(literal_column(str(n)).label("n")) for n in range(1, size + 1)
+    )).subquery("slots")
+
+def dashboard_query(company_id, today: date):
+    # One statement for the whole landing page: the three counters are O(1)
+    # reads of the maintained counter rows (app/utils/counters.py), and the two
+    # top-N lists are lined up side by side on a constant 1..LIST_SIZE "slots"
+    # table so each result row carries the n-th appointment and the n-th
+    # follow-up (either may be NULL).
+    def counter(column, *filters):
+        return func.coalesce(select(column).where(*filters).scalar_subquery(), 0)
+
+    total_patients = counter(CompanyStats.patients, CompanyStats.company_id == company_id)
+    open_followups = counter(CompanyStats.open_follow_ups, CompanyStats.company_id == company_id)
+    today_appointments = counter(
+        DailyAppointmentCount.scheduled,
+        DailyAppointmentCount.company_id == company_id,
+        DailyAppointmentCount.date == today
+    )
+
+    upcoming, upcoming_position = top_rows(
+        Appointment, "upcoming", (Appointment.start_at.asc(), Appointment.id),
         Appointment.company_id == company_id,
-        Appointment.date == today,
-        Appointment.status == "scheduled"
-    ).count()
-    
-    open_followups_query = db.query(FollowUp).options(joinedload(FollowUp.patient)).filter(
+        Appointment.start_at >= Appointment.day_start(today),
+        Appointment.status == "scheduled",
+        Patient.live(Appointment.patient_id)
+    )
+    followups, followups_position = top_rows(
+        FollowUp, "open_follow_ups", (FollowUp.due_date.asc(), FollowUp.id),
         FollowUp.company_id == company_id,
-        FollowUp.status == "open"
+        FollowUp.status == "open",
+        Patient.live(FollowUp.patient_id)
     )
-    open_followups_count = open_followups_query.count()
-    open_followups_list = open_followups_query.order_by(FollowUp.due_date.asc()).limit(5).all()
-    
-    upcoming_appointments = db.query(Appointment).options(joinedload(Appointment.patient)).filter(
-        Appointment.company_id == company_id,
-        Appointment.date >= today,
-        Appointment.status == "scheduled"
-    ).order_by(Appointment.date.asc(), Appointment.time.asc()).limit(5).all()
-    
+    upcoming_patient, followup_patient = aliased(Patient), aliased(Patient)
+
+    slots = slots_table(LIST_SIZE)
+
+    return (
+        select(
+            total_patients.label("total_patients"),
+            today_appointments.label("today_appointments"),
+            open_followups.label("open_followups"),
+            upcoming, upcoming_patient, followups, followup_patient,
+        )
+        .select_from(slots)
+        .outerjoin(upcoming, upcoming_position == slots.c.n)
+        .outerjoin(upcoming_patient, upcoming_patient.id == upcoming.patient_id)
+        .outerjoin(followups, followups_position == slots.c.n)
+        .outerjoin(followup_patient, followup_patient.id == followups.patient_id)
+        .options(
+            contains_eager(upcoming.patient.of_type(upcoming_patient)),
+            contains_eager(followups.patient.of_type(followup_patient)),
+        )
+        .order_by(slots.c.n)
+    )
+
+async def load_dashboard_stats(db: AsyncSession, company_id) -> DashboardStats:
+    rows = (await db.execute(dashboard_query(company_id, date.today()))).all()
+    first = rows[0]
     return DashboardStats(
-        totalPatients=total_patients,
-        todayAppointments=today_appointments_count,
-        openFollowUps=open_followups_count,
-        upcomingAppointments=upcoming_appointments,
-        openFollowUpsList=open_followups_list
+        totalPatients=first.total_patients,
+        todayAppointments=first.today_appointments,
+        openFollowUps=first.open_followups,
+        upcomingAppointments=[row[3] for row in rows if row[3] is not None],
+        openFollowUpsList=[row[5] for row in rows if row[5] is not None]
     )
+
+def invalidate(company_id) -> None:
+    """Called by the write paths after they commit rows the dashboard shows."""
+    stats_cache.invalidate(company_id)
+
+@router.get("/stats", response_model=DashboardStats)
+async def get_dashboard_stats(
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    # Every staff browser polls this, and the payload is the same for the whole clinic
+    company_id = current_user.company_id
+    bind = db.bind
+
+    async def revalidate():
+        # Runs in the background after this request's session is closed; same
+        # engine as the request, same instrumented session class as get_db
+        async with SessionLocal(bind=bind) as session:
+            return await load_dashboard_stats(session, company_id)
+
+    return await stats_cache.get(company_id, lambda: load_dashboard_stats(db, company_id), revalidate)
@@ -0,0 +1,99 @@
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import Literal
+from uuid import UUID
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models import Patient, Appointment, FollowUp, Note, User
+from app.utils import security
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+# Rows are fetched this many at a time through a server-side cursor (asyncpg)
+# and written out as one chunk, so memory stays flat whatever the tenant size.
+CHUNK_ROWS = 1000
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+def export_query(resource: str, company_id: UUID):
+    # Plain column tuples rather than ORM entities: nothing lands in the session identity map
+    if resource == "patients":
+        return select(
+            Patient.id, Patient.name, Patient.email, Patient.phone, Patient.date_of_birth,
+            Patient.address, Patient.created_at
+        ).where(Patient.company_id == company_id, Patient.deleted_at.is_(None)).order_by(Patient.created_at, Patient.id)
+    if resource == "appointments":
+        return select(
+            Appointment.id, Appointment.patient_id, Patient.name.label("patient_name"), Appointment.start_at,
+            Appointment.duration_minutes, Appointment.reason, Appointment.status, Appointment.created_at
+        ).join(Patient, Patient.id == Appointment.patient_id).where(
+            Appointment.company_id == company_id,
+            Patient.deleted_at.is_(None)
+        ).order_by(Appointment.start_at, Appointment.id)
+    if resource == "follow-ups":
+        return select(
+            FollowUp.id, FollowUp.patient_id, Patient.name.label("patient_name"), FollowUp.title,
+            FollowUp.description, FollowUp.due_date, FollowUp.status, FollowUp.created_at
+        ).join(Patient, Patient.id == FollowUp.patient_id).where(
+            FollowUp.company_id == company_id,
+            Patient.deleted_at.is_(None)
+        ).order_by(FollowUp.created_at, FollowUp.id)
+    return select(
+        Note.id, Note.patient_id, Note.content, User.name.label("created_by"), Note.created_at
+    ).outerjoin(User, User.id == Note.created_by_user_id).where(
+        Note.company_id == company_id,
+        Patient.live(Note.patient_id)
+    ).order_by(Note.created_at, Note.id)
+
+def plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+async def stream_rows(db: AsyncSession, query, fmt: str):
+    result = await db.stream(query.execution_options(yield_per=CHUNK_ROWS))
+    columns = list(result.keys())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow(columns)
+
+    async for rows in result.partitions():
+        for row in rows:
+            values = [plain(value) for value in row]
+            if fmt == "csv":
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(columns, values))))
+                buffer.write("\n")
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+@router.get("/{resource}")
+async def export_resource(
+    resource: Literal["patients", "appointments", "follow-ups", "notes"],
+    format: Literal["csv", "ndjson"] = "csv",
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    # The session dependency stays open until the response has been sent, so the
+    # generator can keep reading from it.
+    return StreamingResponse(
+        stream_rows(db, export_query(resource, current_user.company_id), format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{resource}.{format}"'}
+    )
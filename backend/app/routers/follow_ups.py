@@ -1,70 +1,127 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.database import get_db
-from app.models import User, FollowUp, Patient
+from app.models import FollowUp, Patient
 from app.schemas import follow_up as follow_up_schema
-from app.utils import security
+from app.schemas import bulk as bulk_schema
+from app.routers import dashboard
+from app.utils import bulk, counters, http_cache, security, writes
+from app.utils.serialization import ListSerializer
 
 router = APIRouter(prefix="/api/follow-ups", tags=["followups"])
 
-@router.get("/", response_model=List[follow_up_schema.FollowUpRead])
-def get_followups(
+patient_name = joinedload(FollowUp.patient).load_only(Patient.name)
+follow_up_list = ListSerializer(follow_up_schema.FollowUpRead, {
+    "id": [FollowUp.id],
+    "patient_id": [FollowUp.patient_id],
+    "company_id": [FollowUp.company_id],
+    "title": [FollowUp.title],
+    "description": [FollowUp.description],
+    "due_date": [FollowUp.due_date],
+    "status": [FollowUp.status],
+    "created_at": [FollowUp.created_at],
+    "patientName": [patient_name],
+})
+
+@router.get("/", response_model=List[follow_up_schema.FollowUpRead], dependencies=[Depends(http_cache.conditional_get)])
+async def get_followups(
+    response: Response,
     status: Optional[str] = None,
     limit: int = 100,
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="Comma-separated response fields, e.g. id,title,due_date"),
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(FollowUp).options(joinedload(FollowUp.patient)).filter(FollowUp.company_id == current_user.company_id)
-    
+    fields = follow_up_list.parse_fields(fields)
+    query = (
+        select(FollowUp)
+        .options(*follow_up_list.load_options(fields))
+        .where(FollowUp.company_id == current_user.company_id, Patient.live(FollowUp.patient_id))
+    )
+
     if status:
-        query = query.filter(FollowUp.status == status)
-        
-    follow_ups = query.order_by(FollowUp.due_date.asc()).limit(limit).all()
-    return follow_ups
+        query = query.where(FollowUp.status == status)
+
+    result = await db.execute(query.order_by(FollowUp.due_date.asc()).limit(limit))
+    return follow_up_list.response(result.scalars().all(), response, fields)
 
 @router.post("/", response_model=follow_up_schema.FollowUpRead, status_code=status.HTTP_201_CREATED)
-def create_followup(
+async def create_followup(
     followup: follow_up_schema.FollowUpCreate,
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    patient = db.query(Patient).filter(
+    patient = await db.scalar(select(Patient).options(load_only(Patient.name)).where(
         Patient.id == followup.patient_id,
-        Patient.company_id == current_user.company_id
-    ).first()
+        Patient.company_id == current_user.company_id,
+        Patient.deleted_at.is_(None)
+    ))
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
-        
-    new_followup = FollowUp(
+
+    new_followup = await writes.insert_returning(
+        db, FollowUp,
         **followup.model_dump(),
         company_id=current_user.company_id
     )
-    db.add(new_followup)
-    db.commit()
-    db.refresh(new_followup)
+    set_committed_value(new_followup, "patient", patient)
+    await counters.touch(
+        db, current_user.company_id, open_follow_ups=counters.open_follow_up_delta(None, new_followup.status)
+    )
+    await db.commit()
+    dashboard.invalidate(current_user.company_id)
     return new_followup
 
+@router.post("/bulk", response_model=bulk_schema.BulkCreateResult)
+async def create_followups_bulk(
+    payload: bulk_schema.BulkCreate,
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    valid, failed = bulk.validate_items(follow_up_schema.FollowUpCreate, payload.items)
+    known = await bulk.company_patient_ids(db, current_user.company_id, (item.patient_id for _, item in valid))
+    valid, missing = bulk.drop_unknown_patients(valid, known)
+    created = [(index, {**item.model_dump(), "company_id": current_user.company_id}) for index, item in valid]
+    if created:
+        await bulk.insert_rows(db, FollowUp, [row for _, row in created])
+        await counters.touch(
+            db, current_user.company_id, open_follow_ups=sum(row["status"] == "open" for _, row in created)
+        )
+        await db.commit()
+        dashboard.invalidate(current_user.company_id)
+    return bulk.result(created, failed + missing)
+
 @router.patch("/{followup_id}", response_model=follow_up_schema.FollowUpRead)
-def update_followup(
+async def update_followup(
     followup_id: UUID,
     followup_update: follow_up_schema.FollowUpUpdate,
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    followup = db.query(FollowUp).filter(
+    # One read gives both the before-state the counters need and patientName
+    result = await db.execute(select(FollowUp).options(patient_name).where(
         FollowUp.id == followup_id,
-        FollowUp.company_id == current_user.company_id
-    ).first()
+        FollowUp.company_id == current_user.company_id,
+        Patient.live(FollowUp.patient_id)
+    ))
+    followup = result.scalars().first()
     if not followup:
         raise HTTPException(status_code=404, detail="FollowUp not found")
-    
+
+    before = followup.status
     update_data = followup_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(followup, key, value)
-        
-    db.commit()
-    db.refresh(followup)
+
+    await counters.touch(
+        db, current_user.company_id, open_follow_ups=counters.open_follow_up_delta(before, followup.status)
+    )
+    await db.commit()
+    dashboard.invalidate(current_user.company_id)
     return followup
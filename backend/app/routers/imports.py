@@ -0,0 +1,157 @@
+import csv
+import io
+import tempfile
+from collections import Counter
+from typing import Dict, List, Literal, Tuple
+from uuid import UUID
+from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.database import get_db
+from app.models import Patient, Appointment
+from app.schemas import patient as patient_schema
+from app.schemas import appointment as appointment_schema
+from app.schemas.bulk import BulkItemResult
+from app.routers import dashboard
+from app.utils import bulk, counters, security
+
+router = APIRouter(prefix="/api/import", tags=["import"])
+
+# Rows parsed, validated and committed per transaction. The upload itself is
+# spooled to disk by the multipart parser and read back lazily, and the error
+# report is spooled too, so memory stays flat however big the file is.
+CHUNK_ROWS = 1000
+REPORT_SPOOL_BYTES = 1024 * 1024
+REPORT_CHUNK_BYTES = 64 * 1024
+
+def read_chunk(reader: csv.DictReader, size: int) -> List[Tuple[int, Dict[str, str]]]:
+    """Up to `size` (line number, row) pairs; empty cells are dropped so schema defaults apply."""
+    chunk = []
+    for row in reader:
+        chunk.append((reader.line_num, {
+            key.strip(): value.strip() for key, value in row.items()
+            if key and isinstance(value, str) and value.strip()
+        }))
+        if len(chunk) == size:
+            break
+    return chunk
+
+async def resolve_patient_emails(db: AsyncSession, company_id: UUID, rows: List[Tuple[int, dict]]) -> List[BulkItemResult]:
+    """Fill in patient_id for rows that reference the patient by `patient_email`, in one query per chunk."""
+    emails = {row["patient_email"] for _, row in rows if "patient_id" not in row and "patient_email" in row}
+    matches: Dict[str, List[UUID]] = {}
+    if emails:
+        result = await db.execute(select(Patient.email, Patient.id).where(
+            Patient.company_id == company_id,
+            Patient.email.in_(emails),
+            Patient.deleted_at.is_(None)
+        ))
+        for email, patient_id in result.all():
+            matches.setdefault(email, []).append(patient_id)
+
+    failed = []
+    for index, (_, row) in enumerate(rows):
+        if "patient_id" in row or "patient_email" not in row:
+            continue
+        found = matches.get(row["patient_email"], [])
+        if len(found) == 1:
+            row["patient_id"] = str(found[0])
+        else:
+            failed.append(BulkItemResult(
+                index=index, error="Patient not found" if not found else "patient_email matches several patients"
+            ))
+    return failed
+
+async def import_patients(db: AsyncSession, company_id: UUID, rows) -> Tuple[int, List[BulkItemResult]]:
+    valid, failed = bulk.validate_items(patient_schema.PatientCreate, [row for _, row in rows])
+    created = [{**item.model_dump(), "company_id": company_id} for _, item in valid]
+    await bulk.insert_rows(db, Patient, created)
+    await counters.adjust_company(db, company_id, patients=len(created))
+    return len(created), failed
+
+async def import_appointments(db: AsyncSession, company_id: UUID, rows) -> Tuple[int, List[BulkItemResult]]:
+    unresolved = await resolve_patient_emails(db, company_id, rows)
+    skip = {result.index for result in unresolved}
+    candidates = [(index, row) for index, (_, row) in enumerate(rows) if index not in skip]
+    valid, failed = bulk.validate_items(appointment_schema.AppointmentCreate, [row for _, row in candidates])
+    # validate_items numbers items within `candidates`; map back to chunk positions
+    valid = [(candidates[index][0], item) for index, item in valid]
+    failed = [BulkItemResult(index=candidates[r.index][0], error=r.error) for r in failed]
+    known = await bulk.company_patient_ids(db, company_id, (item.patient_id for _, item in valid))
+    valid, missing = bulk.drop_unknown_patients(valid, known)
+    created = [{
+        **item.model_dump(exclude={"date", "time"}), "start_at": item.start_at, "company_id": company_id
+    } for _, item in valid]
+    await bulk.insert_rows(db, Appointment, created)
+    await counters.add_scheduled(db, company_id, Counter(
+        row["start_at"].date() for row in created if row["status"] == "scheduled"
+    ))
+    return len(created), unresolved + failed + missing
+
+IMPORTERS = {"patients": import_patients, "appointments": import_appointments}
+
+@router.post("/{resource}")
+async def import_csv(
+    resource: Literal["patients", "appointments"],
+    file: UploadFile = File(...),
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Import a CSV whose header names the create-schema fields.
+
+    Appointment rows may reference the patient by `patient_id` or by
+    `patient_email`. Each chunk of valid rows is committed on its own, so a
+    failure part-way keeps the chunks already imported. The response body is
+    a CSV error report (`line,error`; header only if every row was
+    imported), with the totals in the X-Import-Created / X-Import-Failed
+    headers.
+    """
+    importer = IMPORTERS[resource]
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    report = tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_BYTES, mode="w+", newline="")
+    report_writer = csv.writer(report)
+    report_writer.writerow(["line", "error"])
+    created_total = failed_total = 0
+
+    try:
+        while True:
+            # csv parsing is blocking file I/O on the spooled upload
+            rows = await run_in_threadpool(read_chunk, reader, CHUNK_ROWS)
+            if not rows:
+                break
+            created, failed = await importer(db, current_user.company_id, rows)
+            if created:
+                await counters.touch(db, current_user.company_id)
+            await db.commit()
+            created_total += created
+            failed_total += len(failed)
+            for result in sorted(failed, key=lambda r: r.index):
+                report_writer.writerow([rows[result.index][0], result.error])
+    except UnicodeDecodeError:
+        report_writer.writerow([reader.line_num + 1, "File is not valid UTF-8; import stopped"])
+        failed_total += 1
+    finally:
+        text.detach()
+        if created_total:
+            dashboard.invalidate(current_user.company_id)
+
+    report.seek(0)
+
+    def report_chunks():
+        with report:
+            while chunk := report.read(REPORT_CHUNK_BYTES):
+                yield chunk
+
+    return StreamingResponse(
+        report_chunks(),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="{resource}-import-errors.csv"',
+            "X-Import-Created": str(created_total),
+            "X-Import-Failed": str(failed_total),
+        }
+    )
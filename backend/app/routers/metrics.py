@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+
+from app.database import engine, pool_stats
+from app.routers import dashboard
+from app.utils import security, password_pool
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+@router.get("/")
+async def get_metrics(current_admin: security.CurrentUser = Depends(security.get_current_admin_user)):
+    # Per-worker counters; each process reports only its own caches
+    return {
+        "user_cache": security.user_cache.stats(),
+        "dashboard_cache": dashboard.stats_cache.stats(),
+        "revoked_entries": len(security.revoked),
+        "password_pool": password_pool.pool.stats(),
+        "db_pool": pool_stats.snapshot(engine.pool),
+    }
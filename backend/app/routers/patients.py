@@ -1,154 +1,341 @@
+from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import and_, func, select, true, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, contains_eager, joinedload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from pydantic import BaseModel
 
 from app.database import get_db
-from app.models import User, Patient, Note, Appointment, FollowUp
+from app.models import Patient, Note, Appointment, FollowUp, User
 from app.schemas import patient as patient_schema
 from app.schemas import note as note_schema
-from app.utils import security
+from app.schemas import bulk as bulk_schema
+from app.schemas import appointment as appointment_schema
+from app.schemas import follow_up as follow_up_schema
+from app.routers import dashboard
+from app.routers.dashboard import slots_table, top_rows
+from app.utils import bulk, counters, http_cache, security, writes
+from app.utils.search import search_patients
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.utils.serialization import ListSerializer
 
 router = APIRouter(prefix="/api/patients", tags=["patients"])
 
-@router.get("/", response_model=List[patient_schema.PatientRead])
-def get_patients(
+patient_list = ListSerializer(patient_schema.PatientRead, {
+    name: [getattr(Patient, name)] for name in patient_schema.PatientRead.model_fields
+})
+note_list = ListSerializer(note_schema.NoteRead, {
+    "id": [Note.id],
+    "content": [Note.content],
+    "patient_id": [Note.patient_id],
+    "created_by_user_id": [Note.created_by_user_id],
+    "created_at": [Note.created_at],
+    "createdBy": [joinedload(Note.created_by_user).load_only(User.name)],
+})
+
+# Entries per section of the chart view
+CHART_SECTIONS = {"recent_notes": 10, "upcoming": 5, "past": 5, "open_follow_ups": 10}
+
+class PatientChart(BaseModel):
+    patient: patient_schema.PatientRead
+    recentNotes: List[note_schema.NoteRead]
+    upcomingAppointments: List[appointment_schema.AppointmentRead]
+    pastAppointments: List[appointment_schema.AppointmentRead]
+    openFollowUps: List[follow_up_schema.FollowUpRead]
+
+async def get_company_patient(db: AsyncSession, patient_id: UUID, company_id: UUID) -> Patient:
+    result = await db.execute(select(Patient).where(
+        Patient.id == patient_id,
+        Patient.company_id == company_id,
+        Patient.deleted_at.is_(None)
+    ))
+    patient = result.scalars().first()
+    if not patient:
+        raise HTTPException(status_code=404, detail="Patient not found")
+    return patient
+
+@router.get("/", response_model=List[patient_schema.PatientRead], dependencies=[Depends(http_cache.conditional_get)])
+async def get_patients(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     search: Optional[str] = None,
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="Comma-separated response fields, e.g. id,name for pickers"),
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Patient).filter(Patient.company_id == current_user.company_id)
-    
+    # Stable (created_at, id) order so pages neither overlap nor skip rows.
+    # Pass the X-Next-Cursor header back as `cursor` to seek straight to the
+    # next page; `skip` still works but costs more the deeper it goes.
+    fields = patient_list.parse_fields(fields)
     if search:
-        search_filter = or_(
-            Patient.name.ilike(f"%{search}%"),
-            Patient.email.ilike(f"%{search}%")
+        # Ranked, index-backed matches on name/email/phone; best `limit` results
+        patients = await search_patients(
+            db, current_user.company_id, search, limit, offset=skip, options=patient_list.load_options(fields)
         )
-        query = query.filter(search_filter)
-        
-    patients = query.offset(skip).limit(limit).all()
-    return patients
+        return patient_list.response(patients, response, fields)
+
+    # created_at is also needed for the next-page cursor
+    columns = fields | {"created_at"} if fields else None
+    query = select(Patient).options(*patient_list.load_options(columns)).where(
+        Patient.company_id == current_user.company_id,
+        Patient.deleted_at.is_(None)
+    )
+    if cursor:
+        query = query.where(tuple_(Patient.created_at, Patient.id) > decode_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
+
+    result = await db.execute(query.order_by(Patient.created_at, Patient.id).limit(limit + 1))
+    patients = result.scalars().all()
+    if len(patients) > limit:
+        patients = patients[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(patients[-1].created_at, patients[-1].id)
+    return patient_list.response(patients, response, fields)
 
 @router.post("/", response_model=patient_schema.PatientRead, status_code=status.HTTP_201_CREATED)
-def create_patient(
+async def create_patient(
     patient: patient_schema.PatientCreate,
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     # Check for existing email within the company? Optional business logic.
     # Allowing duplicate emails for now unless unique constraint exists.
-    
-    new_patient = Patient(
+
+    new_patient = await writes.insert_returning(
+        db, Patient,
         **patient.model_dump(),
         company_id=current_user.company_id
     )
-    db.add(new_patient)
-    db.commit()
-    db.refresh(new_patient)
+    await counters.touch(db, current_user.company_id, patients=1)
+    await db.commit()
+    dashboard.invalidate(current_user.company_id)
     return new_patient
 
-@router.get("/{patient_id}", response_model=patient_schema.PatientRead)
-def get_patient(
+@router.post("/bulk", response_model=bulk_schema.BulkCreateResult)
+async def create_patients_bulk(
+    payload: bulk_schema.BulkCreate,
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    # Valid items go in with one executemany INSERT and one commit; invalid ones are reported per index
+    valid, failed = bulk.validate_items(patient_schema.PatientCreate, payload.items)
+    created = [(index, {**item.model_dump(), "company_id": current_user.company_id}) for index, item in valid]
+    if created:
+        await bulk.insert_rows(db, Patient, [row for _, row in created])
+        await counters.touch(db, current_user.company_id, patients=len(created))
+        await db.commit()
+        dashboard.invalidate(current_user.company_id)
+    return bulk.result(created, failed)
+
+@router.get("/{patient_id}", response_model=patient_schema.PatientRead, dependencies=[Depends(http_cache.conditional_get)])
+async def get_patient(
     patient_id: UUID,
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    patient = db.query(Patient).filter(
-        Patient.id == patient_id, 
-        Patient.company_id == current_user.company_id
-    ).first()
-    if not patient:
-        raise HTTPException(status_code=404, detail="Patient not found")
-    return patient
+    return await get_company_patient(db, patient_id, current_user.company_id)
 
 @router.put("/{patient_id}", response_model=patient_schema.PatientRead)
-def update_patient(
+async def update_patient(
     patient_id: UUID,
     patient_update: patient_schema.PatientUpdate,
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    patient = db.query(Patient).filter(
-        Patient.id == patient_id, 
-        Patient.company_id == current_user.company_id
-    ).first()
+    update_data = patient_update.model_dump(exclude_unset=True)
+    if not update_data:
+        return await get_company_patient(db, patient_id, current_user.company_id)
+
+    patient = await writes.update_returning(db, Patient, (
+        Patient.id == patient_id,
+        Patient.company_id == current_user.company_id,
+        Patient.deleted_at.is_(None)
+    ), update_data)
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
-    
-    update_data = patient_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(patient, key, value)
-        
-    db.commit()
-    db.refresh(patient)
+
+    await counters.touch(db, current_user.company_id)
+    await db.commit()
+    dashboard.invalidate(current_user.company_id)
     return patient
 
 @router.delete("/{patient_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_patient(
+async def delete_patient(
     patient_id: UUID,
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    patient = db.query(Patient).filter(
-        Patient.id == patient_id, 
-        Patient.company_id == current_user.company_id
-    ).first()
-    if not patient:
+    # Soft delete: a single UPDATE hides the patient and, through Patient.live(),
+    # their appointments, notes and follow-ups. Nothing is loaded into the
+    # session and no dependent row is locked; the purge job (app/utils/purge.py)
+    # removes the history later in small batches.
+    result = await db.execute(
+        update(Patient)
+        .where(Patient.id == patient_id, Patient.company_id == current_user.company_id, Patient.deleted_at.is_(None))
+        .values(deleted_at=func.now())
+    )
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Patient not found")
-    
-    # Optional: Check if patient has appointments/followups and block delete or cascade?
-    # SQLAlchemy relationships might handle cascade if configured, currently manual.
-    # For now, we just delete.
-    db.delete(patient)
-    db.commit()
+    await counters.remove_patient(db, current_user.company_id, patient_id)
+    await db.commit()
+    dashboard.invalidate(current_user.company_id)
     return None
 
-# --- NOTES SUB-RESOURCE ---
+# --- CHART ---
+
+def chart_query(company_id: UUID, patient_id: UUID, now: datetime):
+    # Same shape as dashboard_query: each section is a numbered top-N
+    # subquery, all lined up on a constant slots table, so the n-th result
+    # row carries the n-th entry of every section. The patient is the outer
+    # side, which makes it the tenant check too: no rows means not ours.
+    def section(model, name, order_by, *filters):
+        return top_rows(model, name, order_by, model.patient_id == patient_id, model.company_id == company_id,
+                        *filters, limit=CHART_SECTIONS[name])
 
-@router.get("/{patient_id}/notes", response_model=List[note_schema.NoteRead])
-def get_patient_notes(
+    notes, notes_position = section(Note, "recent_notes", (Note.created_at.desc(), Note.id.desc()))
+    upcoming, upcoming_position = section(
+        Appointment, "upcoming", (Appointment.start_at.asc(), Appointment.id), Appointment.start_at >= now
+    )
+    past, past_position = section(
+        Appointment, "past", (Appointment.start_at.desc(), Appointment.id.desc()), Appointment.start_at < now
+    )
+    follow_ups, follow_ups_position = section(
+        FollowUp, "open_follow_ups", (FollowUp.due_date.asc(), FollowUp.id), FollowUp.status == "open"
+    )
+    author = aliased(User)
+    slots = slots_table(max(CHART_SECTIONS.values()))
+
+    return (
+        select(Patient, notes, upcoming, past, follow_ups)
+        .select_from(Patient)
+        .join(slots, true())
+        .outerjoin(notes, notes_position == slots.c.n)
+        .outerjoin(author, author.id == notes.created_by_user_id)
+        .outerjoin(upcoming, upcoming_position == slots.c.n)
+        .outerjoin(past, past_position == slots.c.n)
+        .outerjoin(follow_ups, follow_ups_position == slots.c.n)
+        .where(Patient.id == patient_id, Patient.company_id == company_id, Patient.deleted_at.is_(None))
+        .options(
+            # patientName comes from the chart's own patient columns; createdBy from the author's name only
+            contains_eager(notes.created_by_user.of_type(author)).load_only(author.name),
+            contains_eager(upcoming.patient),
+            contains_eager(past.patient),
+            contains_eager(follow_ups.patient),
+        )
+        .order_by(slots.c.n)
+    )
+
+async def chart_validators(
     patient_id: UUID,
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    # Verify patient exists and belongs to company
-    patient = db.query(Patient).filter(
-        Patient.id == patient_id, 
-        Patient.company_id == current_user.company_id
-    ).first()
-    if not patient:
+    # The upcoming/past split moves whenever a visit's start passes, with no
+    # write to bump data_version. The latest start already passed pins the
+    # current split, so it joins the validators.
+    passed = await db.scalar(select(func.max(Appointment.start_at)).where(
+        Appointment.patient_id == patient_id,
+        Appointment.company_id == current_user.company_id,
+        Appointment.start_at < datetime.now()
+    ))
+    # start_at is naive clinic-local time, the same clock datetime.now() reads
+    await http_cache.revalidate(request, response, current_user, db, passed and passed.astimezone(timezone.utc))
+
+@router.get("/{patient_id}/chart", response_model=PatientChart, dependencies=[Depends(chart_validators)])
+async def get_patient_chart(
+    patient_id: UUID,
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    # Everything the patient page opens with, in one request and one statement.
+    # Older notes page through /notes with the cursor from the last note here.
+    rows = (await db.execute(chart_query(current_user.company_id, patient_id, datetime.now()))).all()
+    if not rows:
         raise HTTPException(status_code=404, detail="Patient not found")
 
-    notes = db.query(Note).options(joinedload(Note.created_by_user)).filter(
-        Note.patient_id == patient_id,
-        Note.company_id == current_user.company_id
-    ).order_by(Note.created_at.desc()).all()
-    return notes
+    def entries(index):
+        return [row[index] for row in rows if row[index] is not None]
+
+    return PatientChart(
+        patient=rows[0][0],
+        recentNotes=entries(1),
+        upcomingAppointments=entries(2),
+        pastAppointments=entries(3),
+        openFollowUps=entries(4),
+    )
+
+# --- NOTES SUB-RESOURCE ---
+
+@router.get("/{patient_id}/notes", response_model=List[note_schema.NoteRead], dependencies=[Depends(http_cache.conditional_get)])
+async def get_patient_notes(
+    response: Response,
+    patient_id: UUID,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    # Newest first, a page at a time; pass X-Next-Cursor back as `cursor` for
+    # older notes. The patient is the outer side of the join, so the tenant
+    # check and the page come back in one statement: no row at all means the
+    # patient isn't ours, a row with no note means the timeline is exhausted.
+    note_filter = and_(Note.patient_id == Patient.id, Note.company_id == Patient.company_id)
+    if cursor:
+        note_filter = and_(note_filter, tuple_(Note.created_at, Note.id) < decode_cursor(cursor))
+
+    result = await db.execute(
+        select(Patient.id, Note)
+        .outerjoin(Note, note_filter)
+        .options(*note_list.load_options())
+        .where(Patient.id == patient_id, Patient.company_id == current_user.company_id, Patient.deleted_at.is_(None))
+        .order_by(Note.created_at.desc(), Note.id.desc())
+        .limit(limit + 1)
+    )
+    rows = result.all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Patient not found")
+    notes = [note for _, note in rows if note is not None]
+    if len(notes) > limit:
+        notes = notes[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(notes[-1].created_at, notes[-1].id)
+    return note_list.response(notes, response)
 
 @router.post("/{patient_id}/notes", response_model=note_schema.NoteRead)
-def create_patient_note(
+async def create_patient_note(
     patient_id: UUID,
     note: note_schema.NoteCreate,
-    current_user: User = Depends(security.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    patient = db.query(Patient).filter(
-        Patient.id == patient_id, 
-        Patient.company_id == current_user.company_id
-    ).first()
-    if not patient:
+    # The tenant check also fetches the author's name for `createdBy`
+    author = await db.scalar(
+        select(User).options(load_only(User.name))
+        .join(Patient, and_(
+            Patient.id == patient_id,
+            Patient.company_id == User.company_id,
+            Patient.deleted_at.is_(None)
+        ))
+        .where(User.id == current_user.id)
+    )
+    if not author:
         raise HTTPException(status_code=404, detail="Patient not found")
-        
-    new_note = Note(
+
+    new_note = await writes.insert_returning(
+        db, Note,
         content=note.content,
         patient_id=patient_id,
         created_by_user_id=current_user.id,
         company_id=current_user.company_id
     )
-    db.add(new_note)
-    db.commit()
-    db.refresh(new_note)
+    # Relationships can't lazy-load under asyncio; hand over the author we already have
+    set_committed_value(new_note, "created_by_user", author)
+    await counters.touch(db, current_user.company_id)
+    await db.commit()
     return new_note
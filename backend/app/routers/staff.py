@@ -1,30 +1,53 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.database import get_db
-from app.models import User
+from app.models import Company, User
 from app.schemas import user as user_schema
-from app.utils import security
+from app.utils import counters, http_cache, security
+from app.utils.serialization import ListSerializer
 
 router = APIRouter(prefix="/api/staff", tags=["staff"])
 
-@router.get("/", response_model=List[user_schema.UserRead])
-def get_staff(
-    current_admin: User = Depends(security.get_current_admin_user),
-    db: Session = Depends(get_db)
+company = joinedload(User.company).load_only(Company.name, Company.code)
+staff_list = ListSerializer(user_schema.UserRead, {
+    "id": [User.id],
+    "email": [User.email],
+    "name": [User.name],
+    "role": [User.role],
+    "company_id": [User.company_id],
+    "company_name": [company],
+    "company_code": [company],
+    "created_at": [User.created_at],
+})
+
+@router.get("/", response_model=List[user_schema.UserRead], dependencies=[
+    Depends(security.get_current_admin_user), Depends(http_cache.conditional_get)
+])
+async def get_staff(
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated response fields, e.g. id,name,role"),
+    current_admin: security.CurrentUser = Depends(security.get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
 ):
     # Only admins can see this list (enforced by dependency)
     # List all users in the company
-    staff_members = db.query(User).options(joinedload(User.company)).filter(User.company_id == current_admin.company_id).all()
-    return staff_members
+    # password_hash and the rest of the company row are never selected
+    fields = staff_list.parse_fields(fields)
+    result = await db.execute(
+        select(User).options(*staff_list.load_options(fields)).where(User.company_id == current_admin.company_id)
+    )
+    return staff_list.response(result.scalars().all(), response, fields)
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def remove_staff(
+async def remove_staff(
     user_id: UUID,
-    current_admin: User = Depends(security.get_current_admin_user),
-    db: Session = Depends(get_db)
+    current_admin: security.CurrentUser = Depends(security.get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
 ):
     # Ensure not deleting self
     if user_id == current_admin.id:
@@ -32,15 +55,16 @@ def remove_staff(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot remove yourself"
         )
-    
-    user_to_remove = db.query(User).filter(
+
+    # Tenant-scoped DELETE: another company's user simply doesn't match
+    result = await db.execute(delete(User).where(
         User.id == user_id,
         User.company_id == current_admin.company_id
-    ).first()
-    
-    if not user_to_remove:
+    ))
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Staff member not found")
-        
-    db.delete(user_to_remove)
-    db.commit()
+
+    await counters.touch(db, current_admin.company_id)
+    await db.commit()
+    security.revoke_user(user_id)
     return None
@@ -1,34 +1,59 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from uuid import UUID
+import datetime as dt
 from datetime import datetime, date
 from typing import Optional
 from enum import Enum
 
+from app.utils.times import parse_time
+
 class AppointmentStatus(str, Enum):
     scheduled = "scheduled"
     completed = "completed"
     cancelled = "cancelled"
 
+def normalize_time(value: Optional[str]) -> Optional[str]:
+    """'9:05' / '09:05:00' / '9.05 am' -> '09:05'; the forms the start_at migration read."""
+    if value is None:
+        return value
+    parsed = parse_time(value)
+    if parsed is None:
+        raise ValueError("time must be a time of day, e.g. 09:30 or 2.30 pm")
+    return parsed.strftime("%H:%M")
+
 class AppointmentBase(BaseModel):
     date: date
     time: str
     reason: str
     status: AppointmentStatus = AppointmentStatus.scheduled
+    duration_minutes: Optional[int] = Field(None, gt=0)
+
+    _normalize_time = field_validator("time")(normalize_time)
 
 class AppointmentCreate(AppointmentBase):
     patient_id: UUID
 
+    @property
+    def start_at(self) -> datetime:
+        return datetime.combine(self.date, dt.time.fromisoformat(self.time))
+
 class AppointmentUpdate(BaseModel):
-    date: Optional[date] = None
+    # dt.date: a bare `date` here would resolve to this field's own None default
+    date: Optional[dt.date] = None
     time: Optional[str] = None
     reason: Optional[str] = None
     status: Optional[AppointmentStatus] = None
+    duration_minutes: Optional[int] = Field(None, gt=0)
+
+    _normalize_time = field_validator("time")(normalize_time)
 
 class AppointmentRead(AppointmentBase):
     id: UUID
     patient_id: UUID
     patientName: str # Computed property in model
     company_id: UUID
+    start_at: datetime
+    end_at: Optional[datetime] = None
     created_at: datetime
 
     class Config:
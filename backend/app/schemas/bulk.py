@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+class BulkCreate(BaseModel):
+    # Items are validated one by one so a bad row fails alone, not the batch
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[UUID] = None
+    error: Optional[str] = None
+
+class BulkCreateResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
@@ -21,6 +21,9 @@ class PatientUpdate(BaseModel):
     address: Optional[str] = None
 
 class PatientRead(PatientBase):
+    # Stored emails were validated on the way in; re-checking every row on the
+    # way out dominated list serialization.
+    email: str
     id: UUID
     company_id: UUID
     created_at: datetime
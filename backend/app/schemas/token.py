@@ -9,3 +9,6 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     id: Optional[str] = None
+    company_id: Optional[str] = None
+    role: Optional[str] = None
+    jti: Optional[str] = None
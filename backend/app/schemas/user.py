@@ -18,6 +18,7 @@ class UserCreate(UserBase):
     role: UserRole
 
 class UserRead(UserBase):
+    email: str  # validated on registration, see PatientRead
     id: UUID
     role: UserRole
     company_id: UUID
@@ -0,0 +1,31 @@
+import asyncio
+import logging
+
+from app.database import SessionLocal
+from app.utils import counters, purge
+
+logger = logging.getLogger(__name__)
+
+async def reconcile_counters_periodically(interval: float):
+    """Background loop started by the app lifespan; repairs dashboard counter drift."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with SessionLocal() as db:
+                fixed = await counters.reconcile_all(db)
+            if fixed:
+                logger.warning("Counter reconciliation corrected %d drifted counters", fixed)
+        except Exception:
+            logger.exception("Counter reconciliation failed")
+
+async def purge_deleted_patients_periodically(interval: float, batch_size: int):
+    """Background loop started by the app lifespan; hard-deletes soft-deleted patients and their history."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with SessionLocal() as db:
+                deleted = await purge.purge_deleted_patients(db, batch_size)
+            if deleted:
+                logger.info("Patient purge deleted %d rows", deleted)
+        except Exception:
+            logger.exception("Patient purge failed")
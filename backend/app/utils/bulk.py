@@ -0,0 +1,60 @@
+import uuid
+from typing import Any, Dict, Iterable, List, Set, Tuple, Type
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Patient
+from app.schemas.bulk import BulkItemResult, BulkCreateResult
+
+def validate_items(schema: Type[BaseModel], items: List[Dict[str, Any]]) -> Tuple[List[Tuple[int, BaseModel]], List[BulkItemResult]]:
+    """Split raw batch items into (index, parsed) pairs and per-item failures."""
+    valid, failed = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as exc:
+            message = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+            )
+            failed.append(BulkItemResult(index=index, error=message))
+    return valid, failed
+
+async def company_patient_ids(db: AsyncSession, company_id: UUID, patient_ids: Iterable[UUID]) -> Set[UUID]:
+    """Which of `patient_ids` belong to the company, in one query."""
+    patient_ids = set(patient_ids)
+    if not patient_ids:
+        return set()
+    result = await db.execute(select(Patient.id).where(
+        Patient.company_id == company_id,
+        Patient.id.in_(patient_ids),
+        Patient.deleted_at.is_(None)
+    ))
+    return set(result.scalars().all())
+
+def drop_unknown_patients(valid, known: Set[UUID]):
+    """Move items whose patient_id isn't one of the company's patients into failures."""
+    kept, failed = [], []
+    for index, item in valid:
+        if item.patient_id in known:
+            kept.append((index, item))
+        else:
+            failed.append(BulkItemResult(index=index, error="Patient not found"))
+    return kept, failed
+
+async def insert_rows(db: AsyncSession, model, rows: List[Dict[str, Any]]) -> None:
+    """One executemany INSERT; ids are assigned here so no RETURNING/refresh round trip is needed."""
+    for row in rows:
+        row.setdefault("id", uuid.uuid4())
+    if rows:
+        await db.execute(insert(model), rows)
+
+def result(created: List[Tuple[int, Dict[str, Any]]], failed: List[BulkItemResult]) -> BulkCreateResult:
+    results = [BulkItemResult(index=index, id=row["id"]) for index, row in created] + failed
+    return BulkCreateResult(
+        created=len(created),
+        failed=len(failed),
+        results=sorted(results, key=lambda item: item.index)
+    )
@@ -0,0 +1,197 @@
+from datetime import date
+from typing import List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Company, Patient, Appointment, FollowUp, CompanyStats, DailyAppointmentCount
+
+# Write paths call these inside their own transaction, before commit, so the
+# counters move atomically with the rows they count.
+
+UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+async def _increment(db: AsyncSession, table, keys: Sequence[str], rows: List[dict]):
+    """Add each row's non-key values onto the counter row with the same keys, creating it if missing.
+
+    All rows must carry the same columns and distinct keys; they go out as a
+    single multi-row upsert, in key order so concurrent writers lock rows in
+    the same sequence.
+    """
+    rows = sorted(rows, key=lambda row: tuple(str(row[name]) for name in keys))
+    deltas = [name for name in rows[0] if name not in keys]
+    upsert = UPSERTS.get(db.get_bind().dialect.name)
+    if upsert is not None:
+        stmt = upsert(table).values(rows)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={name: table.c[name] + stmt.excluded[name] for name in deltas},
+        ))
+        return
+    for row in rows:
+        result = await db.execute(
+            update(table)
+            .where(*(table.c[name] == row[name] for name in keys))
+            .values({name: table.c[name] + row[name] for name in deltas})
+        )
+        if result.rowcount == 0:
+            await db.execute(insert(table).values(**row))
+
+async def adjust_company(db: AsyncSession, company_id: UUID, patients: int = 0, open_follow_ups: int = 0):
+    deltas = {name: delta for name, delta in (("patients", patients), ("open_follow_ups", open_follow_ups)) if delta}
+    if deltas:
+        await _increment(db, CompanyStats.__table__, ["company_id"], [{"company_id": company_id, **deltas}])
+
+async def touch(db: AsyncSession, company_id: UUID, patients: int = 0, open_follow_ups: int = 0):
+    """Record that the company's data changed: bumps data_version and stamps modified_at.
+
+    Counter deltas passed here ride along in the same upsert, so a write
+    path that changes a count needs no separate adjust_company() statement.
+    """
+    table = CompanyStats.__table__
+    deltas = {name: delta for name, delta in (("patients", patients), ("open_follow_ups", open_follow_ups)) if delta}
+    upsert = UPSERTS.get(db.get_bind().dialect.name)
+    if upsert is not None:
+        stmt = upsert(table).values(company_id=company_id, data_version=1, modified_at=func.now(), **deltas)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=["company_id"],
+            set_={
+                "data_version": table.c.data_version + 1,
+                "modified_at": stmt.excluded.modified_at,
+                **{name: table.c[name] + stmt.excluded[name] for name in deltas},
+            },
+        ))
+        return
+    result = await db.execute(
+        update(table).where(table.c.company_id == company_id).values(
+            data_version=table.c.data_version + 1, modified_at=func.now(),
+            **{name: table.c[name] + delta for name, delta in deltas.items()}
+        )
+    )
+    if result.rowcount == 0:
+        await db.execute(insert(table).values(company_id=company_id, data_version=1, modified_at=func.now(), **deltas))
+
+async def track_appointment(
+    db: AsyncSession,
+    company_id: UUID,
+    before: Optional[Tuple[date, str]],
+    after: Optional[Tuple[date, str]],
+):
+    """Move the per-day scheduled count for an appointment's (date, status); None means created/deleted."""
+    old = before if before and before[1] == "scheduled" else None
+    new = after if after and after[1] == "scheduled" else None
+    if old == new:
+        return
+    rows = [
+        {"company_id": company_id, "date": change[0], "scheduled": delta}
+        for change, delta in ((old, -1), (new, 1)) if change
+    ]
+    await _increment(db, DailyAppointmentCount.__table__, ["company_id", "date"], rows)
+
+async def add_scheduled(db: AsyncSession, company_id: UUID, per_day: Mapping[date, int]):
+    """Bulk form of track_appointment: per-day deltas (negative to remove), as one statement."""
+    rows = [{"company_id": company_id, "date": day, "scheduled": count} for day, count in per_day.items() if count]
+    if rows:
+        await _increment(db, DailyAppointmentCount.__table__, ["company_id", "date"], rows)
+
+def open_follow_up_delta(before: Optional[str], after: Optional[str]) -> int:
+    """Change in the open follow-up count for a status change (None means created/deleted); pass to touch()."""
+    return (after == "open") - (before == "open")
+
+async def remove_patient(db: AsyncSession, company_id: UUID, patient_id: UUID, today: Optional[date] = None):
+    """Take a soft-deleted patient and their open follow-ups / upcoming scheduled visits off the counters.
+
+    Two aggregate reads over the patient's rows, nothing loaded into the
+    session; also touch()es the company, so callers don't.
+    """
+    today = today or date.today()
+    open_follow_ups = await db.scalar(select(func.count()).select_from(FollowUp).where(
+        FollowUp.patient_id == patient_id,
+        FollowUp.status == "open"
+    ))
+    scheduled = (await db.execute(
+        select(Appointment.date, func.count()).where(
+            Appointment.patient_id == patient_id,
+            Appointment.start_at >= Appointment.day_start(today),
+            Appointment.status == "scheduled"
+        ).group_by(Appointment.date)
+    )).all()
+    await add_scheduled(db, company_id, {day: -count for day, count in scheduled})
+    await touch(db, company_id, patients=-1, open_follow_ups=-open_follow_ups)
+
+# --- RECONCILIATION ---
+
+async def reconcile_company(db: AsyncSession, company_id: UUID, today: Optional[date] = None) -> int:
+    """Recount one company's counters from the source tables, fix any drift and commit.
+
+    Returns the number of counters corrected. Counter rows are locked before
+    recounting, so writers that commit meanwhile apply their delta on top of
+    the corrected value. Only days from `today` on are checked; earlier days
+    are never read by the dashboard.
+    """
+    today = today or date.today()
+    fixed = 0
+
+    stats = await db.get(CompanyStats, company_id, with_for_update=True, populate_existing=True)
+    if stats is None:
+        stats = CompanyStats(company_id=company_id, patients=0, open_follow_ups=0)
+        db.add(stats)
+    actual = {
+        "patients": await db.scalar(
+            select(func.count()).select_from(Patient).where(
+                Patient.company_id == company_id,
+                Patient.deleted_at.is_(None)
+            )
+        ),
+        "open_follow_ups": await db.scalar(
+            select(func.count()).select_from(FollowUp).where(
+                FollowUp.company_id == company_id,
+                FollowUp.status == "open",
+                Patient.live(FollowUp.patient_id)
+            )
+        ),
+    }
+    for name, value in actual.items():
+        if getattr(stats, name) != value:
+            setattr(stats, name, value)
+            fixed += 1
+
+    stored = {
+        row.date: row for row in (await db.execute(
+            select(DailyAppointmentCount).where(
+                DailyAppointmentCount.company_id == company_id,
+                DailyAppointmentCount.date >= today
+            ).with_for_update().execution_options(populate_existing=True)
+        )).scalars()
+    }
+    scheduled = dict((await db.execute(
+        select(Appointment.date, func.count()).where(
+            Appointment.company_id == company_id,
+            Appointment.start_at >= Appointment.day_start(today),
+            Appointment.status == "scheduled",
+            Patient.live(Appointment.patient_id)
+        ).group_by(Appointment.date)
+    )).all())
+    for day in stored.keys() | scheduled.keys():
+        value = scheduled.get(day, 0)
+        row = stored.get(day)
+        if row is None:
+            db.add(DailyAppointmentCount(company_id=company_id, date=day, scheduled=value))
+        elif row.scheduled != value:
+            row.scheduled = value
+        else:
+            continue
+        fixed += 1
+
+    await db.commit()
+    return fixed
+
+async def reconcile_all(db: AsyncSession, today: Optional[date] = None) -> int:
+    """reconcile_company for every company, one transaction each."""
+    company_ids = (await db.scalars(select(Company.id))).all()
+    fixed = 0
+    for company_id in company_ids:
+        fixed += await reconcile_company(db, company_id, today)
+    return fixed
@@ -0,0 +1,91 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models import CompanyStats
+from app.utils import security
+
+# Validators for the read endpoints come from company_stats.data_version,
+# which every write path bumps (counters.touch) in its own transaction. A
+# conditional GET therefore costs one primary-key lookup, and a 304 is sent
+# before the list query runs or anything is serialized. The version is read
+# before the data, so a write landing in between can only make the ETag older
+# than the body, which just means one extra full response later.
+
+CACHE_CONTROL = "private, no-cache"
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 §13.1.2): W/ prefixes are ignored
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+def not_modified_since(header: Optional[str], modified_at: Optional[datetime]) -> bool:
+    if not header or modified_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole seconds, so a write later in the second the client
+    # saw would look unmodified; only a strictly earlier second is safe
+    return modified_at.replace(microsecond=0) < since
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    current_user: security.CurrentUser = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Route dependency: sets ETag/Last-Modified, or answers 304 Not Modified."""
+    await revalidate(request, response, current_user, db)
+
+async def revalidate(
+    request: Request,
+    response: Response,
+    current_user: security.CurrentUser,
+    db: AsyncSession,
+    changed_at: Optional[datetime] = None,
+):
+    """conditional_get for responses that can also change without a write.
+
+    `changed_at` (timezone-aware) is the latest such change, e.g. the moment
+    time moved a row from one section to another; it is folded into both
+    validators.
+    """
+    row = (await db.execute(
+        select(CompanyStats.data_version, CompanyStats.modified_at)
+        .where(CompanyStats.company_id == current_user.company_id)
+    )).first()
+    version, modified_at = row if row else (0, None)
+    if modified_at is not None and modified_at.tzinfo is None:
+        modified_at = modified_at.replace(tzinfo=timezone.utc)  # SQLite hands back naive UTC
+    if changed_at is not None:
+        modified_at = changed_at if modified_at is None else max(modified_at, changed_at)
+
+    scope = f"{current_user.company_id}:{request.url.path}?{request.url.query}"
+    if changed_at is not None:
+        scope += f"@{changed_at.isoformat()}"
+    scope = scope.encode()
+    etag = f'W/"{version}-{hashlib.sha1(scope).hexdigest()[:16]}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if modified_at is not None:
+        headers["Last-Modified"] = format_datetime(modified_at, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, etag) or (
+        if_none_match is None and not_modified_since(request.headers.get("if-modified-since"), modified_at)
+    ):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
@@ -0,0 +1,92 @@
+import bisect
+import threading
+import time
+
+class LatencyHistogram:
+    """Cumulative latency histogram with fixed millisecond buckets."""
+
+    BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self):
+        self._counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        index = bisect.bisect_left(self.BUCKETS_MS, ms)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            buckets = {f"le_{bound}ms": n for bound, n in zip(self.BUCKETS_MS, self._counts)}
+            buckets["gt_%dms" % self.BUCKETS_MS[-1]] = self._counts[-1]
+            return {
+                "count": self.count,
+                "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+                "max_ms": round(self.max_ms, 3),
+                "buckets": buckets,
+            }
+
+class PoolStats:
+    """Connection pool counters fed by pool and session events.
+
+    `checkout` measures how long sessions waited to get a connection (queueing
+    plus any new connect), `hold` how long each connection stayed checked out.
+    Comparing the two tells pool starvation apart from slow queries.
+    """
+
+    def __init__(self):
+        self.checkout = LatencyHistogram()
+        self.hold = LatencyHistogram()
+        self._lock = threading.Lock()
+        self.timeouts = 0
+        self.connections_opened = 0
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connections_opened += 1
+
+    def on_transaction_create(self, session, transaction):
+        # The ORM creates a (sub)transaction right before it asks the pool for a
+        # connection, so the latest one marks the start of the wait
+        session.info["checkout_started_at"] = time.perf_counter()
+
+    def on_session_begin(self, session, transaction, connection):
+        started = session.info.pop("checkout_started_at", None)
+        if started is not None:
+            self.checkout.observe(time.perf_counter() - started)
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            self.hold.observe(time.perf_counter() - started)
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            counts = {"connections_opened": self.connections_opened, "checkout_timeouts": self.timeouts}
+        stats = {
+            "pool_class": type(pool).__name__,
+            **counts,
+            "checkout_latency": self.checkout.snapshot(),
+            "hold_time": self.hold.snapshot(),
+        }
+        # Queue-based pools report live occupancy; Static/Null pools have none
+        for name in ("size", "checkedout", "checkedin", "overflow"):
+            method = getattr(pool, name, None)
+            if callable(method):
+                stats[name] = method()
+        return stats
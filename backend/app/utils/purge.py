@@ -0,0 +1,42 @@
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Patient, Appointment, FollowUp, Note
+
+# Hard-deletes soft-deleted patients and everything that references them.
+# Counters were already adjusted when the patient was soft-deleted, and every
+# read path filters the history out through Patient.live(), so nothing here
+# touches company_stats or the dashboard cache. Each DELETE removes at most
+# `batch_size` rows by primary key and commits on its own, so no transaction
+# holds more than one batch of row locks.
+
+DEPENDENTS = (Note, Appointment, FollowUp)
+
+async def purge_patient(db: AsyncSession, patient_id, batch_size: int) -> int:
+    """Delete one soft-deleted patient's notes, appointments, follow-ups and then the patient row.
+
+    Returns the number of rows deleted. Safe to re-run after an interruption:
+    every committed batch stays deleted and the rest is picked up next time.
+    """
+    deleted = 0
+    for model in DEPENDENTS:
+        while True:
+            batch = select(model.id).where(model.patient_id == patient_id).limit(batch_size).scalar_subquery()
+            result = await db.execute(delete(model).where(model.id.in_(batch)))
+            await db.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                break
+    result = await db.execute(delete(Patient).where(Patient.id == patient_id, Patient.deleted_at.is_not(None)))
+    await db.commit()
+    return deleted + result.rowcount
+
+async def purge_deleted_patients(db: AsyncSession, batch_size: int) -> int:
+    """purge_patient for every soft-deleted patient (oldest deletion first); returns rows deleted."""
+    patient_ids = (await db.scalars(
+        select(Patient.id).where(Patient.deleted_at.is_not(None)).order_by(Patient.deleted_at)
+    )).all()
+    deleted = 0
+    for patient_id in patient_ids:
+        deleted += await purge_patient(db, patient_id, batch_size)
+    return deleted
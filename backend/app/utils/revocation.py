@@ -0,0 +1,39 @@
+import threading
+import time
+from typing import Hashable
+
+class RevocationList:
+    """In-memory set of revoked keys (token ids, user ids).
+
+    Each key is only remembered until the tokens it covers would have expired
+    on their own, so the set stays small as long as token lifetimes are short.
+    Entries are never evicted early: dropping one would silently re-enable a
+    revoked token.
+    """
+
+    def __init__(self, purge_interval: float = 60.0):
+        self._expiry: dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+        self._purge_interval = purge_interval
+        self._next_purge = time.time() + purge_interval
+
+    def revoke(self, key: Hashable, until: float) -> None:
+        with self._lock:
+            self._expiry[key] = max(until, self._expiry.get(key, 0.0))
+
+    def is_revoked(self, key: Hashable) -> bool:
+        now = time.time()
+        with self._lock:
+            if now >= self._next_purge:
+                self._purge(now)
+            until = self._expiry.get(key)
+            return until is not None and until > now
+
+    def _purge(self, now: float) -> None:
+        for key in [k for k, until in self._expiry.items() if until <= now]:
+            del self._expiry[key]
+        self._next_purge = now + self._purge_interval
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._expiry)
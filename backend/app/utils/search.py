@@ -0,0 +1,82 @@
+import re
+from typing import List, Sequence
+from uuid import UUID
+
+from sqlalchemy import case, column, func, literal_column, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Patient
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def fts_query(term: str) -> str:
+    """Every token must match as a prefix, e.g. 'jo smi' -> '"jo"* "smi"*'."""
+    return " ".join(f'"{token}"*' for token in TOKEN_RE.findall(term))
+
+async def search_patients(
+    db: AsyncSession, company_id: UUID, term: str, limit: int, offset: int = 0, options: Sequence = ()
+) -> List[Patient]:
+    """Top `limit` patients of a company matching `term` on name, email or phone, best first.
+
+    `options` are applied to the query, e.g. load_only() to fetch fewer columns.
+    """
+    term = term.strip()
+    if not term:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        query = _postgres_query(term)
+    elif dialect == "sqlite":
+        match = fts_query(term)
+        if not match:
+            return []
+        query = _sqlite_query(match)
+    else:
+        query = _fallback_query(term)
+
+    query = query.options(*options).where(
+        Patient.company_id == company_id,
+        Patient.deleted_at.is_(None)
+    ).limit(limit).offset(offset)
+    result = await db.execute(query)
+    return result.scalars().all()
+
+def _postgres_query(term: str):
+    # Substring ILIKE and the fuzzy `%` operator are both answered by the gin_trgm_ops indexes
+    pattern = f"%{escape_like(term)}%"
+    prefix = f"{escape_like(term)}%"
+    return select(Patient).where(or_(
+        Patient.name.ilike(pattern, escape="\\"),
+        Patient.email.ilike(pattern, escape="\\"),
+        Patient.phone.ilike(pattern, escape="\\"),
+        Patient.name.op("%")(term),
+    )).order_by(
+        case((Patient.name.ilike(prefix, escape="\\"), 0), (Patient.email.ilike(prefix, escape="\\"), 1), else_=2),
+        func.greatest(func.similarity(Patient.name, term), func.similarity(Patient.email, term)).desc(),
+        Patient.name,
+    )
+
+def _sqlite_query(match: str):
+    fts = (
+        text("SELECT rowid, bm25(patients_fts, 10.0, 5.0, 1.0) AS rank FROM patients_fts WHERE patients_fts MATCH :match")
+        .bindparams(match=match)
+        .columns(column("rowid"), column("rank"))
+        .subquery("fts")
+    )
+    return (
+        select(Patient)
+        .join(fts, fts.c.rowid == literal_column("patients.rowid"))
+        .order_by(fts.c.rank, Patient.name)
+    )
+
+def _fallback_query(term: str):
+    pattern = f"%{escape_like(term)}%"
+    return select(Patient).where(or_(
+        Patient.name.ilike(pattern, escape="\\"),
+        Patient.email.ilike(pattern, escape="\\"),
+        Patient.phone.ilike(pattern, escape="\\"),
+    )).order_by(Patient.name)
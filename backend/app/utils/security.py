@@ -1,35 +1,74 @@
+import time
+import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
+from uuid import UUID
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
 from app.database import get_db
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.schemas.token import TokenData
+from app.utils.cache import TTLCache
+from app.utils import password_pool
+from app.utils.revocation import RevocationList
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+@dataclass(frozen=True)
+class CurrentUser:
+    """Identity of the authenticated caller, detached from any session."""
+    id: UUID
+    company_id: UUID
+    role: UserRole
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+# Resolved identities keyed by user id, so authenticated requests skip the users lookup
+user_cache = TTLCache(maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+# Logged-out token ids and removed user ids, checked on every request in both auth modes
+revoked = RevocationList()
+
+def access_token_lifetime() -> timedelta:
+    if settings.AUTH_MODE == "claims":
+        return timedelta(minutes=settings.CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES)
+    return timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+async def verify_password(plain_password, hashed_password):
+    return await password_pool.pool.run(password_pool.check_password, plain_password, hashed_password)
+
+async def get_password_hash(password):
+    return await password_pool.pool.run(password_pool.hash_password, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+        expire = datetime.utcnow() + access_token_lifetime()
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def revoke_token(token: str):
+    """Reject `token` until it would have expired anyway."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return
+    if payload.get("jti"):
+        revoked.revoke(("jti", payload["jti"]), until=float(payload["exp"]))
+
+def revoke_user(user_id: UUID):
+    """Reject every token already issued to `user_id` and drop its cached identity."""
+    until = time.time() + max(access_token_lifetime(), timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)).total_seconds()
+    revoked.revoke(("user", user_id), until=until)
+    user_cache.invalidate(user_id)
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -40,18 +79,45 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
-        token_data = TokenData(id=user_id)
+        token_data = TokenData(
+            id=user_id,
+            company_id=payload.get("company_id"),
+            role=payload.get("role"),
+            jti=payload.get("jti"),
+        )
     except JWTError:
         raise credentials_exception
-    user = db.query(User).filter(User.id == token_data.id).first()
-    if user is None:
+    try:
+        user_id = UUID(token_data.id)
+    except ValueError:
+        raise credentials_exception
+
+    if token_data.jti and revoked.is_revoked(("jti", token_data.jti)):
         raise credentials_exception
-    return user
+    if revoked.is_revoked(("user", user_id)):
+        raise credentials_exception
+
+    if settings.AUTH_MODE == "claims":
+        # Trust the signed claims; revocation above is the only server-side state consulted
+        try:
+            return CurrentUser(id=user_id, company_id=UUID(token_data.company_id), role=UserRole(token_data.role))
+        except (TypeError, ValueError):
+            raise credentials_exception
+
+    current_user = user_cache.get(user_id)
+    if current_user is None:
+        result = await db.execute(select(User.id, User.company_id, User.role).where(User.id == user_id))
+        row = result.first()
+        if row is None:
+            raise credentials_exception
+        current_user = CurrentUser(id=row.id, company_id=row.company_id, role=row.role)
+        user_cache.set(user_id, current_user)
+    return current_user
 
-def get_current_active_user(current_user: User = Depends(get_current_user)):
+async def get_current_active_user(current_user: CurrentUser = Depends(get_current_user)):
     return current_user
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)):
+async def get_current_admin_user(current_user: CurrentUser = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
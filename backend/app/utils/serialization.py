@@ -0,0 +1,74 @@
+from functools import lru_cache
+from typing import Any, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Type
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from sqlalchemy.orm import QueryableAttribute, load_only
+
+# List endpoints return through these instead of letting FastAPI handle the
+# response_model: the List[schema] adapter is built once at import, rows are
+# validated straight from ORM attributes in a single pass, and pydantic-core
+# writes the JSON bytes itself. The route keeps its response_model, which
+# FastAPI still uses for the OpenAPI schema but skips at runtime because a
+# Response comes back.
+#
+# Each serializer also knows which columns every response field is built
+# from, so list queries load only those (load_only) and a `fields=` query
+# parameter can narrow both the SELECT and the JSON to a subset.
+
+class ListSerializer:
+    def __init__(self, schema: Type[BaseModel], columns: Mapping[str, Sequence[Any]]):
+        """`columns` maps every schema field to the mapped columns it reads, or
+        to loader options such as joinedload(...).load_only(...) for fields
+        computed from a relationship."""
+        mismatch = set(schema.model_fields) ^ set(columns)
+        if mismatch:
+            raise ValueError(f"{schema.__name__} columns out of sync with the schema: {sorted(mismatch)}")
+        self.schema = schema
+        self.columns = columns
+        self.adapter = TypeAdapter(List[schema])
+        # A few distinct field sets in practice (pickers, calendars); bounded either way
+        self._subset_adapter = lru_cache(maxsize=64)(self._build_subset_adapter)
+
+    def parse_fields(self, fields: Optional[str]) -> Optional[FrozenSet[str]]:
+        """Comma-separated `fields=` value -> field names (always with id), or None for all fields."""
+        if fields is None:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - self.columns.keys()
+        if unknown:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        return frozenset(requested | {"id"})
+
+    def load_options(self, fields: Optional[Iterable[str]] = None) -> list:
+        """Query options that load just what `fields` (default: every field) needs."""
+        attributes, options = {}, {}
+        for name in self.columns if fields is None else fields:
+            for item in self.columns[name]:
+                if isinstance(item, QueryableAttribute):
+                    attributes[item.key] = item
+                else:
+                    options[id(item)] = item
+        return [load_only(*attributes.values()), *options.values()]
+
+    def dump(self, rows: Iterable[Any], fields: Optional[FrozenSet[str]] = None) -> bytes:
+        adapter = self.adapter if fields is None else self._subset_adapter(fields)
+        return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+    def response(self, rows: Iterable[Any], response: Response, fields: Optional[FrozenSet[str]] = None) -> Response:
+        """JSON response for `rows`, carrying the headers already set on the injected `response`.
+
+        FastAPI only merges dependency/endpoint headers (ETag, X-Next-Cursor)
+        into responses it builds itself, so they are copied over here.
+        """
+        return Response(self.dump(rows, fields), media_type="application/json", headers=response.headers)
+
+    def _build_subset_adapter(self, fields: FrozenSet[str]) -> TypeAdapter:
+        # Only the requested attributes are read, so columns left unloaded by
+        # load_options() are never touched (they cannot lazy-load under asyncio)
+        subset = create_model(
+            f"{self.schema.__name__}Fields",
+            __config__=ConfigDict(from_attributes=True),
+            **{name: (info.annotation, info) for name, info in self.schema.model_fields.items() if name in fields},
+        )
+        return TypeAdapter(List[subset])
@@ -0,0 +1,23 @@
+import datetime as dt
+import re
+from typing import Optional
+
+# "9:30", "09:30:00", "9.30", "14h30", "2pm", "2.30 p.m."
+TIME_RE = re.compile(r"^\s*(\d{1,2})(?:[:.h](\d{2}))?(?::\d{2})?\s*(?:([ap])\.?m\.?)?\s*$", re.IGNORECASE)
+
+def parse_time(value: Optional[str]) -> Optional[dt.time]:
+    """Read a clock time the way front desks type it; None when it can't be read.
+
+    Seconds are dropped, appointments start on a minute. Accepts the same
+    forms the start_at migration (a5c3e81f7d20) read from the old free-form
+    time column; that migration keeps its own frozen copy of this parser.
+    """
+    match = TIME_RE.match(value or "")
+    if not match:
+        return None
+    hour, minute = int(match[1]), int(match[2] or 0)
+    if match[3]:
+        hour = hour % 12 + (12 if match[3].lower() == "p" else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return dt.time(hour, minute)
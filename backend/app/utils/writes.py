@@ -0,0 +1,30 @@
+from typing import Any, Optional, Sequence, Type, TypeVar
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import Base
+
+# Single-statement writes for the create/update handlers. RETURNING hands
+# back the stored row, server defaults (created_at) included, as a
+# persistent ORM object, so no db.refresh() SELECT follows the write. Both
+# dialects we run on support it (Postgres, SQLite >= 3.35).
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+async def insert_returning(db: AsyncSession, model: Type[ModelT], **values: Any) -> ModelT:
+    """INSERT one row and return it as it was stored."""
+    return await db.scalar(insert(model).values(**values).returning(model))
+
+async def update_returning(
+    db: AsyncSession, model: Type[ModelT], where: Sequence[Any], values: dict
+) -> Optional[ModelT]:
+    """UPDATE the row matching `where` (include the tenant filter) and return it, or None when nothing matched.
+
+    The ownership check and the write are the same statement: a row of
+    another company simply doesn't match.
+    """
+    return await db.scalar(
+        update(model).where(*where).values(**values).returning(model),
+        execution_options={"populate_existing": True},
+    )
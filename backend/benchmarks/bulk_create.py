@@ -0,0 +1,106 @@
+"""Row throughput of the single-item create endpoints versus /bulk.
+
+Creates the same number of patients, then appointments and follow-ups for
+them, first one request per row and then in /bulk batches, against the
+in-process app on a throwaway SQLite database. Reports rows/second and the
+number of SQL statements issued per row.
+
+    cd backend
+    python -m benchmarks.bulk_create --rows 2000 --batch-size 500
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+_db_dir = tempfile.mkdtemp(prefix="clinic-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+import httpx
+from sqlalchemy import event
+
+from app.database import Base, engine
+from app.main import app
+
+statements = 0
+
+def count_statement(*args):
+    global statements
+    statements += 1
+
+async def setup(client: httpx.AsyncClient) -> dict:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    response = await client.post("/api/auth/register/company", json={
+        "companyName": "Bench Clinic",
+        "adminName": "Bench Admin",
+        "email": "bulk@example.com",
+        "password": "benchmark-password",
+    })
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def payloads(kind: str, rows: int, run: str, patient_ids: list) -> list:
+    start = date.today()
+    if kind == "patients":
+        return [{"name": f"{run} Patient {i}", "email": f"{run}.{i}@example.com", "phone": f"07{i:09d}"} for i in range(rows)]
+    if kind == "appointments":
+        return [{
+            "patient_id": patient_ids[i % len(patient_ids)], "date": (start + timedelta(days=i % 30)).isoformat(),
+            "time": f"{9 + i % 8:02d}:{(i * 15) % 60:02d}", "reason": "Check-up",
+        } for i in range(rows)]
+    return [{
+        "patient_id": patient_ids[i % len(patient_ids)], "title": "Call back",
+        "due_date": (start + timedelta(days=i % 30)).isoformat(),
+    } for i in range(rows)]
+
+async def create_single(client, headers, path, items):
+    ids = []
+    for item in items:
+        response = await client.post(path, json=item, headers=headers)
+        response.raise_for_status()
+        ids.append(response.json()["id"])
+    return ids
+
+async def create_bulk(client, headers, path, items, batch_size):
+    ids = []
+    for start in range(0, len(items), batch_size):
+        response = await client.post(f"{path}bulk", json={"items": items[start:start + batch_size]}, headers=headers)
+        response.raise_for_status()
+        ids.extend(result["id"] for result in response.json()["results"])
+    return ids
+
+async def main(rows: int, batch_size: int):
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = await setup(client)
+        print(f"{'resource':>13} {'mode':>7} {'rows/s':>9} {'stmts/row':>10}")
+        for mode in ("single", "bulk"):
+            patient_ids = []
+            for kind in ("patients", "appointments", "follow-ups"):
+                items = payloads(kind, rows, mode, patient_ids)
+                path = f"/api/{kind}/"
+                before = statements
+                start = time.perf_counter()
+                if mode == "single":
+                    ids = await create_single(client, headers, path, items)
+                else:
+                    ids = await create_bulk(client, headers, path, items, batch_size)
+                elapsed = time.perf_counter() - start
+                if kind == "patients":
+                    patient_ids = ids
+                print(f"{kind:>13} {mode:>7} {rows / elapsed:>9.0f} {(statements - before) / rows:>10.2f}")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.batch_size))
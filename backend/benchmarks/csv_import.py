@@ -0,0 +1,120 @@
+"""CSV import versus replaying the same rows through the REST API.
+
+Writes a patients CSV and an appointments CSV (appointments reference
+patients by email), imports them through /api/import, then replays the same
+rows one POST at a time into a second clinic. Reports rows/second for both
+and, with --trace-memory, the peak Python heap during the import.
+
+    cd backend
+    python -m benchmarks.csv_import --patients 20000 --appointments 40000
+"""
+import argparse
+import asyncio
+import csv
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+_db_dir = tempfile.mkdtemp(prefix="clinic-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+import httpx
+
+from app.database import Base, engine
+from app.main import app
+
+async def register(client: httpx.AsyncClient, name: str) -> dict:
+    response = await client.post("/api/auth/register/company", json={
+        "companyName": name,
+        "adminName": "Bench Admin",
+        "email": f"{name.lower().replace(' ', '.')}@example.com",
+        "password": "benchmark-password",
+    })
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def write_files(directory: str, patients: int, appointments: int, rng: random.Random):
+    patients_path, appointments_path = f"{directory}/patients.csv", f"{directory}/appointments.csv"
+    with open(patients_path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["name", "email", "phone", "date_of_birth"])
+        for i in range(patients):
+            writer.writerow([f"Patient {i}", f"patient{i}@example.com", f"07{i:09d}", date(1950 + i % 60, 1 + i % 12, 1 + i % 28)])
+    with open(appointments_path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["patient_email", "date", "time", "reason"])
+        for i in range(appointments):
+            day = date.today() + timedelta(days=rng.randrange(-365, 60))
+            writer.writerow([f"patient{rng.randrange(patients)}@example.com", day, f"{rng.randrange(8, 18):02d}:{rng.choice(['00', '30'])}", "Visit"])
+    return patients_path, appointments_path
+
+async def import_file(client, headers, resource, path):
+    with open(path, "rb") as handle:
+        response = await client.post(f"/api/import/{resource}", files={"file": (os.path.basename(path), handle, "text/csv")}, headers=headers)
+    response.raise_for_status()
+    return int(response.headers["X-Import-Created"])
+
+async def replay(client, headers, patients_path, appointments_path, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    ids = {}
+
+    async def post(path, payload):
+        async with semaphore:
+            response = await client.post(path, json=payload, headers=headers)
+            response.raise_for_status()
+            return response.json()
+
+    with open(patients_path, newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    for created in await asyncio.gather(*(post("/api/patients/", row) for row in rows)):
+        ids[created["email"]] = created["id"]
+    with open(appointments_path, newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    await asyncio.gather(*(
+        post("/api/appointments/", {**row, "patient_id": ids[row.pop("patient_email")]}) for row in rows
+    ))
+    return len(ids) + len(rows)
+
+async def main(patients: int, appointments: int, concurrency: int, trace_memory: bool):
+    directory = tempfile.mkdtemp(prefix="clinic-import-")
+    patients_path, appointments_path = write_files(directory, patients, appointments, random.Random(7))
+    size_mb = (os.path.getsize(patients_path) + os.path.getsize(appointments_path)) / 2**20
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        headers = await register(client, "Import Clinic")
+        replay_headers = await register(client, "Replay Clinic")
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        rows = await import_file(client, headers, "patients", patients_path)
+        rows += await import_file(client, headers, "appointments", appointments_path)
+        imported = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 2**20 if trace_memory else None
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        replayed_rows = await replay(client, replay_headers, patients_path, appointments_path, concurrency)
+        replayed = time.perf_counter() - start
+
+    print(f"files: {size_mb:.1f} MB, {patients} patients + {appointments} appointments")
+    print(f"import: {rows} rows in {imported:.1f}s ({rows / imported:.0f} rows/s)" + (f", peak heap {peak:.1f} MB" if peak else ""))
+    print(f"replay: {replayed_rows} rows in {replayed:.1f}s ({replayed_rows / replayed:.0f} rows/s)")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, default=5000)
+    parser.add_argument("--appointments", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.patients, args.appointments, args.concurrency, args.trace_memory))
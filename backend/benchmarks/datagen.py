@@ -0,0 +1,261 @@
+"""Synthetic clinic data at production scale, bulk-loaded straight into the database.
+
+Recreates the schema, then generates `--companies` clinics: an admin and
+staff, patients (clinic sizes vary around `--patients`), and for each
+patient appointments a year back and three months ahead, clinical notes
+and follow-ups with realistic status mixes. Rows go in through multi-row
+Core INSERTs (COPY on Postgres), never the ORM unit of work, and the
+dashboard counters are reconciled at the end.
+
+Output is deterministic: the same --seed and --today give the same rows
+and ids, clinic by clinic, whatever the batch size. Every user's password
+is "benchmark-password". Reused by the load test (benchmarks.load_test) and
+handy for local profiling:
+
+    cd backend
+    python -m benchmarks.datagen --companies 500 --patients 2000
+    python -m benchmarks.datagen --database-url postgresql://localhost/clinic_bench --companies 500 --patients 4000
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Optional
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///clinic_datagen.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database import Base, async_database_url
+from app.models import Company, User, Patient, Appointment, FollowUp, Note
+from app.routers.auth import CODE_ALPHABET, CODE_LENGTH
+from app.utils import counters, password_pool
+
+PASSWORD = "benchmark-password"
+BATCH = 10_000
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+               "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Priya", "Wei",
+               "Aditya", "Fatima", "Olga", "Kenji", "Chloe", "Mateo", "Amara", "Noah", "Isla", "Omar"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+              "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+              "Joshi", "Patel", "Nguyen", "Kim", "Okafor", "Schmidt", "Rossi", "Dubois", "Tanaka", "Kowalski"]
+EMAIL_DOMAINS = (["gmail.com"] * 5 + ["outlook.com"] * 2 + ["yahoo.com"] * 2
+                 + ["hotmail.co.uk", "icloud.com", "proton.me", "btinternet.com"])
+STREETS = ["High Street", "Station Road", "Church Lane", "Victoria Road", "Park Avenue", "Mill Lane", "Green Lane"]
+TOWNS = ["Leeds", "Bristol", "Croydon", "Reading", "Norwich", "Derby", "Bath", "York", "Luton", "Exeter"]
+PRACTICES = ["Family Practice", "Medical Centre", "Health Clinic", "Surgery", "Dental Care", "Physiotherapy"]
+REASONS = ["Check-up", "Follow-up visit", "Vaccination", "Blood test", "Consultation", "Prescription review",
+           "Physiotherapy session", "Dressing change", "Annual review", "Referral discussion"]
+NOTE_TEXTS = ["Seen today, all fine.", "Blood pressure slightly raised, recheck in two weeks.",
+              "Discussed test results with the patient.", "Prescription renewed for three months.",
+              "Patient reports improvement since the last visit.", "Referred to a specialist.",
+              "Advised rest and fluids; review if symptoms persist."]
+FOLLOW_UP_TITLES = ["Call back with results", "Book review appointment", "Chase referral", "Repeat prescription",
+                    "Send reminder letter", "Check vaccination record"]
+DURATIONS = [15, 15, 15, 30, 30, 45, 60, None]
+# Insert order, parents first, so foreign keys hold on Postgres
+MODELS = (Company, User, Patient, Appointment, Note, FollowUp)
+
+def new_id(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+def around(rng, mean):
+    """Whole count with the given mean, 0..2*mean, for per-patient history sizes."""
+    whole, fraction = divmod(mean * 2, 1)
+    return rng.randint(0, int(whole) + (rng.random() < fraction))
+
+def clinic_sizes(companies, patients, skew, rng):
+    """Patients per clinic: lognormal around `patients` (skew 0 = all equal), so a few clinics are large."""
+    if skew <= 0:
+        return [patients] * companies
+    scale = patients / math.exp(skew * skew / 2)
+    return [max(1, round(scale * rng.lognormvariate(0, skew))) for _ in range(companies)]
+
+def person(rng):
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+def phone(rng):
+    kind = rng.random()
+    if kind < 0.7:
+        return f"07{rng.randrange(10**3):03d} {rng.randrange(10**6):06d}"
+    if kind < 0.9:
+        return f"01{rng.randrange(10**3):03d} {rng.randrange(10**6):06d}"
+    return f"+44 7{rng.randrange(10**9):09d}"
+
+def stamp(day, rng):
+    """A UTC timestamp during clinic hours on `day`."""
+    return datetime.combine(day, dt_time(rng.randint(8, 17), rng.randrange(60), rng.randrange(60)), tzinfo=timezone.utc)
+
+def clinic_rows(index, size, staff, appointments, notes, follow_ups, today, seed, password_hash):
+    """(model, row) for one clinic: the company, its users, then each patient and their history.
+
+    Each clinic draws from its own generator, seeded from `seed` and its
+    index, so its rows don't depend on any other clinic's size.
+    """
+    rng = random.Random(f"{seed}:{index}")
+    company_id = new_id(rng)
+    yield Company, {
+        "id": company_id, "name": f"{rng.choice(LAST_NAMES)} {rng.choice(PRACTICES)}",
+        "code": "".join(rng.choice(CODE_ALPHABET) for _ in range(CODE_LENGTH)),
+        "created_at": stamp(today - timedelta(days=rng.randint(400, 2000)), rng),
+    }
+    domain = f"clinic{index}.example.com"
+    authors = [new_id(rng) for _ in range(staff + 1)]
+    for i, user_id in enumerate(authors):
+        first, last = person(rng)
+        yield User, {
+            "id": user_id, "company_id": company_id, "name": f"{first} {last}",
+            "email": "admin@" + domain if i == 0 else f"{first}.{last}{i}@{domain}".lower(),
+            "password_hash": password_hash, "role": "admin" if i == 0 else "staff",
+            "created_at": stamp(today - timedelta(days=rng.randint(30, 400)), rng),
+        }
+
+    for i in range(size):
+        patient_id = new_id(rng)
+        first, last = person(rng)
+        # Registrations spread over three years, newest last
+        registered = today - timedelta(days=int((1 - (i + rng.random()) / size) * 3 * 365))
+        yield Patient, {
+            "id": patient_id, "company_id": company_id, "name": f"{first} {last}",
+            "email": f"{first}{rng.choice(('.', '_', ''))}{last}{rng.randrange(100) if rng.random() < 0.6 else ''}"
+                     f"@{rng.choice(EMAIL_DOMAINS)}".lower(),
+            "phone": phone(rng),
+            "date_of_birth": (today - timedelta(days=int(rng.triangular(0, 95, 38) * 365.25)))
+                             if rng.random() < 0.95 else None,
+            "address": f"{rng.randint(1, 250)} {rng.choice(STREETS)}, {rng.choice(TOWNS)}" if rng.random() < 0.7 else None,
+            "created_at": stamp(registered, rng), "deleted_at": None,
+        }
+        for _ in range(around(rng, appointments)):
+            # Four in five visits are in the past year, the rest booked up to three months ahead
+            day = today + timedelta(days=rng.randint(1, 90) if rng.random() < 0.2 else -rng.randint(0, 365))
+            if day < today:
+                status = rng.choices(("completed", "cancelled", "scheduled"), (85, 12, 3))[0]
+            else:
+                status = rng.choices(("scheduled", "cancelled"), (92, 8))[0]
+            yield Appointment, {
+                "id": new_id(rng), "company_id": company_id, "patient_id": patient_id,
+                "start_at": datetime.combine(day, dt_time(rng.randint(8, 17), rng.choice((0, 15, 30, 45)))),
+                "duration_minutes": rng.choice(DURATIONS), "reason": rng.choice(REASONS), "status": status,
+                "created_at": stamp(day - timedelta(days=rng.randint(1, 30)), rng),
+            }
+        for _ in range(around(rng, notes)):
+            yield Note, {
+                "id": new_id(rng), "company_id": company_id, "patient_id": patient_id,
+                "created_by_user_id": rng.choice(authors), "content": rng.choice(NOTE_TEXTS),
+                "created_at": stamp(today - timedelta(days=rng.randint(0, 365)), rng),
+            }
+        for _ in range(around(rng, follow_ups)):
+            due = today + timedelta(days=rng.randint(-60, 60))
+            yield FollowUp, {
+                "id": new_id(rng), "company_id": company_id, "patient_id": patient_id,
+                "title": rng.choice(FOLLOW_UP_TITLES),
+                "description": rng.choice(NOTE_TEXTS) if rng.random() < 0.5 else None,
+                "due_date": due, "status": "completed" if rng.random() < (0.8 if due < today else 0.15) else "open",
+                "created_at": stamp(due - timedelta(days=rng.randint(1, 30)), rng),
+            }
+
+async def write(conn, model, rows):
+    if conn.dialect.name == "postgresql":
+        # COPY via asyncpg: no SQL to build or parse, several times faster than INSERT
+        raw = await conn.get_raw_connection()
+        columns = list(rows[0])
+        await raw.driver_connection.copy_records_to_table(
+            model.__tablename__, columns=columns, records=[tuple(row[name] for name in columns) for row in rows]
+        )
+    else:
+        await conn.execute(insert(model), rows)
+
+async def flush(conn, batches, written):
+    for model in MODELS:
+        rows = batches[model]
+        if rows:
+            await write(conn, model, rows)
+            written[model.__tablename__] += len(rows)
+            rows.clear()
+
+async def generate(
+    engine,
+    companies: int,
+    patients: int,
+    staff: int = 5,
+    appointments: float = 4.0,
+    notes: float = 2.0,
+    follow_ups: float = 1.0,
+    skew: float = 0.8,
+    seed: int = 7,
+    today: Optional[date] = None,
+    batch_size: int = BATCH,
+) -> Counter:
+    """Drop and recreate the schema on `engine` and fill it; returns rows written per table.
+
+    `patients` is the mean clinic size; `appointments`, `notes` and
+    `follow_ups` are means per patient.
+    """
+    today = today or date.today()
+    # One bcrypt hash shared by every user; hashing per user would dominate the run
+    password_hash = password_pool.hash_password(PASSWORD)
+    sizes = clinic_sizes(companies, patients, skew, random.Random(seed))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    written = Counter()
+    async with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            # Throwaway data: don't wait for fsync on every commit
+            await conn.exec_driver_sql("PRAGMA synchronous = OFF")
+        batches, pending = {model: [] for model in MODELS}, 0
+        for index, size in enumerate(sizes):
+            for model, row in clinic_rows(
+                index, size, staff, appointments, notes, follow_ups, today, seed, password_hash
+            ):
+                batches[model].append(row)
+                pending += 1
+                if pending >= batch_size:
+                    await flush(conn, batches, written)
+                    pending = 0
+        await flush(conn, batches, written)
+    async with AsyncSession(engine) as db:
+        await counters.reconcile_all(db, today)
+    return written
+
+async def main(args):
+    engine = create_async_engine(async_database_url(args.database_url or os.environ["DATABASE_URL"]))
+    start = time.perf_counter()
+    written = await generate(
+        engine, args.companies, args.patients, staff=args.staff, appointments=args.appointments, notes=args.notes,
+        follow_ups=args.follow_ups, skew=args.skew, seed=args.seed, today=args.today, batch_size=args.batch_size,
+    )
+    elapsed = time.perf_counter() - start
+    for table, rows in written.items():
+        print(f"{table:>14} {rows:>12,}")
+    total = sum(written.values())
+    print(f"{'total':>14} {total:>12,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+    password_pool.pool.shutdown()
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="sync-style URL, default DATABASE_URL; its schema is dropped and recreated")
+    parser.add_argument("--companies", type=int, default=50)
+    parser.add_argument("--patients", type=int, default=1000, help="mean patients per clinic")
+    parser.add_argument("--staff", type=int, default=5, help="staff users per clinic, besides the admin")
+    parser.add_argument("--appointments", type=float, default=4.0, help="mean appointments per patient")
+    parser.add_argument("--notes", type=float, default=2.0, help="mean notes per patient")
+    parser.add_argument("--follow-ups", type=float, default=1.0, help="mean follow-ups per patient")
+    parser.add_argument("--skew", type=float, default=0.8, help="spread of clinic sizes (lognormal sigma, 0 = equal)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--today", type=date.fromisoformat, help="date the data is centred on (YYYY-MM-DD), default today")
+    parser.add_argument("--batch-size", type=int, default=BATCH, help="rows per INSERT/COPY round trip")
+    args = parser.parse_args()
+    asyncio.run(main(args))
@@ -0,0 +1,279 @@
+"""Latency and throughput of every API route against a seeded multi-tenant dataset.
+
+Seeds `--companies` clinics of `--patients` patients each with
+benchmarks.datagen (staff, appointments around today, notes and follow-ups),
+or with --reuse keeps whatever DATABASE_URL already holds, then drives each endpoint of the auth, patients, appointments, follow-ups,
+dashboard, staff, export and import routers in turn: `--clients` concurrent clients share
+`--requests` requests, each for a random clinic and a random record of it.
+Reports p50/p95/p99 latency and requests/second per endpoint and writes them,
+with the run's settings and commit, to `--output` as JSON. `--compare` prints
+the change against an earlier results file.
+
+Runs the app in-process on a throwaway SQLite file by default. Set
+DATABASE_URL to use a local Postgres instead (its schema is dropped and
+recreated unless --reuse), and pass --base-url to load a running server that uses that
+database and the same SECRET_KEY/ALGORITHM. Deletes are left out so every
+endpoint sees the same data; logout revokes a token minted for each request,
+so the clinics' own tokens stay valid.
+
+    cd backend
+    python -m benchmarks.load_test --companies 50 --patients 2000 --clients 20 --requests 500
+    python -m benchmarks.load_test --output after.json --compare before.json
+    DATABASE_URL=postgresql://localhost/clinic_bench python -m benchmarks.load_test --reuse
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+
+_db_dir = tempfile.mkdtemp(prefix="clinic-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+import httpx
+from sqlalchemy import select
+
+from app.database import SessionLocal, engine
+from app.main import app
+from app.models import Company, User, Patient, Appointment, FollowUp
+from app.utils import password_pool, security
+from benchmarks import datagen
+
+SAMPLE = 200  # record ids kept per clinic for the per-record endpoints
+BATCH = 20  # items per bulk create / rows per CSV import
+
+async def load_tenants():
+    """Per clinic: admin token, company code and a sample of record ids for the per-record endpoints."""
+    tenants = []
+    async with SessionLocal() as db:
+        for company_id, code in (await db.execute(select(Company.id, Company.code))).all():
+            admin = (await db.execute(select(User.id, User.email).where(
+                User.company_id == company_id, User.role == "admin"
+            ).limit(1))).first()
+            if admin is None:
+                continue
+            claims = {"sub": str(admin.id), "company_id": str(company_id), "role": "admin"}
+            token = security.create_access_token(data=claims)
+            ids = {}
+            for name, model in (("patients", Patient), ("appointments", Appointment), ("follow_ups", FollowUp)):
+                ids[name] = [str(row) for row in (await db.scalars(
+                    select(model.id).where(model.company_id == company_id).limit(SAMPLE)
+                )).all()]
+            if not ids["patients"]:
+                continue
+            tenants.append({
+                "headers": {"Authorization": f"Bearer {token}"}, "claims": claims, "email": admin.email, "code": code, **ids
+            })
+    return tenants
+
+def scenarios():
+    """Endpoint name -> function(rng, tenant, n) returning (method, url, request kwargs)."""
+    today = date.today()
+    # Accounts need unique emails across warm-up, timed and --reuse runs
+    run, serial = uuid.uuid4().hex[:8], itertools.count()
+
+    def new_email(kind):
+        return f"{kind}-{run}-{next(serial)}@load.example.com"
+
+    def get(path, **params):
+        return lambda rng, tenant, n: ("GET", path(rng, tenant), {"params": params, "headers": tenant["headers"]})
+
+    def send(method, path, body):
+        return lambda rng, tenant, n: (method, path(rng, tenant), {"json": body(rng, tenant, n), "headers": tenant["headers"]})
+
+    def pick(kind, suffix=""):
+        return lambda rng, tenant: f"/api/{kind.replace('_', '-')}/{rng.choice(tenant[kind])}{suffix}"
+
+    def root(kind):
+        return lambda rng, tenant: f"/api/{kind}/"
+
+    def bulk(kind, item):
+        return send("POST", lambda rng, tenant: f"/api/{kind}/bulk", lambda rng, tenant, n: {
+            "items": [item(rng, tenant, n * BATCH + i) for i in range(BATCH)],
+        })
+
+    def patient(rng, tenant, n):
+        return {"name": f"Load Patient {n}", "email": f"load{n}@load.example.com", "phone": f"07{n:09d}"}
+
+    def appointment(rng, tenant, n):
+        return {
+            "patient_id": rng.choice(tenant["patients"]), "reason": "Load visit",
+            "date": (today + timedelta(days=rng.randint(0, 30))).isoformat(), "time": f"{rng.randint(8, 17):02d}:00",
+        }
+
+    def follow_up(rng, tenant, n):
+        return {
+            "patient_id": rng.choice(tenant["patients"]), "title": "Load task",
+            "due_date": (today + timedelta(days=rng.randint(0, 30))).isoformat(),
+        }
+
+    def patients_csv(rng, tenant, n):
+        rows = (patient(rng, tenant, n * BATCH + i) for i in range(BATCH))
+        return "name,email,phone\n" + "".join(f"{r['name']},{r['email']},{r['phone']}\n" for r in rows)
+
+    return {
+        "POST /api/auth/login": lambda rng, tenant, n: (
+            "POST", "/api/auth/login", {"json": {"email": tenant["email"], "password": datagen.PASSWORD}}
+        ),
+        "POST /api/auth/register/company": lambda rng, tenant, n: ("POST", "/api/auth/register/company", {"json": {
+            "companyName": f"Load Clinic {n}", "adminName": "Load Owner", "email": new_email("owner"), "password": datagen.PASSWORD,
+        }}),
+        "POST /api/auth/register/staff": lambda rng, tenant, n: ("POST", "/api/auth/register/staff", {"json": {
+            "name": "Load Staff", "email": new_email("staff"), "password": datagen.PASSWORD, "companyCode": tenant["code"],
+        }}),
+        "POST /api/auth/logout": lambda rng, tenant, n: ("POST", "/api/auth/logout", {
+            "headers": {"Authorization": f"Bearer {security.create_access_token(data=tenant['claims'])}"},
+        }),
+        "GET /api/patients/": get(root("patients"), limit=50),
+        "GET /api/patients/?search=": lambda rng, tenant, n: ("GET", "/api/patients/", {
+            "params": {"search": rng.choice(datagen.LAST_NAMES)[:4].lower(), "limit": 20}, "headers": tenant["headers"],
+        }),
+        "GET /api/patients/{id}": get(pick("patients")),
+        "GET /api/patients/{id}/notes": get(pick("patients", "/notes")),
+        "GET /api/patients/{id}/chart": get(pick("patients", "/chart")),
+        "POST /api/patients/": send("POST", root("patients"), patient),
+        "POST /api/patients/bulk": bulk("patients", patient),
+        "PUT /api/patients/{id}": send("PUT", pick("patients"), lambda rng, tenant, n: {"phone": f"07{n:09d}"}),
+        "POST /api/patients/{id}/notes": send("POST", pick("patients", "/notes"), lambda rng, tenant, n: {
+            "content": f"Load note {n}",
+        }),
+        "GET /api/appointments/": get(root("appointments"), start_date=today.isoformat(),
+                                      end_date=(today + timedelta(days=7)).isoformat()),
+        "POST /api/appointments/": send("POST", root("appointments"), appointment),
+        "POST /api/appointments/bulk": bulk("appointments", appointment),
+        "PATCH /api/appointments/{id}": send("PATCH", pick("appointments"), lambda rng, tenant, n: {
+            "reason": f"Rebooked {n}",
+        }),
+        "GET /api/follow-ups/": get(root("follow-ups"), status="open"),
+        "POST /api/follow-ups/": send("POST", root("follow-ups"), follow_up),
+        "POST /api/follow-ups/bulk": bulk("follow-ups", follow_up),
+        "PATCH /api/follow-ups/{id}": send("PATCH", pick("follow_ups"), lambda rng, tenant, n: {
+            "status": rng.choice(("open", "completed")),
+        }),
+        "GET /api/dashboard/stats": get(lambda rng, tenant: "/api/dashboard/stats"),
+        "GET /api/staff/": get(root("staff")),
+        "GET /api/export/patients": get(lambda rng, tenant: "/api/export/patients"),
+        "GET /api/export/appointments (ndjson)": get(lambda rng, tenant: "/api/export/appointments", format="ndjson"),
+        "POST /api/import/patients": lambda rng, tenant, n: ("POST", "/api/import/patients", {
+            "files": {"file": ("patients.csv", patients_csv(rng, tenant, n), "text/csv")}, "headers": tenant["headers"],
+        }),
+    }
+
+async def run_endpoint(client, build, tenants, requests, clients, rng):
+    """Fire `requests` requests from `clients` concurrent workers; returns latencies (ms), statuses and wall time."""
+    latencies, statuses = [], Counter()
+    issued = iter(range(requests))
+
+    async def worker():
+        for n in issued:
+            method, url, kwargs = build(rng, rng.choice(tenants), n)
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    return latencies, statuses, time.perf_counter() - start
+
+def summarize(latencies, statuses, elapsed):
+    p50, p95, p99 = (statistics.quantiles(latencies, n=100, method="inclusive")[i] for i in (49, 94, 98))
+    return {
+        "requests": len(latencies),
+        "errors": sum(count for code, count in statuses.items() if code >= 400),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results, baseline):
+    header = f"{'endpoint':<42} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"
+    print(header + (f" {'p95 vs base':>12} {'req/s vs base':>14}" if baseline else ""))
+    for endpoint, row in results["endpoints"].items():
+        line = (f"{endpoint:<42} {row['throughput_rps']:>8.1f} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f}"
+                f" {row['p99_ms']:>9.2f} {row['errors']:>7}")
+        before = (baseline or {}).get("endpoints", {}).get(endpoint)
+        if before:
+            line += (f" {(row['p95_ms'] / before['p95_ms'] - 1) * 100:>+11.1f}%"
+                     f" {(row['throughput_rps'] / before['throughput_rps'] - 1) * 100:>+13.1f}%")
+        print(line)
+
+async def main(args):
+    rng = random.Random(args.seed)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    start = time.perf_counter()
+    if not args.reuse:
+        written = await datagen.generate(engine, args.companies, args.patients, staff=args.staff, seed=args.seed)
+        print(f"seeded {sum(written.values()):,} rows in {time.perf_counter() - start:.1f}s")
+    tenants = await load_tenants()
+    seed_seconds = time.perf_counter() - start
+
+    transport = None if args.base_url else httpx.ASGITransport(app=app)
+    results = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "target": args.base_url or "in-process",
+        "settings": {key: getattr(args, key) for key in ("companies", "staff", "patients", "reuse", "clients", "requests", "warmup", "seed")},
+        "seed_seconds": round(seed_seconds, 1),
+        "endpoints": {},
+    }
+    selected = scenarios()
+    if args.endpoints:
+        selected = {name: build for name, build in selected.items() if any(part in name for part in args.endpoints)}
+    async with httpx.AsyncClient(transport=transport, base_url=args.base_url or "http://bench", timeout=60) as client:
+        for endpoint, build in selected.items():
+            if args.warmup:
+                await run_endpoint(client, build, tenants, args.warmup, 1, rng)
+            latencies, statuses, elapsed = await run_endpoint(client, build, tenants, args.requests, args.clients, rng)
+            results["endpoints"][endpoint] = summarize(latencies, statuses, elapsed)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print_results(results, baseline)
+    print(f"results written to {args.output}")
+    password_pool.pool.shutdown()
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--staff", type=int, default=3, help="staff users per clinic, besides the admin")
+    parser.add_argument("--patients", type=int, default=500, help="mean patients per clinic")
+    parser.add_argument("--reuse", action="store_true", help="load the data already in DATABASE_URL instead of seeding")
+    parser.add_argument("--clients", type=int, default=10, help="concurrent clients per endpoint")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=5, help="untimed requests per endpoint first")
+    parser.add_argument("--endpoints", nargs="+", help="only endpoints whose name contains one of these")
+    parser.add_argument("--base-url", help="load a running server instead of the in-process app")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default="load_test.json", help="results file (JSON)")
+    parser.add_argument("--compare", help="earlier results file to print the change against")
+    args = parser.parse_args()
+    asyncio.run(main(args))
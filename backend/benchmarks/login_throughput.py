@@ -0,0 +1,102 @@
+"""Login throughput versus password hashing pool size.
+
+Fires a burst of concurrent logins at the in-process app for each pool size
+and reports logins/second, 503 rejections, and the latency of patient list
+requests issued during the burst. Uses a throwaway SQLite database.
+
+    cd backend
+    python -m benchmarks.login_throughput --sizes 1 2 4 8 --logins 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+_db_dir = tempfile.mkdtemp(prefix="clinic-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+import httpx
+
+from app.database import Base, engine
+from app.main import app
+from app.utils import password_pool
+
+EMAIL = "bench@example.com"
+PASSWORD = "benchmark-password"
+
+async def setup(client: httpx.AsyncClient) -> dict:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    response = await client.post("/api/auth/register/company", json={
+        "companyName": "Bench Clinic",
+        "adminName": "Bench Admin",
+        "email": EMAIL,
+        "password": PASSWORD,
+    })
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def run_burst(client: httpx.AsyncClient, headers: dict, logins: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses = []
+    patient_latencies = []
+    done = asyncio.Event()
+
+    async def login():
+        async with semaphore:
+            response = await client.post("/api/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            statuses.append(response.status_code)
+
+    async def poll_patients():
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/api/patients/", headers=headers)
+            patient_latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.01)
+
+    poller = asyncio.create_task(poll_patients())
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await poller
+
+    ok = statuses.count(200)
+    return {
+        "ok": ok,
+        "rejected": statuses.count(503),
+        "logins_per_sec": ok / elapsed,
+        "patients_p50_ms": statistics.median(patient_latencies) * 1000 if patient_latencies else 0.0,
+        "patients_max_ms": max(patient_latencies) * 1000 if patient_latencies else 0.0,
+    }
+
+async def main(sizes: list[int], logins: int, concurrency: int, max_pending: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = await setup(client)
+        print(f"{'workers':>7} {'ok':>5} {'503':>5} {'logins/s':>9} {'patients p50 ms':>16} {'patients max ms':>16}")
+        for size in sizes:
+            password_pool.pool.shutdown()
+            password_pool.pool = password_pool.PasswordHasherPool(workers=size, max_pending=max_pending)
+            # Warm the worker processes so spawn time isn't counted
+            await client.post("/api/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            result = await run_burst(client, headers, logins, concurrency)
+            print(
+                f"{size:>7} {result['ok']:>5} {result['rejected']:>5} {result['logins_per_sec']:>9.1f} "
+                f"{result['patients_p50_ms']:>16.1f} {result['patients_max_ms']:>16.1f}"
+            )
+        password_pool.pool.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1, 2, 4, os.cpu_count() or 4])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-pending", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.logins, args.concurrency, args.max_pending))
@@ -0,0 +1,111 @@
+"""Patient search latency at increasing tenant sizes.
+
+For each size, seeds one clinic with that many patients (plus a smaller
+neighbouring clinic) and times the index-backed search against the old
+leading-wildcard ILIKE scan. Defaults to throwaway SQLite files (FTS5);
+pass --database-url to run against a Postgres with pg_trgm available.
+
+    cd backend
+    python -m benchmarks.patient_search --sizes 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+from sqlalchemy import insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database import Base, async_database_url
+from app.models import Company, Patient
+from app.utils.search import search_patients
+from benchmarks.datagen import FIRST_NAMES, LAST_NAMES
+
+BATCH = 10_000
+
+def patient_rows(company_id, count, rng):
+    for i in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield {
+            "id": uuid.uuid4(),
+            "name": f"{first} {last}",
+            "email": f"{first}.{last}{i}@example.com".lower(),
+            "phone": f"07{rng.randrange(10**9):09d}",
+            "company_id": company_id,
+        }
+
+async def seed(engine, size, rng):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    target, neighbour = uuid.uuid4(), uuid.uuid4()
+    async with engine.begin() as conn:
+        await conn.execute(insert(Company), [
+            {"id": target, "name": "Target Clinic", "code": "BENCH1"},
+            {"id": neighbour, "name": "Neighbour Clinic", "code": "BENCH2"},
+        ])
+        for company_id, count in ((target, size), (neighbour, max(size // 10, 1))):
+            batch = []
+            for row in patient_rows(company_id, count, rng):
+                batch.append(row)
+                if len(batch) == BATCH:
+                    await conn.execute(insert(Patient), batch)
+                    batch = []
+            if batch:
+                await conn.execute(insert(Patient), batch)
+    return target
+
+async def legacy_search(db, company_id, term, limit):
+    result = await db.execute(select(Patient).where(
+        Patient.company_id == company_id,
+        or_(Patient.name.ilike(f"%{term}%"), Patient.email.ilike(f"%{term}%")),
+    ).limit(limit))
+    return result.scalars().all()
+
+async def time_queries(engine, fn, company_id, terms, limit):
+    latencies = []
+    async with AsyncSession(engine) as db:
+        for term in terms:
+            start = time.perf_counter()
+            await fn(db, company_id, term, limit)
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+async def main(sizes, database_url, queries, limit, seed_value):
+    rng = random.Random(seed_value)
+    # Half common name prefixes (many matches to rank), half phone prefixes (few matches, long scans for ILIKE)
+    terms = [
+        rng.choice(FIRST_NAMES + LAST_NAMES)[: rng.randint(2, 5)].lower() if i % 2 else f"07{rng.randrange(10**5):05d}"
+        for i in range(queries)
+    ]
+    print(f"{'patients':>10} {'seed s':>8} {'search p50 ms':>14} {'search p95 ms':>14} {'ilike p50 ms':>13} {'ilike p95 ms':>13}")
+    for size in sizes:
+        url = database_url or f"sqlite:///{tempfile.mkdtemp(prefix='clinic-search-')}/search.db"
+        engine = create_async_engine(async_database_url(url))
+        start = time.perf_counter()
+        company_id = await seed(engine, size, rng)
+        seeded = time.perf_counter() - start
+        search = await time_queries(engine, search_patients, company_id, terms, limit)
+        legacy = await time_queries(engine, legacy_search, company_id, terms, limit)
+        print(f"{size:>10} {seeded:>8.1f} {search[0]:>14.2f} {search[1]:>14.2f} {legacy[0]:>13.2f} {legacy[1]:>13.2f}")
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--database-url", help="sync-style URL; the schema is dropped and recreated for each size")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.database_url, args.queries, args.limit, args.seed))
@@ -0,0 +1,138 @@
+"""CPU time to serialize one list response, per list endpoint.
+
+Builds `--rows` ORM objects shaped like each endpoint's query result (with
+the relationships the read schemas touch already loaded) and measures the
+process CPU time per response for:
+
+  encoder         response_model validation, then jsonable_encoder + json.dumps
+                  (the path FastAPI takes with a non-default response class)
+  response_model  FastAPI's own serialize_response with the schemas as they
+                  were before, i.e. EmailStr re-validated on every output row
+  same schema     serialize_response with today's schemas, so against the fast
+                  path only the adapter path differs
+  fast path       the routers' ListSerializer instances, what the routes use now
+
+Two speed-ups are printed: "vs same" isolates the adapter path, "vs before"
+also includes the EmailStr -> str schema change (patients and staff only).
+
+No database is involved; only the work between "rows are loaded" and
+"bytes are ready" is timed.
+
+    cd backend
+    python -m benchmarks.serialization --rows 100 --repeat 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import EmailStr, TypeAdapter
+
+from app.models import Company, User, Patient, Appointment, FollowUp, Note
+from app.schemas import appointment as appointment_schema
+from app.schemas import follow_up as follow_up_schema
+from app.schemas import note as note_schema
+from app.schemas import patient as patient_schema
+from app.schemas import user as user_schema
+from app.routers import appointments as appointments_router
+from app.routers import follow_ups as follow_ups_router
+from app.routers import patients as patients_router
+from app.routers import staff as staff_router
+
+class LegacyPatientRead(patient_schema.PatientRead):
+    email: EmailStr
+
+class LegacyUserRead(user_schema.UserRead):
+    email: EmailStr
+
+def build_rows(count):
+    company = Company(id=uuid.uuid4(), name="Bench Clinic", code="BENCH1")
+    now = datetime.now()
+    users = [
+        User(id=uuid.uuid4(), email=f"staff{i}@example.com", name=f"Staff {i}", role="staff",
+             company=company, company_id=company.id, created_at=now)
+        for i in range(count)
+    ]
+    patients = [
+        Patient(id=uuid.uuid4(), name=f"Patient {i}", email=f"patient{i}@example.com", phone=f"07{i:09d}",
+                date_of_birth=date(1980, 1, 1) + timedelta(days=i), address=f"{i} High Street",
+                company_id=company.id, created_at=now)
+        for i in range(count)
+    ]
+    appointments = [
+        Appointment(id=uuid.uuid4(), patient=patient, patient_id=patient.id, company_id=company.id,
+                    start_at=datetime.combine(date.today(), datetime.min.time()) + timedelta(minutes=15 * i),
+                    duration_minutes=15, reason="Check-up", status="scheduled", created_at=now)
+        for i, patient in enumerate(patients)
+    ]
+    follow_ups = [
+        FollowUp(id=uuid.uuid4(), patient=patient, patient_id=patient.id, company_id=company.id,
+                 title="Call back", description="Results", due_date=date.today() + timedelta(days=i),
+                 status="open", created_at=now)
+        for i, patient in enumerate(patients)
+    ]
+    notes = [
+        Note(id=uuid.uuid4(), patient_id=patients[0].id, company_id=company.id, created_by_user=user,
+             created_by_user_id=user.id, content="Seen today, all fine.", created_at=now)
+        for user in users
+    ]
+    return {
+        "GET /api/patients/": (patients, LegacyPatientRead, patients_router.patient_list),
+        "GET /api/appointments/": (appointments, appointment_schema.AppointmentRead, appointments_router.appointment_list),
+        "GET /api/follow-ups/": (follow_ups, follow_up_schema.FollowUpRead, follow_ups_router.follow_up_list),
+        "GET /api/patients/{id}/notes": (notes, note_schema.NoteRead, patients_router.note_list),
+        "GET /api/staff/": (users, LegacyUserRead, staff_router.staff_list),
+    }
+
+def cpu_ms(fn, repeat):
+    fn()  # warm-up
+    start = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - start) / repeat * 1000
+
+def main(rows, repeat):
+    loop = asyncio.new_event_loop()
+    print(f"{'endpoint':<30} {'encoder ms':>11} {'response_model ms':>18} {'same schema ms':>15} {'fast path ms':>13}"
+          f" {'vs same':>8} {'vs before':>10}")
+    for endpoint, (objects, legacy_schema, serializer) in build_rows(rows).items():
+        legacy_adapter = TypeAdapter(List[legacy_schema])
+        field = create_model_field("Response", List[legacy_schema], mode="serialization")
+        same_field = create_model_field("Response", List[serializer.schema], mode="serialization")
+
+        def encoder():
+            return json.dumps(jsonable_encoder(legacy_adapter.validate_python(objects, from_attributes=True))).encode()
+
+        def response_model():
+            return loop.run_until_complete(serialize_response(field=field, response_content=objects, dump_json=True))
+
+        def same_schema():
+            return loop.run_until_complete(serialize_response(field=same_field, response_content=objects, dump_json=True))
+
+        def fast_path():
+            return serializer.dump(objects)
+
+        assert json.loads(fast_path()) == json.loads(response_model()) == json.loads(same_schema())
+        encoded, before, same, fast = (cpu_ms(fn, repeat) for fn in (encoder, response_model, same_schema, fast_path))
+        print(f"{endpoint:<30} {encoded:>11.3f} {before:>18.3f} {same:>15.3f} {fast:>13.3f}"
+              f" {same / fast:>7.1f}x {before / fast:>9.1f}x")
+    loop.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="rows per list response")
+    parser.add_argument("--repeat", type=int, default=300, help="responses timed per endpoint")
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -1,5 +1,9 @@
 
 from fastapi import status
+from sqlalchemy import event
+
+from app.models import Company, User
+from app.routers import auth
 
 def test_register_company(client):
     payload = {
@@ -47,3 +51,136 @@ def test_login_invalid_credentials(client):
     }
     response = client.post("/api/auth/login", json=payload)
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_current_user_is_cached(client, admin_a, token_headers_a):
+    from app.utils.security import user_cache
+
+    hits_before = user_cache.hits
+    assert client.get("/api/patients/", headers=token_headers_a).status_code == status.HTTP_200_OK
+    assert client.get("/api/patients/", headers=token_headers_a).status_code == status.HTTP_200_OK
+    assert user_cache.hits > hits_before
+    assert user_cache.get(admin_a.id) is not None
+
+def test_removed_staff_token_rejected(client, company_a, token_headers_a):
+    payload = {
+        "email": "staff@companya.com",
+        "password": "password",
+        "name": "Staff A",
+        "companyCode": company_a.code
+    }
+    staff = client.post("/api/auth/register/staff", json=payload).json()
+    staff_headers = {"Authorization": f"Bearer {staff['access_token']}"}
+    assert client.get("/api/patients/", headers=staff_headers).status_code == status.HTTP_200_OK
+
+    response = client.delete(f"/api/staff/{staff['user']['id']}", headers=token_headers_a)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = client.get("/api/patients/", headers=staff_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_logout_revokes_token(client, token_headers_a):
+    assert client.post("/api/auth/logout", headers=token_headers_a).status_code == status.HTTP_200_OK
+    response = client.get("/api/patients/", headers=token_headers_a)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_claims_auth_mode(client, company_a, token_headers_a, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "AUTH_MODE", "claims")
+
+    payload = {
+        "email": "claims@companya.com",
+        "password": "password",
+        "name": "Claims Staff",
+        "companyCode": company_a.code
+    }
+    staff = client.post("/api/auth/register/staff", json=payload).json()
+    staff_headers = {"Authorization": f"Bearer {staff['access_token']}"}
+    assert client.get("/api/patients/", headers=staff_headers).status_code == status.HTTP_200_OK
+    # Role comes from the token, so staff still can't reach admin routes
+    assert client.get("/api/staff/", headers=staff_headers).status_code == status.HTTP_403_FORBIDDEN
+
+    client.delete(f"/api/staff/{staff['user']['id']}", headers=token_headers_a)
+    response = client.get("/api/patients/", headers=staff_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_password_pool_rejects_when_saturated():
+    import time
+    import pytest
+    from fastapi import HTTPException
+    from app.utils.password_pool import PasswordHasherPool
+
+    pool = PasswordHasherPool(workers=1, max_pending=0)
+    try:
+        busy = pool.submit(time.sleep, 0.5)
+        with pytest.raises(HTTPException) as exc_info:
+            pool.submit(time.sleep, 0)
+        assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        busy.result()
+        pool.submit(time.sleep, 0).result()
+    finally:
+        pool.shutdown()
+
+def test_company_code_collision_retries_with_a_single_insert_each(client, company_a, db_engine, monkeypatch):
+    codes = iter([company_a.code, "K7QX2M9D"])
+    monkeypatch.setattr(auth, "generate_company_code", lambda: next(codes))
+    statements = []
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        response = client.post("/api/auth/register/company", json={
+            "email": "retry@clinic.com", "password": "pass", "adminName": "Retry", "companyName": "Retry Clinic"
+        })
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", capture)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["user"]["company_code"] == "K7QX2M9D"
+    # One INSERT per attempt, and no lookup of the code beforehand
+    assert len([s for s in statements if s.startswith("INSERT INTO companies")]) == 2
+    assert not [s for s in statements if "companies.code = " in s]
+
+    monkeypatch.setattr(auth, "generate_company_code", lambda: company_a.code)
+    full = client.post("/api/auth/register/company", json={
+        "email": "full@clinic.com", "password": "pass", "adminName": "Full", "companyName": "Full Clinic"
+    })
+    assert full.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+def test_generated_company_codes_are_unambiguous():
+    codes = {auth.generate_company_code() for _ in range(1000)}
+    assert len(codes) == 1000
+    assert all(len(code) == auth.CODE_LENGTH and not set(code) & set("ILOU") for code in codes)
+
+def test_staff_join_with_a_misread_company_code(client, db_session, portal):
+    async def _seed():
+        # A current Crockford code and one from before it, which has I and L in it
+        db_session.add_all([Company(name="Crockford", code="K7QX0M1D"), Company(name="Legacy", code="CLINIC042")])
+        await db_session.commit()
+    portal.call(_seed)
+
+    for i, (typed, code) in enumerate((
+        ("k7qx-om1d", "K7QX0M1D"), (" K7QXOMLD ", "K7QX0M1D"), ("K7QXOMID", "K7QX0M1D"), ("clinic042", "CLINIC042")
+    )):
+        response = client.post("/api/auth/register/staff", json={
+            "email": f"join{i}@clinic.com", "password": "pass", "name": "Joiner", "companyCode": typed
+        })
+        assert response.status_code == status.HTTP_200_OK, typed
+        assert response.json()["user"]["company_code"] == code
+
+    response = client.post("/api/auth/register/staff", json={
+        "email": "nobody@clinic.com", "password": "pass", "name": "Nobody", "companyCode": "K7QX0M1E"
+    })
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+def test_staff_registration_race_is_a_conflict(client, db_session, company_a, monkeypatch):
+    payload = {"email": "twice@companya.com", "password": "pass", "name": "Twice", "companyCode": company_a.code}
+    hash_password = auth.security.get_password_hash
+
+    async def concurrent_registration(password):
+        # The other request inserts the same email after this one's duplicate check
+        db_session.add(User(email=payload["email"], password_hash="x", name="First", role="staff", company_id=company_a.id))
+        await db_session.flush()
+        return await hash_password(password)
+
+    monkeypatch.setattr(auth.security, "get_password_hash", concurrent_registration)
+    response = client.post("/api/auth/register/staff", json=payload)
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json()["detail"] == "Email already registered"
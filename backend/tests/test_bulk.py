@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+
+from fastapi import status
+from sqlalchemy import event
+
+def test_bulk_patients_report_per_item_results(client, db_engine, token_headers_a):
+    items = [
+        {"name": "Bulk One", "email": "one@test.com", "phone": "1"},
+        {"name": "Bulk Two", "email": "not-an-email", "phone": "2"},
+        {"name": "Bulk Three", "email": "three@test.com", "phone": "3"},
+    ]
+    statements = []
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        resp = client.post("/api/patients/bulk", json={"items": items}, headers=token_headers_a)
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert resp.status_code == status.HTTP_200_OK
+    body = resp.json()
+    assert (body["created"], body["failed"]) == (2, 1)
+    assert [r["index"] for r in body["results"]] == [0, 1, 2]
+    assert body["results"][1]["id"] is None and body["results"][1]["error"].startswith("email")
+    # The whole batch is a single executemany INSERT
+    assert sum(s.lstrip().upper().startswith("INSERT INTO PATIENTS") for s in statements) == 1
+
+    patients = client.get("/api/patients/", headers=token_headers_a).json()
+    assert {p["id"] for p in patients} == {body["results"][0]["id"], body["results"][2]["id"]}
+    assert client.get("/api/dashboard/stats", headers=token_headers_a).json()["totalPatients"] == 2
+
+def test_bulk_appointments_and_followups_check_patient_ownership(client, token_headers_a, token_headers_b):
+    own = client.post(
+        "/api/patients/", json={"name": "Own", "email": "own@test.com", "phone": "1"}, headers=token_headers_a
+    ).json()["id"]
+    foreign = client.post(
+        "/api/patients/", json={"name": "Foreign", "email": "foreign@test.com", "phone": "1"}, headers=token_headers_b
+    ).json()["id"]
+    today = date.today().isoformat()
+
+    resp = client.post("/api/appointments/bulk", json={"items": [
+        {"patient_id": own, "date": today, "time": "09:00", "reason": "A"},
+        {"patient_id": foreign, "date": today, "time": "10:00", "reason": "B"},
+        {"patient_id": own, "date": (date.today() + timedelta(days=1)).isoformat(), "time": "11:00", "reason": "C"},
+        {"patient_id": own, "date": today, "time": "later", "reason": "D"},
+    ]}, headers=token_headers_a).json()
+    assert (resp["created"], resp["failed"]) == (2, 2)
+    assert resp["results"][1]["error"] == "Patient not found"
+    assert resp["results"][3]["error"].startswith("time")
+
+    resp = client.post("/api/follow-ups/bulk", json={"items": [
+        {"patient_id": own, "title": "Call", "due_date": today},
+        {"patient_id": own, "title": "Done", "due_date": today, "status": "completed"},
+        {"patient_id": foreign, "title": "Nope", "due_date": today},
+    ]}, headers=token_headers_a).json()
+    assert (resp["created"], resp["failed"]) == (2, 1)
+
+    stats = client.get("/api/dashboard/stats", headers=token_headers_a).json()
+    assert (stats["todayAppointments"], stats["openFollowUps"]) == (1, 1)
+    assert len(stats["upcomingAppointments"]) == 2
+    assert client.get("/api/dashboard/stats", headers=token_headers_b).json()["todayAppointments"] == 0
+
+def test_bulk_rejects_empty_batch(client, token_headers_a):
+    resp = client.post("/api/patients/bulk", json={"items": []}, headers=token_headers_a)
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
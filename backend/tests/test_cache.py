@@ -0,0 +1,48 @@
+import asyncio
+
+from app.utils.cache import StaleWhileRevalidateCache
+
+def test_stale_entries_are_served_while_refreshing(portal):
+    async def scenario():
+        cache = StaleWhileRevalidateCache(maxsize=10, ttl=0.05, stale_ttl=60)
+        calls = []
+
+        async def load():
+            calls.append(len(calls))
+            return len(calls)
+
+        assert await cache.get("k", load) == 1
+        assert await cache.get("k", load) == 1
+        await asyncio.sleep(0.06)
+        # Expired but within the stale window: old value now, one refresh behind it
+        assert await cache.get("k", load) == 1
+        assert await cache.get("k", load) == 1
+        await asyncio.sleep(0)
+        assert await cache.get("k", load) == 2
+        assert len(calls) == 2
+        return cache.stats()
+
+    stats = portal.call(scenario)
+    assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (2, 2, 1)
+
+def test_invalidate_discards_in_flight_loads(portal):
+    async def scenario():
+        cache = StaleWhileRevalidateCache(maxsize=10, ttl=60, stale_ttl=60)
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_load():
+            started.set()
+            await release.wait()
+            return "before write"
+
+        pending = asyncio.create_task(cache.get("k", slow_load))
+        await started.wait()
+        cache.invalidate("k")
+        release.set()
+        assert await pending == "before write"
+
+        async def load():
+            return "after write"
+        return await cache.get("k", load)
+
+    assert portal.call(scenario) == "after write"
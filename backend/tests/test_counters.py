@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+
+from sqlalchemy import update
+
+from app.models import CompanyStats, DailyAppointmentCount
+from app.routers import dashboard
+from app.utils import counters
+
+def stats(client, headers):
+    return client.get("/api/dashboard/stats", headers=headers).json()
+
+def test_write_paths_keep_counters_in_step(client, token_headers_a, token_headers_b):
+    today = date.today().isoformat()
+    patient_id = client.post(
+        "/api/patients/", json={"name": "Counted", "email": "counted@test.com", "phone": "1"}, headers=token_headers_a
+    ).json()["id"]
+    extra_id = client.post(
+        "/api/patients/", json={"name": "Extra", "email": "extra@test.com", "phone": "2"}, headers=token_headers_a
+    ).json()["id"]
+    appointment_id = client.post(
+        "/api/appointments/", json={"patient_id": patient_id, "date": today, "time": "09:00", "reason": "Check"},
+        headers=token_headers_a
+    ).json()["id"]
+    followup_id = client.post(
+        "/api/follow-ups/", json={"patient_id": patient_id, "title": "Call", "due_date": today}, headers=token_headers_a
+    ).json()["id"]
+
+    current = stats(client, token_headers_a)
+    assert (current["totalPatients"], current["todayAppointments"], current["openFollowUps"]) == (2, 1, 1)
+    assert stats(client, token_headers_b)["totalPatients"] == 0
+
+    # Rescheduling moves the count between days; cancelling drops it
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    client.patch(f"/api/appointments/{appointment_id}", json={"date": tomorrow}, headers=token_headers_a)
+    assert stats(client, token_headers_a)["todayAppointments"] == 0
+    client.patch(f"/api/appointments/{appointment_id}", json={"date": today}, headers=token_headers_a)
+    client.patch(f"/api/appointments/{appointment_id}", json={"status": "cancelled"}, headers=token_headers_a)
+    client.patch(f"/api/follow-ups/{followup_id}", json={"status": "completed"}, headers=token_headers_a)
+    client.patch(f"/api/follow-ups/{followup_id}", json={"title": "Called"}, headers=token_headers_a)
+    client.delete(f"/api/patients/{extra_id}", headers=token_headers_a)
+
+    current = stats(client, token_headers_a)
+    assert (current["totalPatients"], current["todayAppointments"], current["openFollowUps"]) == (1, 0, 0)
+
+def test_reconcile_repairs_drift(client, portal, db_session, company_a, token_headers_a):
+    patient_id = client.post(
+        "/api/patients/", json={"name": "Drift", "email": "drift@test.com", "phone": "1"}, headers=token_headers_a
+    ).json()["id"]
+    client.post(
+        "/api/appointments/",
+        json={"patient_id": patient_id, "date": date.today().isoformat(), "time": "09:00", "reason": "Check"},
+        headers=token_headers_a
+    )
+
+    async def corrupt():
+        await db_session.execute(update(CompanyStats).values(patients=40, open_follow_ups=3))
+        await db_session.execute(update(DailyAppointmentCount).values(scheduled=0))
+        await db_session.commit()
+    portal.call(corrupt)
+    dashboard.stats_cache.clear()
+    assert stats(client, token_headers_a)["totalPatients"] == 40
+
+    assert portal.call(counters.reconcile_all, db_session) == 3
+    dashboard.stats_cache.clear()
+    current = stats(client, token_headers_a)
+    assert (current["totalPatients"], current["todayAppointments"], current["openFollowUps"]) == (1, 1, 0)
+    assert portal.call(counters.reconcile_all, db_session) == 0
@@ -0,0 +1,40 @@
+import csv
+import io
+import json
+from datetime import date
+
+from app.routers import export
+
+def test_export_streams_company_rows(client, monkeypatch, token_headers_a, token_headers_b):
+    monkeypatch.setattr(export, "CHUNK_ROWS", 2)
+    created = client.post("/api/patients/bulk", json={"items": [
+        {"name": f"Export {i}", "email": f"export{i}@test.com", "phone": str(i)} for i in range(5)
+    ]}, headers=token_headers_a).json()
+    patient_id = created["results"][0]["id"]
+    client.post("/api/patients/", json={"name": "Other", "email": "other@test.com", "phone": "0"}, headers=token_headers_b)
+    client.post(
+        "/api/appointments/",
+        json={"patient_id": patient_id, "date": date.today().isoformat(), "time": "09:30", "reason": "Check"},
+        headers=token_headers_a
+    )
+    client.post(f"/api/patients/{patient_id}/notes", json={"content": "Line one\nline, two"}, headers=token_headers_a)
+
+    resp = client.get("/api/export/patients", headers=token_headers_a)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert resp.headers["content-disposition"] == 'attachment; filename="patients.csv"'
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert sorted(r["name"] for r in rows) == [f"Export {i}" for i in range(5)]
+
+    resp = client.get("/api/export/appointments", params={"format": "ndjson"}, headers=token_headers_a)
+    [appointment] = [json.loads(line) for line in resp.text.splitlines()]
+    assert (appointment["patient_name"], appointment["status"]) == ("Export 0", "scheduled")
+    assert appointment["start_at"].endswith("09:30:00")
+
+    rows = list(csv.DictReader(io.StringIO(client.get("/api/export/notes", headers=token_headers_a).text)))
+    assert [(r["content"], r["created_by"]) for r in rows] == [("Line one\nline, two", "Admin A")]
+
+    assert client.get("/api/export/follow-ups", headers=token_headers_a).text.strip() == (
+        "id,patient_id,patient_name,title,description,due_date,status,created_at"
+    )
+    assert client.get("/api/export/users", headers=token_headers_a).status_code == 422
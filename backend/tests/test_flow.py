@@ -1,5 +1,9 @@
 
 from fastapi import status
+from sqlalchemy import event
+
+from app.routers import dashboard
+import time
 from datetime import datetime, timedelta
 
 def test_patient_appointment_flow(client, token_headers_a):
@@ -36,3 +40,172 @@ def test_patient_appointment_flow(client, token_headers_a):
     appointments = list_resp.json()
     assert len(appointments) >= 1
     assert any(a["id"] == appt_data["id"] for a in appointments)
+
+def test_notes_followups_dashboard_flow(client, token_headers_a):
+    patient_resp = client.post(
+        "/api/patients/",
+        json={"name": "Chart Patient", "email": "chart@test.com", "phone": "555-0000"},
+        headers=token_headers_a
+    )
+    patient_id = patient_resp.json()["id"]
+
+    note_resp = client.post(f"/api/patients/{patient_id}/notes", json={"content": "Initial visit"}, headers=token_headers_a)
+    assert note_resp.status_code == status.HTTP_200_OK
+    assert note_resp.json()["createdBy"] == "Admin A"
+    notes = client.get(f"/api/patients/{patient_id}/notes", headers=token_headers_a).json()
+    assert [n["content"] for n in notes] == ["Initial visit"]
+
+    today = datetime.now().date().isoformat()
+    followup_resp = client.post(
+        "/api/follow-ups/",
+        json={"patient_id": patient_id, "title": "Call back", "due_date": today},
+        headers=token_headers_a
+    )
+    assert followup_resp.status_code == status.HTTP_201_CREATED
+    assert followup_resp.json()["patientName"] == "Chart Patient"
+
+    appt_resp = client.post(
+        "/api/appointments/",
+        json={"patient_id": patient_id, "date": today, "time": "09:30", "reason": "Review"},
+        headers=token_headers_a
+    )
+    appt_id = appt_resp.json()["id"]
+
+    stats = client.get("/api/dashboard/stats", headers=token_headers_a).json()
+    assert stats["totalPatients"] == 1
+    assert stats["todayAppointments"] == 1
+    assert stats["openFollowUps"] == 1
+    assert stats["upcomingAppointments"][0]["patientName"] == "Chart Patient"
+
+    update_resp = client.patch(f"/api/appointments/{appt_id}", json={"status": "completed"}, headers=token_headers_a)
+    assert update_resp.status_code == status.HTTP_200_OK
+    assert update_resp.json()["status"] == "completed"
+    followup_id = followup_resp.json()["id"]
+    update_resp = client.patch(f"/api/follow-ups/{followup_id}", json={"status": "completed"}, headers=token_headers_a)
+    assert update_resp.json()["status"] == "completed"
+
+    stats = client.get("/api/dashboard/stats", headers=token_headers_a).json()
+    assert stats["todayAppointments"] == 0
+    assert stats["openFollowUps"] == 0
+
+def test_dashboard_is_one_statement(client, db_engine, company_a, token_headers_a):
+    patient_id = client.post(
+        "/api/patients/",
+        json={"name": "Busy Patient", "email": "busy@test.com", "phone": "555-0001"},
+        headers=token_headers_a
+    ).json()["id"]
+    start = datetime.now().date()
+    for day in range(7, 0, -1):
+        client.post(
+            "/api/appointments/",
+            json={"patient_id": patient_id, "date": (start + timedelta(days=day)).isoformat(), "time": "10:00", "reason": "Review"},
+            headers=token_headers_a
+        )
+    for day in range(2):
+        client.post(
+            "/api/follow-ups/",
+            json={"patient_id": patient_id, "title": f"Call {day}", "due_date": (start + timedelta(days=day)).isoformat()},
+            headers=token_headers_a
+        )
+    client.get("/api/dashboard/stats", headers=token_headers_a)  # warm the auth cache
+    dashboard.invalidate(company_a.id)
+
+    statements = []
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        stats = client.get("/api/dashboard/stats", headers=token_headers_a).json()
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert len(statements) == 1
+    assert stats["totalPatients"] == 1
+    assert stats["openFollowUps"] == 2
+    assert [a["date"] for a in stats["upcomingAppointments"]] == [(start + timedelta(days=d)).isoformat() for d in range(1, 6)]
+    assert [f["title"] for f in stats["openFollowUpsList"]] == ["Call 0", "Call 1"]
+    assert {a["patientName"] for a in stats["upcomingAppointments"]} == {"Busy Patient"}
+
+def test_dashboard_served_from_cache_until_a_write(client, db_engine, token_headers_a):
+    statements = []
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)
+    first = client.get("/api/dashboard/stats", headers=token_headers_a).json()
+    hits_before = dashboard.stats_cache.hits
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        assert client.get("/api/dashboard/stats", headers=token_headers_a).json() == first
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", capture)
+    assert statements == []
+    assert dashboard.stats_cache.hits == hits_before + 1
+
+    client.post(
+        "/api/patients/", json={"name": "Fresh", "email": "fresh@test.com", "phone": "1"}, headers=token_headers_a
+    )
+    stats = client.get("/api/dashboard/stats", headers=token_headers_a).json()
+    assert stats["totalPatients"] == first["totalPatients"] + 1
+
+    metrics = client.get("/api/metrics/", headers=token_headers_a).json()
+    assert metrics["dashboard_cache"]["hits"] >= 1
+
+def test_appointments_sort_and_filter_by_start_time(client, token_headers_a):
+    patient_id = client.post(
+        "/api/patients/", json={"name": "Timed", "email": "timed@test.com", "phone": "1"}, headers=token_headers_a
+    ).json()["id"]
+    day = datetime.now().date() + timedelta(days=3)
+    for when, hhmm in ((day, "10:00"), (day, "9:05"), (day + timedelta(days=1), "08:00"), (day + timedelta(days=8), "08:00")):
+        resp = client.post(
+            "/api/appointments/",
+            json={"patient_id": patient_id, "date": when.isoformat(), "time": hhmm, "reason": "Visit", "duration_minutes": 30},
+            headers=token_headers_a
+        )
+        assert resp.status_code == status.HTTP_201_CREATED
+
+    week = client.get(
+        "/api/appointments/",
+        params={"start_date": day.isoformat(), "end_date": (day + timedelta(days=6)).isoformat()},
+        headers=token_headers_a
+    ).json()
+    assert [(a["date"], a["time"]) for a in week] == [
+        (day.isoformat(), "09:05"), (day.isoformat(), "10:00"), ((day + timedelta(days=1)).isoformat(), "08:00")
+    ]
+    assert week[0]["end_at"].endswith("09:35:00")
+
+    moved = client.patch(f"/api/appointments/{week[0]['id']}", json={"time": "11:15"}, headers=token_headers_a).json()
+    assert (moved["date"], moved["time"]) == (day.isoformat(), "11:15")
+
+    # The forms the start_at migration read from the old free-form column are accepted too
+    for typed, hhmm in (("2pm", "14:00"), ("2.30 p.m.", "14:30"), ("14h30", "14:30"), ("09:05:59", "09:05")):
+        moved = client.patch(f"/api/appointments/{week[0]['id']}", json={"time": typed}, headers=token_headers_a)
+        assert moved.json()["time"] == hhmm
+
+    bad = client.post(
+        "/api/appointments/",
+        json={"patient_id": patient_id, "date": day.isoformat(), "time": "25:00", "reason": "Visit"},
+        headers=token_headers_a
+    )
+    assert bad.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+def test_dashboard_background_refresh_uses_the_app_session(client, company_a, token_headers_a, monkeypatch):
+    from app.database import AppSession
+    from app.utils.cache import StaleWhileRevalidateCache
+
+    monkeypatch.setattr(dashboard, "stats_cache", StaleWhileRevalidateCache(maxsize=10, ttl=0.01, stale_ttl=60))
+    sessions = []
+    load = dashboard.load_dashboard_stats
+
+    async def recording_load(db, company_id):
+        sessions.append(type(db.sync_session))
+        return await load(db, company_id)
+
+    monkeypatch.setattr(dashboard, "load_dashboard_stats", recording_load)
+    for _ in range(2):
+        assert client.get("/api/dashboard/stats", headers=token_headers_a).status_code == status.HTTP_200_OK
+        time.sleep(0.02)
+    # The second call was served stale and refreshed in the background, where
+    # pool_stats only sees the session if it comes from SessionLocal
+    for _ in range(50):
+        if len(sessions) == 2:
+            break
+        time.sleep(0.01)
+    assert sessions[1:] == [AppSession]
@@ -0,0 +1,67 @@
+from datetime import timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import status
+from sqlalchemy import event
+
+def test_lists_revalidate_with_etags(client, db_engine, token_headers_a, token_headers_b):
+    client.post("/api/patients/", json={"name": "Cached", "email": "cached@test.com", "phone": "1"}, headers=token_headers_a)
+    first = client.get("/api/patients/", headers=token_headers_a)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    assert "Last-Modified" in first.headers
+
+    statements = []
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        again = client.get("/api/patients/", headers={**token_headers_a, "If-None-Match": etag})
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", capture)
+    assert again.status_code == status.HTTP_304_NOT_MODIFIED
+    assert again.content == b""
+    assert again.headers["ETag"] == etag
+    # Only the version lookup ran; the list query was skipped
+    assert len(statements) == 1 and "company_stats" in statements[0]
+
+    # Different query string, different tenant: different validators
+    assert client.get("/api/patients/", params={"limit": 5}, headers=token_headers_a).headers["ETag"] != etag
+    other = client.get("/api/patients/", headers={**token_headers_b, "If-None-Match": etag})
+    assert other.status_code == status.HTTP_200_OK
+
+    client.post("/api/patients/", json={"name": "Newer", "email": "newer@test.com", "phone": "2"}, headers=token_headers_a)
+    changed = client.get("/api/patients/", headers={**token_headers_a, "If-None-Match": etag})
+    assert changed.status_code == status.HTTP_200_OK
+    assert len(changed.json()) == 2
+
+    # Same second as the last write: another write may have landed in it, so no 304
+    last_modified = parsedate_to_datetime(changed.headers["Last-Modified"])
+    same_second = client.get("/api/patients/", headers={**token_headers_a, "If-Modified-Since": format_datetime(last_modified, usegmt=True)})
+    assert same_second.status_code == status.HTTP_200_OK
+    later = format_datetime(last_modified + timedelta(seconds=1), usegmt=True)
+    since = client.get("/api/patients/", headers={**token_headers_a, "If-Modified-Since": later})
+    assert since.status_code == status.HTTP_304_NOT_MODIFIED
+    # The ETag wins over the date when both are sent
+    both = client.get("/api/patients/", headers={**token_headers_a, "If-Modified-Since": later, "If-None-Match": etag})
+    assert both.status_code == status.HTTP_200_OK
+
+def test_staff_list_checks_role_before_revalidating(client, company_a, token_headers_a):
+    etag = client.get("/api/staff/", headers=token_headers_a).headers["ETag"]
+    staff = client.post("/api/auth/register/staff", json={
+        "email": "etag@companya.com", "password": "password", "name": "Etag Staff", "companyCode": company_a.code
+    }).json()
+    staff_headers = {"Authorization": f"Bearer {staff['access_token']}"}
+    resp = client.get("/api/staff/", headers={**staff_headers, "If-None-Match": "*"})
+    assert resp.status_code == status.HTTP_403_FORBIDDEN
+    # Registering staff changed the list, so the admin's old ETag no longer matches
+    assert client.get("/api/staff/", headers={**token_headers_a, "If-None-Match": etag}).status_code == 200
+
+def test_large_lists_are_gzipped(client, token_headers_a):
+    client.post("/api/patients/bulk", json={"items": [
+        {"name": f"Gzip {i}", "email": f"gzip{i}@test.com", "phone": str(i)} for i in range(50)
+    ]}, headers=token_headers_a)
+    resp = client.get("/api/patients/", headers={**token_headers_a, "Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert len(resp.json()) == 50
+    small = client.get("/api/patients/", params={"limit": 1}, headers={**token_headers_a, "Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
@@ -0,0 +1,59 @@
+import csv
+import io
+from datetime import date
+
+from app.routers import imports
+
+def upload(client, resource, body, headers):
+    return client.post(f"/api/import/{resource}", files={"file": (f"{resource}.csv", body.encode(), "text/csv")}, headers=headers)
+
+def test_import_patients_then_appointments(client, monkeypatch, token_headers_a, token_headers_b):
+    monkeypatch.setattr(imports, "CHUNK_ROWS", 2)
+    patients = (
+        "﻿name,email,phone,date_of_birth,address\n"
+        "Ada Import,ada@test.com,1,1990-01-02,\n"
+        "Bad Email,nope,2,,\n"
+        'Cy Import,cy@test.com,3,,"1 Long Road\nTown"\n'
+        "Dup One,dup@test.com,4,,\n"
+        "Dup Two,dup@test.com,5,,\n"
+    )
+    resp = upload(client, "patients", patients, token_headers_a)
+    assert resp.status_code == 200
+    assert (resp.headers["X-Import-Created"], resp.headers["X-Import-Failed"]) == ("4", "1")
+    report = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [r["line"] for r in report] == ["3"]
+    assert report[0]["error"].startswith("email")
+    upload(client, "patients", "name,email,phone\nElsewhere,ada@test.com,9\n", token_headers_b)
+
+    cy = next(p for p in client.get("/api/patients/", headers=token_headers_a).json() if p["name"] == "Cy Import")
+    assert cy["address"] == "1 Long Road\nTown"
+    today = date.today().isoformat()
+    appointments = (
+        "patient_email,patient_id,date,time,reason\n"
+        f"ada@test.com,,{today},9:00,First\n"
+        f",{cy['id']},{today},10:00,Second\n"
+        f"missing@test.com,,{today},11:00,Third\n"
+        f"dup@test.com,,{today},12:00,Fourth\n"
+        f"ada@test.com,,{today},noon,Fifth\n"
+    )
+    resp = upload(client, "appointments", appointments, token_headers_a)
+    assert (resp.headers["X-Import-Created"], resp.headers["X-Import-Failed"]) == ("2", "3")
+    report = {r["line"]: r["error"] for r in csv.DictReader(io.StringIO(resp.text))}
+    assert report["4"] == "Patient not found"
+    assert report["5"] == "patient_email matches several patients"
+    assert report["6"].startswith("time")
+
+    stats = client.get("/api/dashboard/stats", headers=token_headers_a).json()
+    assert (stats["totalPatients"], stats["todayAppointments"]) == (4, 2)
+    assert client.get("/api/dashboard/stats", headers=token_headers_b).json()["todayAppointments"] == 0
+
+def test_import_rejects_non_utf8(client, token_headers_a):
+    resp = upload(client, "patients", "", token_headers_a)
+    assert resp.headers["X-Import-Created"] == "0"
+    resp = client.post(
+        "/api/import/patients",
+        files={"file": ("p.csv", "name,email,phone\nJos\xe9,j@test.com,1\n".encode("latin-1"), "text/csv")},
+        headers=token_headers_a
+    )
+    assert resp.headers["X-Import-Failed"] == "1"
+    assert "UTF-8" in resp.text
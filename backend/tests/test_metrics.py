@@ -0,0 +1,58 @@
+import pytest
+from fastapi import status
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app import database
+from app.database import pool_stats
+
+def test_metrics_requires_admin(client, company_a, token_headers_a):
+    response = client.get("/api/metrics/", headers=token_headers_a)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert {"user_cache", "password_pool", "db_pool"} <= data.keys()
+    assert "checkout_latency" in data["db_pool"]
+
+    staff = client.post("/api/auth/register/staff", json={
+        "email": "metrics@companya.com",
+        "password": "password",
+        "name": "Metrics Staff",
+        "companyCode": company_a.code
+    }).json()
+    staff_headers = {"Authorization": f"Bearer {staff['access_token']}"}
+    assert client.get("/api/metrics/", headers=staff_headers).status_code == status.HTTP_403_FORBIDDEN
+
+def test_pool_stats_record_checkouts_and_timeouts(portal, tmp_path, monkeypatch):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path}/pool.db", poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.1
+    )
+    sessions = async_sessionmaker(bind=engine, sync_session_class=database.AppSession)
+    monkeypatch.setattr(database, "SessionLocal", sessions)
+
+    async def use_pool():
+        for _ in range(3):
+            async with sessions() as db:
+                await db.execute(text("SELECT 1"))
+        checkouts = pool_stats.checkout.count
+
+        # The one connection is held elsewhere, so the request's session times out
+        async with engine.connect():
+            requests_db = database.get_db()
+            db = await anext(requests_db)
+            with pytest.raises(TimeoutError) as exc_info:
+                await db.execute(text("SELECT 1"))
+            with pytest.raises(TimeoutError):
+                await requests_db.athrow(exc_info.value)
+        stats = pool_stats.snapshot(engine.pool)
+        await engine.dispose()
+        return checkouts, stats
+
+    before = pool_stats.checkout.count
+    timeouts = pool_stats.timeouts
+    checkouts, stats = portal.call(use_pool)
+    assert checkouts - before == 3
+    assert stats["checkout_timeouts"] == timeouts + 1
+    assert stats["size"] == 1
+    assert stats["checkedout"] == 0
@@ -0,0 +1,188 @@
+from datetime import date, datetime, time, timedelta
+from uuid import UUID
+from fastapi import status
+from sqlalchemy import event
+
+from app.models import Patient, Note, Appointment, FollowUp
+
+def seed_patients(portal, db_session, company, count, same_timestamp_every=3):
+    base = datetime(2025, 1, 1, 9, 0, 0)
+
+    async def _seed():
+        for i in range(count):
+            # Several rows share a timestamp so the id tie-break is exercised
+            created_at = base + timedelta(minutes=i // same_timestamp_every)
+            db_session.add(Patient(
+                name=f"Patient {i:03d}",
+                email=f"patient{i}@example.com",
+                phone=str(i),
+                company_id=company.id,
+                created_at=created_at,
+            ))
+        await db_session.commit()
+
+    portal.call(_seed)
+
+def test_cursor_pagination_walks_every_patient_once(client, portal, db_session, company_a, token_headers_a):
+    seed_patients(portal, db_session, company_a, 25)
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 7}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/patients/", params=params, headers=token_headers_a)
+        assert response.status_code == status.HTTP_200_OK
+        seen.extend(p["id"] for p in response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == 4
+    assert len(seen) == len(set(seen)) == 25
+
+    # Offset paging keeps working and agrees with the cursor order
+    skipped = client.get("/api/patients/", params={"skip": 7, "limit": 7}, headers=token_headers_a).json()
+    assert [p["id"] for p in skipped] == seen[7:14]
+
+def test_cursor_pagination_over_patients_created_through_the_api(client, token_headers_a):
+    # Created within the same second or so: the cursor must still step past each row exactly once
+    for i in range(9):
+        client.post("/api/patients/", json={"name": f"Walk-in {i}", "email": f"walkin{i}@example.com", "phone": str(i)}, headers=token_headers_a)
+
+    seen, cursor = [], None
+    for _ in range(10):
+        response = client.get("/api/patients/", params={"limit": 2, **({"cursor": cursor} if cursor else {})}, headers=token_headers_a)
+        seen.extend(p["name"] for p in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert sorted(seen) == [f"Walk-in {i}" for i in range(9)]
+
+def test_invalid_cursor_rejected(client, token_headers_a):
+    response = client.get("/api/patients/", params={"cursor": "not-a-cursor"}, headers=token_headers_a)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_search_matches_prefixes_and_stays_in_tenant(client, token_headers_a, token_headers_b):
+    for name, email in [("Jonathan Smith", "jsmith@example.com"), ("Joanna Smythe", "joanna@example.com"), ("Mary Major", "mary@example.com")]:
+        client.post("/api/patients/", json={"name": name, "email": email, "phone": "555"}, headers=token_headers_a)
+    client.post("/api/patients/", json={"name": "Jonah Other", "email": "jonah@example.com", "phone": "1"}, headers=token_headers_b)
+
+    names = [p["name"] for p in client.get("/api/patients/", params={"search": "jo"}, headers=token_headers_a).json()]
+    assert sorted(names) == ["Joanna Smythe", "Jonathan Smith"]
+
+    names = [p["name"] for p in client.get("/api/patients/", params={"search": "jon smi"}, headers=token_headers_a).json()]
+    assert names == ["Jonathan Smith"]
+
+    results = client.get("/api/patients/", params={"search": "mary@"}, headers=token_headers_a).json()
+    assert [p["name"] for p in results] == ["Mary Major"]
+
+    # Renames are picked up by the search index
+    client.put(f"/api/patients/{results[0]['id']}", json={"name": "Maria Major"}, headers=token_headers_a)
+    assert client.get("/api/patients/", params={"search": "maria"}, headers=token_headers_a).json()[0]["id"] == results[0]["id"]
+    assert client.get("/api/patients/", params={"search": "%"}, headers=token_headers_a).json() == []
+
+def test_notes_timeline_pages_newest_first_in_one_statement(client, db_engine, admin_a, token_headers_a, token_headers_b):
+    patient_id, empty_id = (
+        client.post("/api/patients/", json={"name": name, "email": f"{name.lower()}@example.com", "phone": "1"}, headers=token_headers_a).json()["id"]
+        for name in ("Chronic", "New")
+    )
+    # Posted through the API, so several notes share a second
+    for i in range(12):
+        client.post(f"/api/patients/{patient_id}/notes", json={"content": f"Visit {i}"}, headers=token_headers_a)
+
+    statements = []
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        first = client.get(f"/api/patients/{patient_id}/notes", params={"limit": 5}, headers=token_headers_a)
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", capture)
+    # Ownership, the page and author names all come from one statement
+    timeline = [statement for statement in statements if "patients" in statement or "notes" in statement]
+    assert len(timeline) == 1 and "JOIN notes" in timeline[0] and "password_hash" not in timeline[0]
+    assert first.json()[0]["createdBy"] == admin_a.name
+
+    seen = [(note["created_at"], note["id"]) for note in first.json()]
+    cursor = first.headers["X-Next-Cursor"]
+    for _ in range(5):
+        page = client.get(f"/api/patients/{patient_id}/notes", params={"limit": 5, "cursor": cursor}, headers=token_headers_a)
+        seen.extend((note["created_at"], note["id"]) for note in page.json())
+        cursor = page.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 12
+    assert seen == sorted(seen, reverse=True)
+
+    assert client.get(f"/api/patients/{empty_id}/notes", headers=token_headers_a).json() == []
+    other = client.get(f"/api/patients/{patient_id}/notes", headers=token_headers_b)
+    assert other.status_code == status.HTTP_404_NOT_FOUND
+
+def test_chart_returns_every_section_in_one_statement(client, portal, db_session, db_engine, company_a, admin_a, token_headers_a, token_headers_b):
+    async def _seed():
+        patient = Patient(name="Charted", email="charted@example.com", phone="1", company_id=company_a.id)
+        db_session.add(patient)
+        for i in range(12):
+            db_session.add(Note(
+                patient=patient, company_id=company_a.id, created_by_user_id=admin_a.id,
+                content=f"Note {i}", created_at=datetime(2025, 1, 1) + timedelta(hours=i),
+            ))
+        for offset in [*range(-7, 0), *range(1, 8)]:
+            db_session.add(Appointment(
+                patient=patient, company_id=company_a.id, reason=f"Visit {offset}",
+                start_at=datetime.combine(date.today() + timedelta(days=offset), time(10)),
+            ))
+        for i, state in enumerate(["completed", "open", "open"]):
+            db_session.add(FollowUp(patient=patient, company_id=company_a.id, title=f"Task {i}",
+                                    due_date=date.today() + timedelta(days=i), status=state))
+        await db_session.commit()
+        return patient.id
+
+    patient_id = portal.call(_seed)
+
+    statements = []
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        chart = client.get(f"/api/patients/{patient_id}/chart", headers=token_headers_a)
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", capture)
+    assert chart.status_code == status.HTTP_200_OK
+    assert len([statement for statement in statements if "patients" in statement]) == 1
+
+    body = chart.json()
+    assert body["patient"]["name"] == "Charted"
+    assert [note["content"] for note in body["recentNotes"]] == [f"Note {i}" for i in range(11, 1, -1)]
+    assert body["recentNotes"][0]["createdBy"] == admin_a.name
+    today = date.today()
+    assert [a["date"] for a in body["upcomingAppointments"]] == [(today + timedelta(days=i)).isoformat() for i in range(1, 6)]
+    assert [a["date"] for a in body["pastAppointments"]] == [(today - timedelta(days=i)).isoformat() for i in range(1, 6)]
+    assert {a["patientName"] for a in body["upcomingAppointments"] + body["pastAppointments"]} == {"Charted"}
+    assert [f["title"] for f in body["openFollowUps"]] == ["Task 1", "Task 2"]
+
+    assert client.get(f"/api/patients/{patient_id}/chart", headers=token_headers_b).status_code == status.HTTP_404_NOT_FOUND
+
+def test_chart_revalidates_when_a_visit_starts(client, portal, db_session, token_headers_a):
+    patient = client.post("/api/patients/", json={"name": "Soon", "email": "soon@example.com", "phone": "1"}, headers=token_headers_a).json()
+    visit = client.post("/api/appointments/", json={
+        "patient_id": patient["id"], "date": (date.today() + timedelta(days=1)).isoformat(), "time": "09:00", "reason": "Check-up"
+    }, headers=token_headers_a).json()
+    chart = client.get(f"/api/patients/{patient['id']}/chart", headers=token_headers_a)
+    assert [a["id"] for a in chart.json()["upcomingAppointments"]] == [visit["id"]]
+    etag = chart.headers["ETag"]
+    assert client.get(f"/api/patients/{patient['id']}/chart", headers={**token_headers_a, "If-None-Match": etag}).status_code == status.HTTP_304_NOT_MODIFIED
+
+    # Time passing moves the visit into the past without any write bumping data_version
+    async def _start():
+        appointment = await db_session.get(Appointment, UUID(visit["id"]))
+        appointment.start_at = datetime.now() - timedelta(minutes=5)
+        await db_session.commit()
+    portal.call(_start)
+
+    after = client.get(f"/api/patients/{patient['id']}/chart", headers={**token_headers_a, "If-None-Match": etag})
+    assert after.status_code == status.HTTP_200_OK
+    assert [a["id"] for a in after.json()["pastAppointments"]] == [visit["id"]]
+    assert after.headers["ETag"] != etag
@@ -0,0 +1,95 @@
+import re
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import event
+
+from app.database import Base
+from app.models import Patient, Appointment, FollowUp, Note
+
+TABLES = set(Base.metadata.tables)
+SCAN_RE = re.compile(r"^SCAN (\w+?)(?:_\d+)?(?: |$)")
+
+def seed(portal, db_session, company, author, patients=40):
+    async def _seed():
+        rows = []
+        for i in range(patients):
+            patient = Patient(name=f"Plan Patient {i}", email=f"plan{i}@example.com", phone=str(i), company_id=company.id)
+            rows.append(patient)
+            for offset in (-3, 0, 4):
+                rows.append(Appointment(
+                    patient=patient, company_id=company.id, reason="Check-up",
+                    start_at=datetime.combine(date.today() + timedelta(days=offset + i % 5), time(9 + i % 8)),
+                ))
+            rows.append(FollowUp(patient=patient, company_id=company.id, title="Call", due_date=date.today() + timedelta(days=i)))
+            rows.append(Note(patient=patient, company_id=company.id, created_by_user_id=author.id, content="Seen"))
+        db_session.add_all(rows)
+        await db_session.commit()
+        return rows[0]
+    return portal.call(_seed)
+
+def explain(portal, db_session, statement, parameters):
+    async def _explain():
+        conn = await db_session.connection()
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in result.all()]
+    return portal.call(_explain)
+
+def test_router_queries_use_indexes(client, portal, db_session, db_engine, company_a, company_b, admin_a, admin_b, token_headers_a):
+    patient = seed(portal, db_session, company_a, admin_a)
+    seed(portal, db_session, company_b, admin_b, patients=10)
+    staff = client.post("/api/auth/register/staff", json={
+        "email": "plans@companya.com", "password": "password", "name": "Plan Staff", "companyCode": company_a.code
+    }).json()
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            captured.append((statement, parameters))
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        headers = token_headers_a
+
+        def send(method, url, expected=200, **kwargs):
+            # A failing request never reaches its query, so it would drop out of the check unnoticed
+            response = client.request(method, url, **kwargs)
+            assert response.status_code == expected, f"{method} {url}: {response.status_code} {response.text}"
+            return response
+
+        send("POST", "/api/auth/login", json={"email": admin_a.email, "password": "password"})
+        first_page = send("GET", "/api/patients/", params={"limit": 10}, headers=headers)
+        send("GET", "/api/patients/", params={"limit": 10, "cursor": first_page.headers["X-Next-Cursor"]}, headers=headers)
+        send("GET", "/api/patients/", params={"search": "plan"}, headers=headers)
+        send("GET", f"/api/patients/{patient.id}", headers=headers)
+        send("PUT", f"/api/patients/{patient.id}", json={"phone": "999"}, headers=headers)
+        send("GET", f"/api/patients/{patient.id}/notes", headers=headers)
+        send("GET", f"/api/patients/{patient.id}/chart", headers=headers)
+        send("POST", f"/api/patients/{patient.id}/notes", json={"content": "Follow-up"}, headers=headers)
+        send("GET", "/api/appointments/", headers=headers)
+        send("GET", "/api/appointments/", params={"start_date": date.today().isoformat(), "end_date": (date.today() + timedelta(days=7)).isoformat(), "status": "scheduled"}, headers=headers)
+        appointment = send("POST", "/api/appointments/", 201, json={
+            "patient_id": str(patient.id), "date": date.today().isoformat(), "time": "08:00", "reason": "New"
+        }, headers=headers).json()
+        send("PATCH", f"/api/appointments/{appointment['id']}", json={"status": "completed"}, headers=headers)
+        send("GET", "/api/follow-ups/", headers=headers)
+        send("GET", "/api/follow-ups/", params={"status": "open"}, headers=headers)
+        followup = send("POST", "/api/follow-ups/", 201, json={
+            "patient_id": str(patient.id), "title": "Results", "due_date": date.today().isoformat()
+        }, headers=headers).json()
+        send("PATCH", f"/api/follow-ups/{followup['id']}", json={"status": "completed"}, headers=headers)
+        send("GET", "/api/dashboard/stats", headers=headers)
+        send("GET", "/api/staff/", headers=headers)
+        send("DELETE", f"/api/staff/{staff['user']['id']}", 204, headers=headers)
+        send("DELETE", f"/api/patients/{patient.id}", 204, headers=headers)
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert captured
+    failures = []
+    for statement, parameters in captured:
+        for detail in explain(portal, db_session, statement, parameters):
+            match = SCAN_RE.match(detail)
+            if match and match.group(1) in TABLES:
+                failures.append(f"{detail}\n    {' '.join(statement.split())}")
+    assert not failures, "Full table scans:\n" + "\n".join(failures)
@@ -0,0 +1,64 @@
+from datetime import date
+
+from fastapi import status
+from sqlalchemy import event
+
+def test_list_endpoints_match_single_item_payloads(client, token_headers_a):
+    # Lists go through ListSerializer, single items through response_model; both must agree
+    headers = token_headers_a
+    patient = client.post("/api/patients/", json={"name": "Listed", "email": "listed@test.com", "phone": "1"}, headers=headers).json()
+    appointment = client.post("/api/appointments/", json={
+        "patient_id": patient["id"], "date": date.today().isoformat(), "time": "9:30", "reason": "Check"
+    }, headers=headers).json()
+    followup = client.post("/api/follow-ups/", json={
+        "patient_id": patient["id"], "title": "Call", "due_date": date.today().isoformat()
+    }, headers=headers).json()
+    note = client.post(f"/api/patients/{patient['id']}/notes", json={"content": "Seen"}, headers=headers).json()
+
+    for path, expected in (
+        ("/api/patients/", patient),
+        ("/api/appointments/", appointment),
+        ("/api/follow-ups/", followup),
+        (f"/api/patients/{patient['id']}/notes", note),
+    ):
+        response = client.get(path, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == [expected]
+
+    staff = client.get("/api/staff/", headers=headers).json()
+    assert [user["email"] for user in staff] == ["admin@companya.com"]
+
+def test_sparse_fields_narrow_the_select_and_the_payload(client, db_engine, token_headers_a):
+    headers = token_headers_a
+    patient = client.post("/api/patients/", json={
+        "name": "Sparse", "email": "sparse@test.com", "phone": "1", "address": "1 Long Road"
+    }, headers=headers).json()
+    client.post("/api/patients/", json={"name": "Second", "email": "second@test.com", "phone": "2"}, headers=headers)
+    client.post("/api/appointments/", json={
+        "patient_id": patient["id"], "date": date.today().isoformat(), "time": "10:00", "reason": "Check"
+    }, headers=headers)
+
+    statements = []
+    capture = lambda conn, cursor, statement, *args: statements.append(" ".join(statement.split()))
+    event.listen(db_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        calendar = client.get("/api/appointments/", params={"fields": "date,time,patientName"}, headers=headers)
+        full = client.get("/api/appointments/", headers=headers)
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert calendar.json() == [{"id": full.json()[0]["id"], "date": date.today().isoformat(), "time": "10:00", "patientName": "Sparse"}]
+    calendar_sql, full_sql = [statement for statement in statements if "FROM appointments" in statement]
+    assert "appointments.reason" not in calendar_sql and "appointments.reason" in full_sql
+    # Only the patient's name is joined in, never the rest of the row
+    assert "patients_1.name" in full_sql and "patients_1.address" not in full_sql
+
+    picker = client.get("/api/patients/", params={"fields": "name", "limit": 1}, headers=headers)
+    assert picker.headers["X-Next-Cursor"]  # created_at is still loaded for the cursor
+    rows = client.get("/api/patients/", params={"fields": "name"}, headers=headers).json()
+    assert all(row.keys() == {"id", "name"} for row in rows)
+    assert sorted(row["name"] for row in rows) == ["Second", "Sparse"]
+
+    unknown = client.get("/api/follow-ups/", params={"fields": "title,password_hash"}, headers=headers)
+    assert unknown.status_code == status.HTTP_400_BAD_REQUEST
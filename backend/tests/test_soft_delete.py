@@ -0,0 +1,51 @@
+from datetime import date
+
+from fastapi import status
+from sqlalchemy import func, select
+
+from app.models import Patient, Appointment, FollowUp, Note
+from app.utils import counters, purge
+
+def test_deleted_patient_and_history_disappear_then_get_purged(client, portal, db_session, token_headers_a):
+    headers = token_headers_a
+    today = date.today().isoformat()
+    kept = client.post("/api/patients/", json={"name": "Kept", "email": "kept@test.com", "phone": "1"}, headers=headers).json()
+    gone = client.post("/api/patients/", json={"name": "Gone", "email": "gone@test.com", "phone": "2"}, headers=headers).json()
+    for patient in (kept, gone):
+        client.post("/api/appointments/", json={
+            "patient_id": patient["id"], "date": today, "time": "09:00", "reason": "Check"
+        }, headers=headers)
+        client.post("/api/follow-ups/", json={"patient_id": patient["id"], "title": "Call", "due_date": today}, headers=headers)
+    for i in range(3):
+        client.post(f"/api/patients/{gone['id']}/notes", json={"content": f"Note {i}"}, headers=headers)
+
+    assert client.delete(f"/api/patients/{gone['id']}", headers=headers).status_code == status.HTTP_204_NO_CONTENT
+    assert client.delete(f"/api/patients/{gone['id']}", headers=headers).status_code == status.HTTP_404_NOT_FOUND
+
+    # Hidden everywhere, counters already adjusted, before any row is physically removed
+    assert client.get(f"/api/patients/{gone['id']}", headers=headers).status_code == status.HTTP_404_NOT_FOUND
+    assert client.get(f"/api/patients/{gone['id']}/notes", headers=headers).status_code == status.HTTP_404_NOT_FOUND
+    assert [p["id"] for p in client.get("/api/patients/", headers=headers).json()] == [kept["id"]]
+    assert client.get("/api/patients/", params={"search": "gone"}, headers=headers).json() == []
+    assert {a["patient_id"] for a in client.get("/api/appointments/", headers=headers).json()} == {kept["id"]}
+    assert {f["patient_id"] for f in client.get("/api/follow-ups/", headers=headers).json()} == {kept["id"]}
+    stats = client.get("/api/dashboard/stats", headers=headers).json()
+    assert (stats["totalPatients"], stats["todayAppointments"], stats["openFollowUps"]) == (1, 1, 1)
+    assert {a["patientName"] for a in stats["upcomingAppointments"]} == {"Kept"}
+    assert client.post("/api/appointments/", json={
+        "patient_id": gone["id"], "date": today, "time": "10:00", "reason": "Late"
+    }, headers=headers).status_code == status.HTTP_404_NOT_FOUND
+    assert portal.call(counters.reconcile_all, db_session) == 0
+
+    async def remaining():
+        return {
+            model.__name__: await db_session.scalar(select(func.count()).select_from(model))
+            for model in (Patient, Appointment, FollowUp, Note)
+        }
+
+    assert portal.call(remaining) == {"Patient": 2, "Appointment": 2, "FollowUp": 2, "Note": 3}
+    # Batches of 2: the three notes take two DELETEs
+    assert portal.call(purge.purge_deleted_patients, db_session, 2) == 6
+    assert portal.call(remaining) == {"Patient": 1, "Appointment": 1, "FollowUp": 1, "Note": 0}
+    assert portal.call(purge.purge_deleted_patients, db_session, 2) == 0
+    assert portal.call(counters.reconcile_all, db_session) == 0
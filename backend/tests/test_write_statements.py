@@ -0,0 +1,172 @@
+import re
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+VERB_TABLE_RE = re.compile(r"^(UPDATE)\s+(\w+)|^(SELECT|INSERT|DELETE)\b.*?\b(?:FROM|INTO)\s+(\w+)", re.S)
+
+@contextmanager
+def statements(db_engine):
+    """(verb, table) for every statement the block sends; SAVEPOINT/RELEASE left out."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        match = VERB_TABLE_RE.match(statement.lstrip())
+        if match:
+            captured.append(tuple(group for group in match.groups() if group))
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield captured
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", capture)
+
+TOUCH = ("INSERT", "company_stats")  # the counters upsert
+
+@pytest.fixture
+def headers_a(client, token_headers_a, token_headers_b):
+    # Prime the auth user cache for both tenants so its lookup doesn't show up in the captures
+    for headers in (token_headers_a, token_headers_b):
+        client.get("/api/follow-ups/", headers=headers)
+    return token_headers_a
+
+def make_patient(client, headers):
+    return client.post("/api/patients/", json={"name": "Writes", "email": "w@example.com", "phone": "1"}, headers=headers).json()
+
+def test_patient_writes_need_no_refresh(client, db_engine, headers_a):
+    with statements(db_engine) as created:
+        patient = make_patient(client, headers_a)
+    assert patient["created_at"]
+    assert created == [("INSERT", "patients"), TOUCH]
+
+    with statements(db_engine) as updated:
+        response = client.put(f"/api/patients/{patient['id']}", json={"phone": "2"}, headers=headers_a)
+    assert response.json()["phone"] == "2"
+    assert updated == [("UPDATE", "patients"), TOUCH]
+
+    with statements(db_engine) as noted:
+        response = client.post(f"/api/patients/{patient['id']}/notes", json={"content": "Seen"}, headers=headers_a)
+    assert response.json()["createdBy"] == "Admin A"
+    assert noted == [("SELECT", "users"), ("INSERT", "notes"), TOUCH]
+
+def test_other_company_patient_is_not_written(client, db_engine, headers_a, token_headers_b):
+    patient = make_patient(client, headers_a)
+    with statements(db_engine) as updated:
+        response = client.put(f"/api/patients/{patient['id']}", json={"phone": "2"}, headers=token_headers_b)
+    assert response.status_code == 404
+    assert updated == [("UPDATE", "patients")]
+    assert client.get(f"/api/patients/{patient['id']}", headers=headers_a).json()["phone"] == "1"
+
+    response = client.post(f"/api/patients/{patient['id']}/notes", json={"content": "Seen"}, headers=token_headers_b)
+    assert response.status_code == 404
+
+def test_appointment_and_follow_up_creates(client, db_engine, headers_a):
+    patient = make_patient(client, headers_a)
+    with statements(db_engine) as booked:
+        response = client.post("/api/appointments/", json={
+            "patient_id": patient["id"], "date": str(date.today() + timedelta(days=1)), "time": "10:00", "reason": "Check-up"
+        }, headers=headers_a)
+    assert response.json()["patientName"] == "Writes"
+    assert booked == [("SELECT", "patients"), ("INSERT", "appointments"), ("INSERT", "company_daily_appointments"), TOUCH]
+
+    with statements(db_engine) as planned:
+        response = client.post("/api/follow-ups/", json={
+            "patient_id": patient["id"], "title": "Call", "due_date": str(date.today())
+        }, headers=headers_a)
+    assert response.json()["patientName"] == "Writes"
+    assert planned == [("SELECT", "patients"), ("INSERT", "follow_ups"), TOUCH]
+
+    with statements(db_engine) as completed:
+        client.patch(f"/api/follow-ups/{response.json()['id']}", json={"status": "completed"}, headers=headers_a)
+    # The ORM UPDATE goes out at flush time, so only the set of statements is fixed
+    assert sorted(completed) == sorted([("SELECT", "follow_ups"), ("UPDATE", "follow_ups"), TOUCH])
+    assert client.get("/api/dashboard/stats", headers=headers_a).json()["openFollowUps"] == 0
+
+def test_remove_staff_is_one_delete(client, db_engine, company_a, headers_a, token_headers_b):
+    staff = client.post("/api/auth/register/staff", json={
+        "email": "leaver@companya.com", "password": "password", "name": "Leaver", "companyCode": company_a.code
+    }).json()["user"]
+    assert client.delete(f"/api/staff/{staff['id']}", headers=token_headers_b).status_code == 404
+
+    with statements(db_engine) as removed:
+        assert client.delete(f"/api/staff/{staff['id']}", headers=headers_a).status_code == 204
+    assert removed == [("DELETE", "users"), TOUCH]
+
+def test_register_company_is_one_transaction(client, db_engine):
+    with statements(db_engine) as registered:
+        response = client.post("/api/auth/register/company", json={
+            "companyName": "One Go", "adminName": "Owner", "email": "owner@onego.com", "password": "password"
+        })
+    assert response.status_code == 200
+    assert response.json()["user"]["company_code"]
+    assert registered == [("SELECT", "users"), ("INSERT", "companies"), ("INSERT", "users")]
+
+def test_appointment_patch(client, db_engine, headers_a, token_headers_b):
+    patient = make_patient(client, headers_a)
+    visit = client.post("/api/appointments/", json={
+        "patient_id": patient["id"], "date": str(date.today() + timedelta(days=1)), "time": "10:00", "reason": "Check-up"
+    }, headers=headers_a).json()
+    assert client.patch(f"/api/appointments/{visit['id']}", json={"reason": "Theirs"}, headers=token_headers_b).status_code == 404
+
+    moved_to = date.today() + timedelta(days=2)
+    with statements(db_engine) as moved:
+        response = client.patch(f"/api/appointments/{visit['id']}", json={"date": str(moved_to), "reason": "Rebooked"}, headers=headers_a)
+    assert response.json()["reason"] == "Rebooked"
+    # The day counters move in one upsert; the ORM UPDATE goes out at flush time
+    assert sorted(moved) == sorted([
+        ("SELECT", "appointments"), ("UPDATE", "appointments"), ("INSERT", "company_daily_appointments"), TOUCH
+    ])
+    assert [a["date"] for a in client.get("/api/appointments/", headers=headers_a).json()] == [str(moved_to)]
+
+def test_patient_delete_is_soft_and_updates_counters(client, db_engine, headers_a, token_headers_b):
+    patient = make_patient(client, headers_a)
+    client.post("/api/appointments/", json={
+        "patient_id": patient["id"], "date": str(date.today() + timedelta(days=1)), "time": "10:00", "reason": "Check-up"
+    }, headers=headers_a)
+    client.post("/api/follow-ups/", json={"patient_id": patient["id"], "title": "Call", "due_date": str(date.today())}, headers=headers_a)
+    etag = client.get("/api/patients/", headers=headers_a).headers["ETag"]
+    assert client.delete(f"/api/patients/{patient['id']}", headers=token_headers_b).status_code == 404
+
+    with statements(db_engine) as deleted:
+        assert client.delete(f"/api/patients/{patient['id']}", headers=headers_a).status_code == 204
+    # Soft delete, two aggregate reads for the counters, no rows loaded
+    assert deleted == [
+        ("UPDATE", "patients"), ("SELECT", "follow_ups"), ("SELECT", "appointments"),
+        ("INSERT", "company_daily_appointments"), TOUCH,
+    ]
+    assert not any(verb == "DELETE" for verb, _ in deleted)
+
+    stats = client.get("/api/dashboard/stats", headers=headers_a).json()
+    assert (stats["totalPatients"], stats["openFollowUps"], stats["upcomingAppointments"]) == (0, 0, [])
+    # The touch invalidated cached lists
+    assert client.get("/api/patients/", headers={**headers_a, "If-None-Match": etag}).json() == []
+    assert client.get(f"/api/patients/{patient['id']}", headers=headers_a).status_code == 404
+
+def test_bulk_creates_are_one_insert_per_table(client, db_engine, headers_a):
+    with statements(db_engine) as patients:
+        response = client.post("/api/patients/bulk", json={"items": [
+            {"name": f"Bulk {i}", "email": f"bulk{i}@example.com", "phone": str(i)} for i in range(3)
+        ]}, headers=headers_a)
+    assert response.json()["created"] == 3
+    assert patients == [("INSERT", "patients"), TOUCH]
+    patient_id = response.json()["results"][0]["id"]
+
+    with statements(db_engine) as booked:
+        response = client.post("/api/appointments/bulk", json={"items": [
+            {"patient_id": patient_id, "date": str(date.today() + timedelta(days=i)), "time": "10:00", "reason": "Series"}
+            for i in range(1, 4)
+        ]}, headers=headers_a)
+    assert response.json()["created"] == 3
+    assert booked == [("SELECT", "patients"), ("INSERT", "appointments"), ("INSERT", "company_daily_appointments"), TOUCH]
+
+    with statements(db_engine) as planned:
+        response = client.post("/api/follow-ups/bulk", json={"items": [
+            {"patient_id": patient_id, "title": f"Call {i}", "due_date": str(date.today())} for i in range(3)
+        ]}, headers=headers_a)
+    assert response.json()["created"] == 3
+    assert planned == [("SELECT", "patients"), ("INSERT", "follow_ups"), TOUCH]
+
+    stats = client.get("/api/dashboard/stats", headers=headers_a).json()
+    assert (stats["totalPatients"], stats["openFollowUps"], len(stats["upcomingAppointments"])) == (3, 3, 3)